@@ -1,5 +1,14 @@
 """Audio Glitch Detector - Detect glitches and discontinuities in sinusoidal audio signals."""
 
-from .core import DetectionResult, GlitchDetector
-
 __all__ = ["GlitchDetector", "DetectionResult"]
+
+
+def __getattr__(name: str):
+    """Import the detector on first access, so the CLI starts without loading NumPy."""
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from . import core
+
+    value = getattr(core, name)
+    globals()[name] = value
+    return value
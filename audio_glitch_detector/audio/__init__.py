@@ -1,15 +1,36 @@
-"""Audio-specific utilities for configuration, devices, saving, and data structures."""
-
-from .block_saver import save_glitch_block
-from .config import AudioConfig
-from .devices import list_audio_devices, print_audio_devices
-from .glitch_queue import BoundedGlitchQueue, GlitchBlock
-
-__all__ = [
-    "AudioConfig",
-    "list_audio_devices",
-    "print_audio_devices",
-    "save_glitch_block",
-    "BoundedGlitchQueue",
-    "GlitchBlock",
-]
+"""Audio-specific utilities for configuration, devices, saving, and data structures.
+
+Submodules are imported on first access, so importing the package does not load
+matplotlib or PortAudio.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "ArtifactWriter": ".artifact_writer",
+    "AudioConfig": ".config",
+    "ContextCapture": ".context_capture",
+    "GlitchContext": ".context_capture",
+    "find_input_device": ".devices",
+    "list_audio_devices": ".devices",
+    "print_audio_devices": ".devices",
+    "save_glitch_block": ".block_saver",
+    "BoundedGlitchQueue": ".glitch_queue",
+    "GlitchBlock": ".glitch_queue",
+    "SlabGlitchQueue": ".glitch_queue",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    """Import the submodule defining `name` on first access."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
@@ -0,0 +1,164 @@
+import heapq
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from threading import BoundedSemaphore, Lock
+
+import numpy as np
+
+from .block_saver import save_glitch_block
+from .context_capture import GlitchContext
+
+
+class ArtifactWriter:
+    """Saves glitch blocks as WAV and PNG files in worker processes while detection runs.
+
+    At most `max_pending` blocks are copied and waiting to be written at any time, so memory
+    stays constant however long the run. When they are all taken, `submit` either waits for a
+    free slot or skips the block. Only the newest `max_artifacts` blocks (by frame offset) of
+    each subdirectory are kept on disk; older artifacts are deleted as newer ones are written.
+
+    Workers are started with spawn, since forking a process with running audio threads is
+    unsafe.
+    """
+
+    def __init__(
+        self,
+        max_artifacts: int = 50,
+        output_dir: Path | None = None,
+        workers: int | None = None,
+        max_pending: int | None = None,
+    ):
+        if max_artifacts <= 0:
+            raise ValueError("Max artifacts must be positive")
+
+        self.max_artifacts = max_artifacts
+        self.output_dir = output_dir or Path("glitch_artifacts")
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 2) // 2))
+        self.max_pending = max_pending or 2 * self.workers
+
+        self.submitted = 0
+        self.pending = 0
+        self.skipped = 0
+        self.failed = 0
+        self.last_error: str | None = None
+
+        self._executor: ProcessPoolExecutor | None = None
+        self._slots = BoundedSemaphore(self.max_pending)
+        self._lock = Lock()
+        self._saved: dict[str | None, list[tuple[int, tuple[Path, ...]]]] = {}  # min-heaps by frame offset
+
+    def start(self) -> None:
+        """Start the worker processes."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            # Launch the worker processes now rather than on the first glitch
+            self._executor.submit(int)
+
+    def submit(
+        self,
+        samples: np.ndarray,
+        sample_rate: int,
+        frame_offset: int,
+        threshold: float,
+        wait: bool = True,
+        glitch_index: int | None = None,
+        subdir: str | None = None,
+    ) -> bool:
+        """Queue a block for saving. Returns False if it was skipped because all slots were taken.
+
+        The samples are copied, so the caller may reuse its buffer at once. With `wait` the call
+        blocks until a slot is free instead of skipping the block. `glitch_index` marks the
+        samples as the context around one glitch. With `subdir` the block is saved in that
+        directory under `output_dir`.
+        """
+        if self._executor is None:
+            raise RuntimeError("Artifact writer not started")
+
+        if not self._slots.acquire(blocking=wait):
+            self.skipped += 1
+            return False
+
+        with self._lock:
+            self.submitted += 1
+            self.pending += 1
+
+        try:
+            future = self._executor.submit(
+                save_glitch_block,
+                np.array(samples),
+                sample_rate,
+                frame_offset,
+                threshold,
+                self.output_dir / subdir if subdir else self.output_dir,
+                glitch_index,
+            )
+        except Exception:
+            with self._lock:
+                self.submitted -= 1
+                self.pending -= 1
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda done: self._on_saved(done, frame_offset, subdir))
+        return True
+
+    def submit_context(
+        self, context: GlitchContext, sample_rate: int, wait: bool = True, subdir: str | None = None
+    ) -> bool:
+        """Queue the context around one glitch for saving, like `submit`."""
+        return self.submit(
+            context.samples, sample_rate, context.frame_offset, context.threshold, wait, context.glitch_index, subdir
+        )
+
+    def _on_saved(self, future: Future, frame_offset: int, subdir: str | None) -> None:
+        """Record a finished save and delete artifacts that are no longer among the newest of its subdirectory."""
+        with self._lock:
+            self.pending -= 1
+        self._slots.release()
+
+        if future.cancelled() or future.exception() is not None:
+            with self._lock:
+                self.failed += 1
+                self.last_error = "cancelled" if future.cancelled() else str(future.exception())
+            return
+
+        with self._lock:
+            saved = self._saved.setdefault(subdir, [])
+            heapq.heappush(saved, (frame_offset, future.result()))
+            if len(saved) <= self.max_artifacts:
+                return
+            _, paths = heapq.heappop(saved)
+
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    @property
+    def ready(self) -> bool:
+        """Check whether a block can be submitted without waiting for a free slot."""
+        with self._lock:
+            return self.pending < self.max_pending
+
+    @property
+    def saved(self) -> int:
+        """Get the number of blocks currently kept on disk."""
+        with self._lock:
+            return sum(len(saved) for saved in self._saved.values())
+
+    def close(self) -> None:
+        """Wait for all queued blocks to be written and stop the workers."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self):
+        """Context manager entry."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
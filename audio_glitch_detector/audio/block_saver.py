@@ -1,10 +1,41 @@
 from pathlib import Path
 
-import matplotlib.pyplot as plt
 import numpy as np
 import soundfile as sf
 
-from ..core.analysis import calculate_derivative, normalize_samples
+from ..core.analysis import calculate_derivative, normalize_samples, to_float
+
+FIGURE_WIDTH = 12  # inches
+PLOT_DPI = 150
+LANE_HEIGHT = 0.3  # inches per channel in plots of more than two channels
+
+
+def min_max_envelope(values: np.ndarray, points: int) -> tuple[np.ndarray, np.ndarray]:
+    """Reduce each row of values to the minimum and maximum of `points // 2` equal buckets.
+
+    Returns (sample positions, values) with the minimum and maximum of every bucket in the
+    order they occur, so a line through them covers the same pixels as one through all samples.
+    Rows that already fit in `points` are returned unchanged.
+    """
+    if values.ndim == 1:
+        values = values.reshape(1, -1)
+
+    rows, n = values.shape
+    if n <= points:
+        return np.broadcast_to(np.arange(n), (rows, n)), values
+
+    buckets = points // 2
+    bucket_size = -(-n // buckets)
+    padded = np.pad(values, ((0, 0), (0, buckets * bucket_size - n)), mode="edge").reshape(rows, buckets, bucket_size)
+
+    starts = np.arange(buckets) * bucket_size
+    min_positions = np.minimum(starts + padded.argmin(axis=2), n - 1)
+    max_positions = np.minimum(starts + padded.argmax(axis=2), n - 1)
+
+    positions = np.empty((rows, 2 * buckets), dtype=np.int64)
+    positions[:, 0::2] = np.minimum(min_positions, max_positions)
+    positions[:, 1::2] = np.maximum(min_positions, max_positions)
+    return positions, np.take_along_axis(values, positions, axis=1)
 
 
 def save_waveform_png(
@@ -13,85 +44,116 @@ def save_waveform_png(
     frame_offset: int,
     filepath: Path,
     threshold: float = 0.1,
+    glitch_index: int | None = None,
 ) -> None:
-    """Save waveform visualization with derivative analysis as PNG."""
+    """Save waveform visualization with derivative analysis as PNG.
+
+    Waveform and derivative are reduced to a min/max envelope per pixel column before plotting,
+    and the figure is drawn with the Agg canvas directly, without global pyplot state, so it can
+    be rendered from worker processes. With `glitch_index` the time axis is centered on the glitch.
+    More than two channels are drawn as stacked lanes in one plot.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
     # Calculate derivative for analysis
     derivative = calculate_derivative(normalize_samples(samples))
 
-    # Create time axes
+    # Time in milliseconds of a sample position
     duration = samples.shape[1] / sample_rate
-    time_axis = np.linspace(0, duration * 1000, samples.shape[1])  # in milliseconds
-    # Derivative is one sample shorter due to convolution
-    time_axis_deriv = np.linspace(0, duration * 1000, derivative.shape[1])
+    ms_per_sample = duration * 1000 / max(samples.shape[1] - 1, 1)
+    points = 2 * FIGURE_WIDTH * PLOT_DPI
 
-    if samples.shape[0] == 1:
-        # Mono: 2 subplots (waveform + derivative)
-        plt.figure(figsize=(12, 8))
-
-        # Waveform
-        plt.subplot(2, 1, 1)
-        plt.plot(time_axis, samples[0], "b-", linewidth=0.5)
-        plt.ylabel("Amplitude")
-        plt.title(f"Glitch Block - Frame {frame_offset}")
-        plt.grid(True, alpha=0.3)
-
-        # Derivative
-        plt.subplot(2, 1, 2)
-        plt.plot(time_axis_deriv, derivative[0], "g-", linewidth=0.5)
-        plt.axhline(
+    if glitch_index is None:
+        title = f"Glitch Block - Frame {frame_offset}"
+        time_label = "Time (ms)"
+        origin = 0
+    else:
+        title = f"Glitch at Frame {glitch_index}"
+        time_label = "Time from glitch (ms)"
+        origin = glitch_index - frame_offset
+
+    def plot(ax, values: np.ndarray, style: str, **kwargs) -> None:
+        positions, envelope = min_max_envelope(values, points)
+        ax.plot((positions[0] - origin) * ms_per_sample, envelope[0], style, linewidth=0.5, **kwargs)
+        if glitch_index is not None:
+            ax.axvline(x=0, color="k", linestyle=":", linewidth=1)
+
+    def plot_derivative(ax, values: np.ndarray, **kwargs) -> None:
+        plot(ax, values, "g-", **kwargs)
+        ax.axhline(
             y=threshold,
             color="r",
             linestyle="--",
             linewidth=1,
             label=f"Threshold = {threshold}",
         )
-        plt.ylabel("Derivative")
-        plt.xlabel("Time (ms)")
-        plt.legend()
-        plt.grid(True, alpha=0.3)
+        ax.set_ylabel("Derivative")
+        ax.set_xlabel(time_label)
+        ax.legend()
+        ax.grid(True, alpha=0.3)
 
-    else:
+    if samples.shape[0] == 1:
+        # Mono: 2 subplots (waveform + derivative)
+        fig = Figure(figsize=(FIGURE_WIDTH, 8))
+        waveform_ax, derivative_ax = fig.subplots(2, 1)
+
+        # Waveform
+        plot(waveform_ax, samples[0], "b-")
+        waveform_ax.set_ylabel("Amplitude")
+        waveform_ax.set_title(title)
+        waveform_ax.grid(True, alpha=0.3)
+
+        # Derivative
+        plot_derivative(derivative_ax, derivative[0])
+
+    elif samples.shape[0] == 2:
         # Stereo: 3 subplots (left, right, derivative)
-        plt.figure(figsize=(12, 10))
+        fig = Figure(figsize=(FIGURE_WIDTH, 10))
+        left_ax, right_ax, derivative_ax = fig.subplots(3, 1)
 
         # Left channel
-        plt.subplot(3, 1, 1)
-        plt.plot(time_axis, samples[0], "b-", linewidth=0.5)
-        plt.ylabel("Left Channel")
-        plt.title(f"Glitch Block - Frame {frame_offset}")
-        plt.grid(True, alpha=0.3)
+        plot(left_ax, samples[0], "b-")
+        left_ax.set_ylabel("Left Channel")
+        left_ax.set_title(title)
+        left_ax.grid(True, alpha=0.3)
 
         # Right channel
-        plt.subplot(3, 1, 2)
-        plt.plot(time_axis, samples[1], "r-", linewidth=0.5)
-        plt.ylabel("Right Channel")
-        plt.grid(True, alpha=0.3)
+        plot(right_ax, samples[1], "r-")
+        right_ax.set_ylabel("Right Channel")
+        right_ax.grid(True, alpha=0.3)
 
         # Combined derivative (max across channels for visualization)
-        plt.subplot(3, 1, 3)
-        combined_derivative = np.max(derivative, axis=0)
-        plt.plot(
-            time_axis_deriv,
-            combined_derivative,
-            "g-",
-            linewidth=0.5,
-            label="Max derivative",
+        plot_derivative(derivative_ax, np.max(derivative, axis=0), label="Max derivative")
+
+    else:
+        # Multichannel: one lane per channel, first channel on top, drawn with one plot call
+        channels = samples.shape[0]
+        fig = Figure(figsize=(FIGURE_WIDTH, 4 + LANE_HEIGHT * channels))
+        waveform_ax, derivative_ax = fig.subplots(
+            2, 1, gridspec_kw={"height_ratios": [max(2.0, LANE_HEIGHT * channels), 2.0]}
         )
-        plt.axhline(
-            y=threshold,
-            color="r",
-            linestyle="--",
-            linewidth=1,
-            label=f"Threshold = {threshold}",
+
+        positions, envelope = min_max_envelope(samples, points)
+        lane_offsets = -2.0 * np.arange(channels)
+        waveform_ax.plot(
+            ((positions - origin) * ms_per_sample).T, (envelope + lane_offsets[:, None]).T, "b-", linewidth=0.5
         )
-        plt.ylabel("Derivative")
-        plt.xlabel("Time (ms)")
-        plt.legend()
-        plt.grid(True, alpha=0.3)
+        if glitch_index is not None:
+            waveform_ax.axvline(x=0, color="k", linestyle=":", linewidth=1)
+        waveform_ax.set_yticks(lane_offsets, [str(channel + 1) for channel in range(channels)])
+        waveform_ax.set_ylim(lane_offsets[-1] - 1.1, 1.1)
+        waveform_ax.set_ylabel("Channel")
+        waveform_ax.set_title(title)
+        waveform_ax.grid(True, axis="x", alpha=0.3)
+
+        # Combined derivative (max across channels for visualization)
+        plot_derivative(derivative_ax, np.max(derivative, axis=0), label="Max derivative")
 
-    plt.tight_layout()
-    plt.savefig(str(filepath), dpi=150, bbox_inches="tight")
-    plt.close()
+    FigureCanvasAgg(fig)
+    fig.tight_layout()
+    # Fast zlib level: PNG encoding otherwise takes about a third of the render time
+    fig.savefig(str(filepath), dpi=PLOT_DPI, bbox_inches="tight", pil_kwargs={"compress_level": 1})
 
 
 def save_glitch_block(
@@ -100,16 +162,28 @@ def save_glitch_block(
     frame_offset: int,
     threshold: float,
     output_dir: Path = None,
-) -> None:
-    """Save audio block containing glitch as WAV file and PNG waveform with derivative analysis."""
+    glitch_index: int | None = None,
+) -> tuple[Path, Path]:
+    """Save audio block containing glitch as WAV file and PNG waveform with derivative analysis.
+
+    With `glitch_index` the samples are the context around that glitch, and the files are named
+    after it. Returns the paths of the WAV and PNG file.
+    """
+    if samples.dtype.kind != "f":
+        samples = to_float(samples)
+
     if output_dir is None:
         output_dir = Path("glitch_artifacts")
 
-    output_dir.mkdir(exist_ok=True)
+    output_dir.mkdir(parents=True, exist_ok=True)
 
     # Create base filename with timestamp
-    timestamp_ms = (frame_offset / sample_rate) * 1000
-    base_filename = f"glitch_block_{frame_offset:08d}_{timestamp_ms:.0f}ms"
+    if glitch_index is None:
+        timestamp_ms = (frame_offset / sample_rate) * 1000
+        base_filename = f"glitch_block_{frame_offset:08d}_{timestamp_ms:.0f}ms"
+    else:
+        timestamp_ms = (glitch_index / sample_rate) * 1000
+        base_filename = f"glitch_{glitch_index:08d}_{timestamp_ms:.0f}ms"
 
     # Save WAV file
     wav_filepath = output_dir / f"{base_filename}.wav"
@@ -122,4 +196,6 @@ def save_glitch_block(
 
     # Save PNG waveform with derivative analysis
     png_filepath = output_dir / f"{base_filename}.png"
-    save_waveform_png(samples, sample_rate, frame_offset, png_filepath, threshold)
+    save_waveform_png(samples, sample_rate, frame_offset, png_filepath, threshold, glitch_index)
+
+    return wav_filepath, png_filepath
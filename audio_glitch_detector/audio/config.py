@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 
-import pyaudio
+import numpy as np
+
+CAPTURE_MODES = ("callback", "blocking")
 
 
 @dataclass
@@ -11,10 +13,14 @@ class AudioConfig:
     channels: int = 2
     bit_depth: int = 16
     block_size: int = 1024
+    capture_mode: str = "callback"
+    buffer_blocks: int = 64
 
     @property
     def pyaudio_format(self) -> int:
         """Get the PyAudio format constant for this bit depth."""
+        import pyaudio
+
         if self.bit_depth == 16:
             return pyaudio.paInt16
         elif self.bit_depth == 32:
@@ -22,6 +28,11 @@ class AudioConfig:
         else:
             raise ValueError(f"Unsupported bit depth: {self.bit_depth}")
 
+    @property
+    def sample_dtype(self) -> np.dtype:
+        """Get the NumPy dtype of captured samples."""
+        return np.dtype(np.int16 if self.bit_depth == 16 else np.int32)
+
     @property
     def sample_width_bytes(self) -> int:
         """Get sample width in bytes."""
@@ -31,9 +42,13 @@ class AudioConfig:
         """Validate configuration parameters."""
         if self.sample_rate <= 0:
             raise ValueError("Sample rate must be positive")
-        if self.channels not in (1, 2):
-            raise ValueError("Only mono (1) or stereo (2) channels supported")
+        if self.channels <= 0:
+            raise ValueError("Channels must be positive")
         if self.bit_depth not in (16, 32):
             raise ValueError("Only 16-bit or 32-bit depth supported")
         if self.block_size <= 0:
             raise ValueError("Block size must be positive")
+        if self.capture_mode not in CAPTURE_MODES:
+            raise ValueError(f"Capture mode must be one of: {', '.join(CAPTURE_MODES)}")
+        if self.buffer_blocks <= 0:
+            raise ValueError("Buffer blocks must be positive")
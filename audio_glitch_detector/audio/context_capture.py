@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class GlitchContext:
+    """Samples around one glitch, with shape (channels, samples) starting at `frame_offset`.
+
+    `glitch_index` is None for a whole block holding one or more glitches.
+    """
+
+    samples: np.ndarray
+    frame_offset: int
+    glitch_index: int | None
+    threshold: float
+
+
+class ContextCapture:
+    """Cuts a window of `pre_frames` before and `post_frames` after each glitch from a stream of blocks.
+
+    Only the last `pre_frames + post_frames` frames are kept between blocks, so windows span
+    block boundaries without holding on to whole blocks. A glitch is returned once the block
+    holding the end of its window has been pushed. Windows are cut short at the start of the
+    stream, at gaps between blocks and, with `flush`, at its end.
+    """
+
+    def __init__(self, pre_frames: int, post_frames: int):
+        if pre_frames < 0 or post_frames < 0:
+            raise ValueError("Context frames must not be negative")
+
+        self.pre_frames = pre_frames
+        self.post_frames = post_frames
+        self._history: np.ndarray | None = None
+        self._history_start = 0
+        self._position: int | None = None
+        self._pending: list[tuple[int, float]] = []
+
+    def push(
+        self, samples: np.ndarray, frame_offset: int, glitch_indices: np.ndarray, threshold: float
+    ) -> list[GlitchContext]:
+        """Add the next block and the absolute indices of the glitches found in it.
+
+        Returns the glitches, from this or earlier blocks, whose window is now complete.
+        """
+        if samples.ndim == 1:
+            samples = samples.reshape(1, -1)
+
+        contexts = []
+        if self._position is not None and frame_offset != self._position:
+            # The frames after a gap do not continue the windows of earlier glitches
+            contexts = self.flush()
+
+        if self._history is None or self._history.shape[0] != samples.shape[0] or self._history.dtype != samples.dtype:
+            self._history = np.empty((samples.shape[0], 0), dtype=samples.dtype)
+            self._history_start = frame_offset
+
+        self._pending.extend((int(index), threshold) for index in glitch_indices)
+        end = frame_offset + samples.shape[1]
+
+        waiting = []
+        for glitch_index, glitch_threshold in self._pending:
+            if glitch_index + self.post_frames <= end:
+                contexts.append(self._cut(samples, frame_offset, glitch_index, glitch_threshold, end))
+            else:
+                waiting.append((glitch_index, glitch_threshold))
+        self._pending = waiting
+
+        self._keep_history(samples, end)
+        self._position = end
+        return contexts
+
+    def flush(self) -> list[GlitchContext]:
+        """Get the glitches still waiting for frames, with their windows cut short at the last frame."""
+        contexts = []
+        if self._history is not None and self._position is not None:
+            empty = np.empty((self._history.shape[0], 0), dtype=self._history.dtype)
+            contexts = [
+                self._cut(empty, self._position, glitch_index, threshold, self._position)
+                for glitch_index, threshold in self._pending
+            ]
+
+        self._pending = []
+        self._history = None
+        self._position = None
+        return contexts
+
+    def _cut(
+        self, samples: np.ndarray, frame_offset: int, glitch_index: int, threshold: float, end: int
+    ) -> GlitchContext:
+        """Copy the window of a glitch from the history and the current block."""
+        start = max(glitch_index - self.pre_frames, self._history_start)
+        stop = min(glitch_index + self.post_frames, end)
+        window = np.empty((samples.shape[0], max(stop - start, 0)), dtype=samples.dtype)
+
+        # Part of the window before the current block
+        history_stop = min(stop, frame_offset)
+        if history_stop > start:
+            window[:, : history_stop - start] = self._history[
+                :, start - self._history_start : history_stop - self._history_start
+            ]
+
+        # Part of the window in the current block
+        block_start = max(start, frame_offset)
+        if stop > block_start:
+            window[:, block_start - start :] = samples[:, block_start - frame_offset : stop - frame_offset]
+
+        return GlitchContext(samples=window, frame_offset=start, glitch_index=glitch_index, threshold=threshold)
+
+    def _keep_history(self, samples: np.ndarray, end: int) -> None:
+        """Keep the frames that windows of later glitches may reach back to."""
+        keep = self.pre_frames + self.post_frames
+        if samples.shape[1] >= keep:
+            self._history = samples[:, samples.shape[1] - keep :].copy()
+        else:
+            self._history = np.concatenate([self._history, samples], axis=1)[:, -keep:]
+        self._history_start = end - self._history.shape[1]
@@ -1,7 +1,5 @@
 from dataclasses import dataclass
 
-import pyaudio
-
 
 @dataclass
 class AudioDevice:
@@ -21,6 +19,8 @@ class AudioDevice:
 
 def list_audio_devices() -> list[AudioDevice]:
     """Get list of available audio devices."""
+    import pyaudio
+
     p = pyaudio.PyAudio()
     devices = []
 
@@ -60,3 +60,33 @@ def get_device_by_index(device_index: int) -> AudioDevice:
         if device.index == device_index:
             return device
     raise ValueError(f"No device found with index {device_index}")
+
+
+def find_input_device(spec: str, devices: list[AudioDevice] | None = None) -> AudioDevice:
+    """Get an input device by index or by a case-insensitive part of its name.
+
+    A name matching one device exactly is preferred over devices merely containing it.
+
+    Raises:
+        ValueError: If no input device matches or the name matches several
+    """
+    if devices is None:
+        devices = list_audio_devices()
+    inputs = [device for device in devices if device.is_input_device]
+
+    if spec.strip().isdigit():
+        index = int(spec)
+        for device in inputs:
+            if device.index == index:
+                return device
+        raise ValueError(f"No input device found with index {index}")
+
+    name = spec.strip().lower()
+    exact = [device for device in inputs if device.name.lower() == name]
+    matches = exact or [device for device in inputs if name in device.name.lower()]
+    if not matches:
+        raise ValueError(f"No input device found matching '{spec}'")
+    if len(matches) > 1:
+        names = ", ".join(f"{device.index}: {device.name}" for device in matches)
+        raise ValueError(f"Several input devices match '{spec}': {names}")
+    return matches[0]
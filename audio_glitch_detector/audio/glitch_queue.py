@@ -1,9 +1,14 @@
+import os
+import tempfile
 from collections import deque
 from collections.abc import Iterator
 from dataclasses import dataclass
+from pathlib import Path
 
 import numpy as np
 
+from .context_capture import GlitchContext
+
 
 @dataclass
 class GlitchBlock:
@@ -47,3 +52,147 @@ class BoundedGlitchQueue:
     def clear(self) -> None:
         """Clear all stored blocks."""
         self._queue.clear()
+
+
+class SlabGlitchQueue:
+    """A first-in first-out queue of glitch snapshots stored in one preallocated slab.
+
+    Samples are kept in their native dtype in a (capacity, channels, frames) array, with the
+    frame offset, glitch index, threshold and length of each snapshot in parallel arrays. Slots
+    are used as a ring. When all are taken, the ring grows by slots in a memory-mapped spill
+    file in `spill_dir`, which is deleted on `close`. At most `max_items` snapshots are held:
+    adding to a full queue drops the oldest, counted in `dropped`, so the spill file is bounded.
+    """
+
+    def __init__(
+        self,
+        channels: int,
+        frames: int,
+        dtype: np.dtype,
+        capacity: int = 256,
+        spill_dir: Path | None = None,
+        max_items: int = 4096,
+    ):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        if max_items <= 0:
+            raise ValueError("Max items must be positive")
+
+        self.channels = channels
+        self.frames = frames
+        self.dtype = np.dtype(dtype)
+        self.capacity = min(capacity, max_items)
+        self.max_items = max_items
+        self.spill_dir = spill_dir
+        self.spilled = 0
+        self.dropped = 0
+
+        self._slab = np.zeros((self.capacity, channels, frames), dtype=self.dtype)
+        self._spill: np.memmap | None = None
+        self._spill_path: Path | None = None
+        self._frame_offsets = np.zeros(self.capacity, dtype=np.int64)
+        self._glitch_indices = np.zeros(self.capacity, dtype=np.int64)
+        self._thresholds = np.zeros(self.capacity, dtype=np.float64)
+        self._lengths = np.zeros(self.capacity, dtype=np.int64)
+        self._head = 0
+        self._count = 0
+
+    def add(self, samples: np.ndarray, frame_offset: int, threshold: float, glitch_index: int | None = None) -> None:
+        """Copy a snapshot with shape (channels, samples) into the queue. Longer snapshots are cut at `frames`."""
+        if samples.ndim == 1:
+            samples = samples.reshape(1, -1)
+
+        if self._count == self.max_items:
+            self.pop()
+            self.dropped += 1
+        if self._count == self._frame_offsets.size:
+            self._grow()
+
+        index = (self._head + self._count) % self._frame_offsets.size
+        length = min(samples.shape[1], self.frames)
+        self._slot(index)[:, :length] = samples[:, :length]
+        self._frame_offsets[index] = frame_offset
+        self._glitch_indices[index] = -1 if glitch_index is None else glitch_index
+        self._thresholds[index] = threshold
+        self._lengths[index] = length
+        if index >= self.capacity:
+            self.spilled += 1
+        self._count += 1
+
+    def add_context(self, context: GlitchContext) -> None:
+        """Copy the context around one glitch into the queue."""
+        self.add(context.samples, context.frame_offset, context.threshold, context.glitch_index)
+
+    def pop(self) -> GlitchContext:
+        """Remove the oldest snapshot. Its samples are a view, valid until the next `add`.
+
+        Raises:
+            IndexError: If the queue is empty
+        """
+        if self._count == 0:
+            raise IndexError("pop from an empty glitch queue")
+
+        index = self._head
+        glitch_index = int(self._glitch_indices[index])
+        context = GlitchContext(
+            samples=self._slot(index)[:, : self._lengths[index]],
+            frame_offset=int(self._frame_offsets[index]),
+            glitch_index=None if glitch_index < 0 else glitch_index,
+            threshold=float(self._thresholds[index]),
+        )
+
+        self._head = (self._head + 1) % self._frame_offsets.size
+        self._count -= 1
+        return context
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        """Delete the spill file."""
+        self._spill = None
+        if self._spill_path is not None:
+            self._spill_path.unlink(missing_ok=True)
+            self._spill_path = None
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+    def _slot(self, index: int) -> np.ndarray:
+        """Get the storage of one snapshot, in the slab or in the spill file."""
+        if index < self.capacity:
+            return self._slab[index]
+        return self._spill[index - self.capacity]
+
+    def _grow(self) -> None:
+        """Add spill slots to the full ring, doubling the spill file up to `max_items` slots in all."""
+        if self._spill_path is None:
+            fd, name = tempfile.mkstemp(prefix="glitch_spill_", suffix=".bin", dir=self.spill_dir)
+            os.close(fd)
+            self._spill_path = Path(name)
+
+        size = self._frame_offsets.size
+        spill_slots = size - self.capacity
+        added = min(max(self.capacity, spill_slots), self.max_items - size)
+        if self._spill is not None:
+            self._spill.flush()
+        # Mode r+ extends the file to the new shape and keeps the snapshots already in it
+        self._spill = np.memmap(
+            self._spill_path, dtype=self.dtype, mode="r+", shape=(spill_slots + added, self.channels, self.frames)
+        )
+
+        # The new slots go between the newest snapshot and the oldest, which move up past them
+        at = self._head or size
+        for index in range(size - 1, at - 1, -1):
+            self._slot(index + added)[:] = self._slot(index)
+        self._frame_offsets = np.insert(self._frame_offsets, at, np.zeros(added, dtype=np.int64))
+        self._glitch_indices = np.insert(self._glitch_indices, at, np.zeros(added, dtype=np.int64))
+        self._thresholds = np.insert(self._thresholds, at, np.zeros(added))
+        self._lengths = np.insert(self._lengths, at, np.zeros(added, dtype=np.int64))
+        if self._head:
+            self._head += added
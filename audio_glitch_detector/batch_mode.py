@@ -0,0 +1,113 @@
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+
+from .core import GlitchAggregator
+from .file_mode import FileAnalysis, analyze_file
+from .tui import ConsoleOutput
+from .utils import format_elapsed_time
+
+AUDIO_EXTENSIONS = {".wav", ".flac", ".aif", ".aiff", ".ogg", ".w64", ".rf64", ".caf"}
+
+
+@dataclass
+class BatchFileResult:
+    """Outcome of analyzing one file in batch mode."""
+
+    filename: str
+    analysis: FileAnalysis | None = None
+    error: str | None = None
+
+
+def collect_audio_files(patterns: list[str]) -> list[Path]:
+    """Expand files, directories (searched recursively) and glob patterns into a sorted list of audio files."""
+    files = set()
+
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            files.update(p for p in path.rglob("*") if p.suffix.lower() in AUDIO_EXTENSIONS and p.is_file())
+        elif path.is_file():
+            files.add(path)
+        else:
+            files.update(Path(p) for p in glob.glob(pattern, recursive=True) if Path(p).is_file())
+
+    return sorted(files)
+
+
+def analyze_batch_file(
+    filename: str,
+    threshold: float,
+    block_size: int,
+    running_threshold: bool = False,
+) -> BatchFileResult:
+    """Analyze a single file, capturing errors so one bad file does not stop the batch.
+
+    Only the glitch count is reported, so no glitch indices are kept.
+    """
+    try:
+        analysis = analyze_file(filename, threshold, block_size, running_threshold, aggregator=GlitchAggregator(keep=0))
+        return BatchFileResult(filename, analysis=analysis)
+    except Exception as e:
+        return BatchFileResult(filename, error=str(e))
+
+
+def run_batch_mode(
+    patterns: list[str],
+    threshold: float,
+    block_size: int,
+    jobs: int | None,
+    output: ConsoleOutput,
+    running_threshold: bool = False,
+) -> None:
+    """Run glitch detection on many files, spread over a pool of worker processes."""
+    files = collect_audio_files(patterns)
+    if not files:
+        output.log("No audio files found", style="bold red")
+        sys.exit(1)
+
+    jobs = jobs or os.cpu_count() or 1
+    jobs = min(jobs, len(files))
+
+    output.log(f"Analyzing {len(files)} files with {jobs} worker{'s' if jobs > 1 else ''}")
+    auto_mode = "auto (running)" if running_threshold else "auto"
+    output.log(f"Detection threshold: {threshold if threshold > 0 else auto_mode}")
+
+    start_time = time.time()
+    results = []
+
+    def report(result: BatchFileResult) -> None:
+        results.append(result)
+        glitch_count = result.analysis.total_count if result.analysis else None
+        output.print_batch_result(len(results), len(files), result.filename, glitch_count, result.error)
+
+    if jobs == 1:
+        for file in files:
+            report(analyze_batch_file(str(file), threshold, block_size, running_threshold))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(analyze_batch_file, str(file), threshold, block_size, running_threshold)
+                for file in files
+            ]
+            for future in as_completed(futures):
+                report(future.result())
+
+    analyses = [result.analysis for result in results if result.analysis is not None]
+    failed = len(results) - len(analyses)
+
+    output.print_batch_summary(
+        file_count=len(results),
+        glitch_file_count=sum(1 for analysis in analyses if analysis.total_count > 0),
+        glitch_count=sum(analysis.total_count for analysis in analyses),
+        failed_count=failed,
+        audio_seconds=sum(analysis.duration_seconds for analysis in analyses),
+        elapsed_time=format_elapsed_time(time.time() - start_time),
+    )
+
+    if failed:
+        sys.exit(1)
@@ -1,11 +1,18 @@
 import argparse
 import sys
-from importlib.metadata import version
 
-from .audio import AudioConfig
-from .file_mode import run_file_mode
-from .stream_mode import run_stream_mode
-from .tui import ConsoleOutput
+
+class VersionAction(argparse.Action):
+    """Print the installed package version and exit, looking it up only when asked for."""
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, default=argparse.SUPPRESS, help=None):
+        super().__init__(option_strings, dest=dest, default=default, nargs=0, help=help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        from importlib.metadata import version
+
+        print(f"audio-glitch-detector {version('audio-glitch-detector')}")
+        parser.exit()
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -14,14 +21,39 @@ def create_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "-v",
         "--version",
-        action="version",
-        version=f"audio-glitch-detector {version('audio-glitch-detector')}",
+        action=VersionAction,
+        help="show program's version number and exit",
     )
-    parser.add_argument(
+    input_group = parser.add_mutually_exclusive_group()
+    input_group.add_argument(
         "-f",
         "--filename",
         help="Audio file to analyze",
     )
+    input_group.add_argument(
+        "-b",
+        "--batch",
+        nargs="+",
+        metavar="PATH",
+        help="Analyze many files. Accepts files, directories (searched recursively) and glob patterns",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes for file and batch mode (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "-d",
+        "--device",
+        "--devices",
+        dest="devices",
+        nargs="+",
+        metavar="DEVICE",
+        help="Audio devices for stream mode, by index or part of the name, instead of asking. "
+        "Several are monitored at once, all with the same stream settings",
+    )
     parser.add_argument(
         "-r",
         "--sample_rate",
@@ -34,7 +66,6 @@ def create_parser() -> argparse.ArgumentParser:
         "--channels",
         type=int,
         default=2,
-        choices=[1, 2],
         help="Number of channels for stream mode (default: 2)",
     )
     parser.add_argument(
@@ -50,6 +81,18 @@ def create_parser() -> argparse.ArgumentParser:
         default=1024,
         help="Block size (frames) for processing (default: 1024)",
     )
+    parser.add_argument(
+        "--capture",
+        choices=["callback", "blocking"],
+        default="callback",
+        help="Stream capture mode. callback decouples capture from detection through a ring buffer (default: callback)",
+    )
+    parser.add_argument(
+        "--buffer-blocks",
+        type=int,
+        default=64,
+        help="Capacity of the capture ring buffer in blocks for callback capture (default: 64)",
+    )
     parser.add_argument(
         "-t",
         "--threshold",
@@ -57,6 +100,16 @@ def create_parser() -> argparse.ArgumentParser:
         default=0.0,
         help="discontinuity detection threshold. 0 = auto. (default: auto)",
     )
+    parser.add_argument(
+        "--running-threshold",
+        action="store_true",
+        help="Estimate the auto threshold across all blocks instead of per block, giving one stable threshold",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each processing stage and print a breakdown at the end",
+    )
     parser.add_argument(
         "-s",
         "--save-blocks",
@@ -66,6 +119,40 @@ def create_parser() -> argparse.ArgumentParser:
         metavar="n",
         help="Save audio blocks containing glitches as .wav files and a visualization. Optional max blocks to save (default: 50)",
     )
+    parser.add_argument(
+        "--context-ms",
+        type=float,
+        default=None,
+        help="Audio saved before and after each glitch with --save-blocks, in milliseconds. 0 saves the whole block (default: 50)",
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Run stream mode without the live display, logging stats and glitches for unattended runs. Needs --device",
+    )
+    parser.add_argument(
+        "--log-file",
+        metavar="PATH",
+        help="Log to a file rotated at 10 MB, keeping 5 old files, instead of standard output in headless mode",
+    )
+    parser.add_argument(
+        "--stats-interval",
+        type=float,
+        default=60.0,
+        metavar="SECONDS",
+        help="Interval between stats lines in headless mode (default: 60)",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="PORT",
+        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics in stream and file mode",
+    )
+    parser.add_argument(
+        "--results",
+        metavar="PATH",
+        help="Write every glitch found in file mode to a .csv, .jsonl or .bin file as it is found",
+    )
     return parser
 
 
@@ -73,17 +160,75 @@ def main() -> None:
     """Main CLI entry point."""
     parser = create_parser()
     args = parser.parse_args()
+    if args.batch and args.save_blocks is not None:
+        parser.error("--save-blocks is not supported in batch mode")
+    if args.batch and args.profile:
+        parser.error("--profile is not supported in batch mode")
+    if args.batch and args.context_ms is not None:
+        parser.error("--context-ms is not supported in batch mode")
+    if args.context_ms is None:
+        args.context_ms = 50.0
+    if args.context_ms < 0:
+        parser.error("--context-ms must not be negative")
+    if args.devices and len(set(args.devices)) != len(args.devices):
+        parser.error("--devices must not repeat a device")
+    if args.results and not args.filename:
+        parser.error("--results needs a file given with -f")
+    if args.headless and (args.filename or args.batch):
+        parser.error("--headless is only supported in stream mode")
+    if args.headless and not args.devices:
+        parser.error("--headless needs a device given with --device")
+    if args.log_file and not args.headless:
+        parser.error("--log-file needs --headless")
+    if args.stats_interval <= 0:
+        parser.error("--stats-interval must be positive")
+    if args.metrics_port is not None and not 0 <= args.metrics_port <= 65535:
+        parser.error("--metrics-port must be between 0 and 65535")
+    if args.metrics_port is not None and args.batch:
+        parser.error("--metrics-port is only supported in stream and file mode")
+
+    # Modes are imported only once chosen, so each pays only for its own dependencies
+    from .tui import ConsoleOutput, LogOutput
+
+    if args.headless:
+        try:
+            output = LogOutput(args.log_file, args.stats_interval)
+        except OSError as e:
+            parser.error(f"Cannot open log file: {e}")
+    else:
+        output = ConsoleOutput()
+
+    if args.batch:
+        from .batch_mode import run_batch_mode
 
-    output = ConsoleOutput()
+        run_batch_mode(args.batch, args.threshold, args.block_size, args.jobs, output, args.running_threshold)
+    elif args.filename:
+        from .file_mode import run_file_mode
 
-    if args.filename:
-        run_file_mode(args.filename, args.threshold, args.block_size, args.save_blocks, output)
+        run_file_mode(
+            args.filename,
+            args.threshold,
+            args.block_size,
+            args.save_blocks,
+            output,
+            args.running_threshold,
+            args.jobs,
+            args.profile,
+            args.context_ms,
+            args.results,
+            args.metrics_port,
+        )
     else:
+        from .audio import AudioConfig, find_input_device, list_audio_devices
+        from .stream_mode import run_multi_stream_mode, run_stream_mode
+
         config = AudioConfig(
             sample_rate=args.sample_rate,
             channels=args.channels,
             bit_depth=args.bit_depth,
             block_size=args.block_size,
+            capture_mode=args.capture,
+            buffer_blocks=args.buffer_blocks,
         )
 
         try:
@@ -92,7 +237,42 @@ def main() -> None:
             output.log(f"Invalid configuration: {e}", style="bold red")
             sys.exit(1)
 
-        run_stream_mode(config, args.threshold, args.save_blocks, output)
+        device_ids = []
+        if args.devices:
+            devices = list_audio_devices()
+            try:
+                device_ids = [find_input_device(spec, devices).index for spec in args.devices]
+            except ValueError as e:
+                output.log(f"Invalid device: {e}", style="bold red")
+                sys.exit(1)
+            if len(set(device_ids)) != len(device_ids):
+                output.log("Invalid device: the same device is given more than once", style="bold red")
+                sys.exit(1)
+
+        if len(device_ids) > 1:
+            run_multi_stream_mode(
+                config,
+                device_ids,
+                args.threshold,
+                args.save_blocks,
+                output,
+                args.running_threshold,
+                args.profile,
+                args.context_ms,
+                args.metrics_port,
+            )
+        else:
+            run_stream_mode(
+                config,
+                args.threshold,
+                args.save_blocks,
+                output,
+                args.running_threshold,
+                args.profile,
+                args.context_ms,
+                device_ids[0] if device_ids else None,
+                args.metrics_port,
+            )
 
 
 if __name__ == "__main__":
@@ -1,22 +1,40 @@
+from .aggregator import GlitchAggregator
 from .analysis import (
     calculate_derivative,
+    filter_nearby_channel_hits,
     filter_nearby_glitches,
+    filter_nearby_indices,
     find_glitch_indices,
+    find_glitch_sample_indices,
     from_bytes,
+    full_scale,
+    normalization_scale,
     normalize_samples,
     split_channels,
+    threshold_from_derivative,
     to_float,
 )
 from .detector import DetectionResult, GlitchDetector
+from .quantile import StreamingQuantile
+from .workspace import DetectionWorkspace
 
 __all__ = [
     "GlitchDetector",
     "DetectionResult",
+    "GlitchAggregator",
+    "DetectionWorkspace",
+    "StreamingQuantile",
     "calculate_derivative",
     "find_glitch_indices",
+    "find_glitch_sample_indices",
     "filter_nearby_glitches",
+    "filter_nearby_indices",
+    "filter_nearby_channel_hits",
     "normalize_samples",
+    "normalization_scale",
+    "threshold_from_derivative",
     "to_float",
     "split_channels",
     "from_bytes",
+    "full_scale",
 ]
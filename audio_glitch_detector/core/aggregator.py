@@ -0,0 +1,51 @@
+import numpy as np
+
+from ..utils.result_sink import ResultSink
+from .analysis import filter_nearby_indices
+
+
+class GlitchAggregator:
+    """Collects the glitches of a file or stream block by block, in a fixed amount of memory.
+
+    Glitch indices must be added in stream order. Those within `dedup_window` samples of the
+    glitch kept before are dropped, across calls, so overlapping or raw hits are filtered as
+    they arrive. Every kept glitch is counted and passed on to `sink`, but only the first
+    `keep` are held in memory, or all of them if `keep` is None.
+    """
+
+    def __init__(self, dedup_window: int = 50, sink: ResultSink | None = None, keep: int | None = None):
+        if keep is not None and keep < 0:
+            raise ValueError("Kept glitch count must not be negative")
+
+        self.dedup_window = dedup_window
+        self.sink = sink
+        self.keep = keep
+        self.total_count = 0
+        self._kept: list[np.ndarray] = []
+        self._kept_count = 0
+        self._last_kept: int | None = None
+
+    def add(self, sample_indices: np.ndarray) -> np.ndarray:
+        """Add the glitches found in the next part of the stream. Returns the ones kept after filtering."""
+        if len(sample_indices) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        kept = filter_nearby_indices(np.asarray(sample_indices, dtype=np.int64), self.dedup_window, self._last_kept)
+        if kept.size == 0:
+            return kept
+
+        self._last_kept = int(kept[-1])
+        self.total_count += int(kept.size)
+        if self.sink is not None:
+            self.sink.write(kept)
+
+        room = kept.size if self.keep is None else min(kept.size, self.keep - self._kept_count)
+        if room > 0:
+            self._kept.append(kept[:room])
+            self._kept_count += room
+        return kept
+
+    @property
+    def sample_indices(self) -> np.ndarray:
+        """Get the glitches held in memory, the first `keep` of all kept."""
+        return np.concatenate(self._kept) if self._kept else np.empty(0, dtype=np.int64)
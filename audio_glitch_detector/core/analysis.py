@@ -1,58 +1,93 @@
 import numpy as np
 
 
-def calculate_derivative(samples: np.ndarray) -> np.ndarray:
-    """Calculate the absolute value of the first derivative of audio samples."""
+def working_dtype(dtype: np.dtype) -> np.dtype:
+    """Get the dtype the derivative is computed in.
+
+    Float input keeps its precision. Integer samples of up to 32 bits stay integers, widened so
+    the difference of two samples cannot overflow (int16 -> int32, int32 -> int64).
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind == "f":
+        return dtype
+    if dtype.kind in "iu" and dtype.itemsize <= 4:
+        return np.dtype(f"int{dtype.itemsize * 16}")
+    return np.dtype(np.float64)
+
+
+def calculate_derivative(
+    samples: np.ndarray, out: np.ndarray | None = None, previous: np.ndarray | None = None
+) -> np.ndarray:
+    """Calculate the absolute value of the first derivative of audio samples.
+
+    The first sample of each channel is set to zero to avoid edge effects, unless `previous`
+    holds the sample of each channel just before the block. If `out` is given the derivative
+    is written into it instead of a newly allocated array.
+    """
     if samples.ndim == 1:
         samples = samples.reshape(1, -1)
 
-    num_channels = samples.shape[0]
-    derivative = np.zeros(samples.shape)
-    filter_kernel = np.array([-1, 1])
+    if out is None:
+        out = np.empty(samples.shape, dtype=working_dtype(samples.dtype))
+
+    np.subtract(samples[:, 1:], samples[:, :-1], out=out[:, 1:], dtype=out.dtype)
+    np.abs(out[:, 1:], out=out[:, 1:])
 
-    for channel in range(num_channels):
-        # remove the last sample to match the length of the derivative
-        derivative[channel] = np.abs(np.convolve(samples[channel], filter_kernel))[:-1]
-        # set the first sample to zero to avoid edge effects
-        derivative[channel][0] = 0
+    if previous is None:
+        out[:, 0] = 0
+    else:
+        np.subtract(samples[:, 0], previous, out=out[:, 0], dtype=out.dtype)
+        np.abs(out[:, 0], out=out[:, 0])
 
-    return derivative
+    return out
 
 
-def find_glitch_indices(derivative: np.ndarray, threshold: float = 0.5) -> list[list[int]]:
-    """Find sample indices where discontinuities exceed threshold."""
+def find_glitch_indices(derivative: np.ndarray, threshold: float = 0.5) -> list[np.ndarray]:
+    """Find sample indices where discontinuities exceed threshold. Returns one index array per channel."""
     if derivative.ndim == 1:
         derivative = derivative.reshape(1, -1)
 
-    num_channels = derivative.shape[0]
-    discontinuities = [[] for _ in range(num_channels)]
+    # Search all channels at once, skipping the first and last sample of the block
+    channels, indices = np.nonzero(derivative[:, 1:-1] > threshold)
+    indices += 1
 
-    for channel in range(num_channels):
-        for index, sample in enumerate(derivative[channel][1:-1]):
-            if sample > threshold:
-                discontinuities[channel].append(index + 1)
+    splits = np.searchsorted(channels, np.arange(1, derivative.shape[0]))
+    return np.split(indices.astype(np.int64, copy=False), splits)
 
-    return discontinuities
+
+def find_glitch_sample_indices(derivative: np.ndarray, threshold: float = 0.5) -> np.ndarray:
+    """Find sorted, unique sample indices where any channel exceeds threshold."""
+    if derivative.ndim == 1:
+        derivative = derivative.reshape(1, -1)
+
+    exceeded = np.any(derivative[:, 1:-1] > threshold, axis=0)
+    return np.flatnonzero(exceeded).astype(np.int64, copy=False) + 1
 
 
 def find_optimal_threshold(samples: np.ndarray, percentile: float = 99.5) -> float:
     """
     Automatically determine optimal threshold by analyzing derivative distribution.
     """
-    if samples.ndim == 1:
-        samples = samples.reshape(1, -1)
+    return threshold_from_derivative(calculate_derivative(samples), percentile)
 
-    derivative = calculate_derivative(samples)
-    all_derivatives = derivative.flatten()
 
+def threshold_from_derivative(derivative: np.ndarray, percentile: float = 99.5, scale: float = 1.0) -> float:
+    """Determine the detection threshold from an already computed derivative.
+
+    `scale` converts derivative values to normalized units, so a derivative of unnormalized
+    samples can be used without normalizing it first.
+    """
     # Remove zeros and very small values that are just noise
-    non_zero_derivatives = all_derivatives[all_derivatives > 1e-6]
+    non_zero_derivatives = derivative[derivative > 1e-6 / scale]
 
     if len(non_zero_derivatives) == 0:
         return 0.1
 
-    base_threshold = np.percentile(non_zero_derivatives, percentile)
+    return clamp_threshold(float(np.percentile(non_zero_derivatives, percentile)) * scale)
+
 
+def clamp_threshold(base_threshold: float) -> float:
+    """Apply the safety margin and limits to a percentile based threshold."""
     min_threshold = 0.01
     max_threshold = 1.0
     multiplier = 1.1
@@ -65,17 +100,73 @@ def find_optimal_threshold(samples: np.ndarray, percentile: float = 99.5) -> flo
 
 def filter_nearby_glitches(discontinuities: list[int], window: int = 50) -> list[int]:
     """Filter out glitch detections that are too close together within a sample window."""
-    if not discontinuities:
-        return []
+    return filter_nearby_indices(np.asarray(discontinuities, dtype=np.int64), window).tolist()
 
-    unique_discontinuities = sorted(set(discontinuities))
-    filtered = [unique_discontinuities[0]]
 
-    for value in unique_discontinuities[1:]:
-        if value - filtered[-1] >= window:
-            filtered.append(value)
+def filter_nearby_indices(indices: np.ndarray, window: int = 50, last_kept: int | None = None) -> np.ndarray:
+    """Filter out sample indices that are too close together within a sample window.
 
-    return filtered
+    Keeps the first index and every following index that is at least `window` samples
+    after the previously kept one. Runs of indices spanning less than `window` collapse to
+    their first index without a Python loop; in longer dense runs the next kept index is
+    looked up from each kept one, so the loop only visits the kept indices.
+    `last_kept` continues the filter from an index kept in an earlier call.
+    """
+    indices = np.asarray(indices)
+    # Detector output is already sorted and unique, which is cheaper to check than to redo
+    if not np.all(indices[1:] > indices[:-1]):
+        indices = np.unique(indices)
+    if last_kept is not None:
+        indices = indices[indices >= last_kept + window]
+    if indices.size < 2 or window <= 0:
+        return indices
+
+    run_starts = np.concatenate(([0], np.flatnonzero(np.diff(indices) >= window) + 1))
+    run_ends = np.append(run_starts[1:], indices.size)
+
+    keep = np.zeros(indices.size, dtype=bool)
+    keep[run_starts] = True
+
+    long_runs = indices[run_ends - 1] - indices[run_starts] >= window
+    if long_runs.any():
+        next_kept = np.searchsorted(indices, indices + window).tolist()
+        for start, end in zip(run_starts[long_runs].tolist(), run_ends[long_runs].tolist(), strict=True):
+            i = next_kept[start]
+            while i < end:
+                keep[i] = True
+                i = next_kept[i]
+
+    return indices[keep]
+
+
+def filter_nearby_channel_hits(
+    channels: np.ndarray, indices: np.ndarray, window: int = 50, last_kept: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Filter (channel, sample index) hits like `filter_nearby_indices`, separately for each channel.
+
+    All channels are filtered in one call: each channel's indices are shifted past those of the
+    channel before, so hits on different channels never fall within one window. `last_kept`
+    holds the index kept last on each channel in an earlier call. Returns the kept channels and
+    indices, sorted by index and then channel.
+    """
+    channels = np.asarray(channels, dtype=np.int64)
+    indices = np.asarray(indices, dtype=np.int64)
+    if last_kept is not None:
+        later = indices >= last_kept[channels] + window
+        channels, indices = channels[later], indices[later]
+    if indices.size == 0:
+        return channels, indices
+
+    base = indices.min()
+    stride = indices.max() - base + window + 1
+    # Hits sorted by index stay sorted by index within each channel after a stable sort by channel
+    by_channel = np.argsort(channels, kind="stable")
+    kept = filter_nearby_indices(channels[by_channel] * stride + (indices[by_channel] - base), window)
+    channels, indices = np.divmod(kept, stride)
+    indices += base
+
+    order = np.lexsort((channels, indices))
+    return channels[order], indices[order]
 
 
 def normalize_samples(samples: np.ndarray, noise_threshold: float = 0.005) -> np.ndarray:
@@ -86,16 +177,43 @@ def normalize_samples(samples: np.ndarray, noise_threshold: float = 0.005) -> np
     return samples / max_val
 
 
+def normalization_scale(samples: np.ndarray, noise_threshold: float = 0.005) -> float:
+    """Get the factor that normalizes samples to [-1.0, 1.0], without copying them.
+
+    Float samples follow `normalize_samples`. Integer samples are treated as full scale PCM,
+    so the noise threshold applies to their `to_float` level.
+    """
+    if samples.size == 0:
+        return 1.0
+
+    max_val = max(float(samples.max()), -float(samples.min()))
+    max_level = max_val / full_scale(samples.dtype)
+
+    if max_level < noise_threshold:
+        return 1.0 / full_scale(samples.dtype)
+    return 1.0 / max_val
+
+
 def to_float(samples: np.ndarray) -> np.ndarray:
     """Convert integer samples to float range [-1.0, 1.0]."""
-    info = np.iinfo(samples.dtype)
+    return samples.astype(float) / full_scale(samples.dtype)
+
+
+def full_scale(dtype: np.dtype) -> float:
+    """Get the value that maps samples of an integer dtype to [-1.0, 1.0]. Floats are already in range."""
+    if np.dtype(dtype).kind == "f":
+        return 1.0
+    info = np.iinfo(dtype)
     # Use the absolute value of min to handle signed integer asymmetry correctly
-    return samples.astype(float) / max(abs(info.min), abs(info.max))
+    return float(max(abs(info.min), abs(info.max)))
 
 
 def split_channels(samples: np.ndarray, channels: int) -> np.ndarray:
-    """Split interleaved samples into separate channels."""
-    return np.vstack([samples[i::channels] for i in range(channels)])
+    """Split interleaved samples into separate channels.
+
+    Returns a strided (channels, samples) view of the interleaved buffer, nothing is copied.
+    """
+    return samples.reshape(-1, channels).T
 
 
 def from_bytes(data: bytes, channels: int, bit_depth: int) -> np.ndarray:
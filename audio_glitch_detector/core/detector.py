@@ -1,25 +1,42 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import numpy as np
 
-from .analysis import (
-    calculate_derivative,
-    filter_nearby_glitches,
-    find_glitch_indices,
-    find_optimal_threshold,
-    normalize_samples,
-)
+from ..utils.profiling import Profiler
+from .analysis import clamp_threshold, filter_nearby_channel_hits, filter_nearby_indices, threshold_from_derivative
+from .quantile import StreamingQuantile
+from .workspace import DetectionWorkspace
+
+
+# Last kept glitch of a channel without one, far enough back that adding the window cannot overflow
+_NO_GLITCH = np.iinfo(np.int64).min // 2
 
 
 @dataclass
 class DetectionResult:
-    """Result of glitch detection containing timestamps and sample indices."""
+    """Result of glitch detection containing timestamps and sample indices.
+
+    The detector fills `sample_indices` and `timestamps_ms` with int64 and float64 arrays.
+    These merge all channels, keeping one glitch per de-dup window across channels.
+    `hit_channels` and `hit_indices` attribute glitches to channels: one entry per channel
+    that glitched, de-duplicated per channel, sorted by sample index and then channel.
+    """
 
-    sample_indices: list[int]
-    timestamps_ms: list[float]
+    sample_indices: np.ndarray | list[int]
+    timestamps_ms: np.ndarray | list[float]
     total_count: int
     threshold: float
     auto_threshold: bool = False
+    hit_channels: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    hit_indices: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+
+    def channel_indices(self, channel: int) -> np.ndarray:
+        """Get the sample indices of the glitches on one channel."""
+        return self.hit_indices[self.hit_channels == channel]
+
+    def channel_counts(self, channels: int) -> np.ndarray:
+        """Get the number of glitches on each of `channels` channels."""
+        return np.bincount(self.hit_channels, minlength=channels)
 
 
 class GlitchDetector:
@@ -28,51 +45,114 @@ class GlitchDetector:
     This detector works by analyzing the first derivative of audio signals
     to identify sudden discontinuities that indicate glitches in otherwise continuous signals.
     Threshold should be set so it filters out minor fluctuations that are not considered glitches.
+    Float32 input is analyzed in float32, and the working buffers are reused across blocks.
+
+    With threshold 0 the threshold is determined automatically, by default from each block on
+    its own. With `running_threshold` it is estimated from all blocks seen so far instead, and
+    settles on one stable value for the whole file or stream.
+
+    `detect` analyzes each block on its own. `feed` treats consecutive blocks as one continuous
+    signal, so glitches at block boundaries are found without overlapping the blocks.
+
+    An enabled `profiler` records the time spent in each stage of every block.
     """
 
-    def __init__(self, sample_rate: int, threshold: float = 0.0):
+    def __init__(
+        self,
+        sample_rate: int,
+        threshold: float = 0.0,
+        running_threshold: bool = False,
+        dedup_window: int = 50,
+        profiler: Profiler | None = None,
+    ):
         self.sample_rate = sample_rate
         self.threshold = threshold
         self.auto_threshold = False
+        self.running_threshold = running_threshold
+        self.dedup_window = dedup_window
+        self.profiler = profiler or Profiler()
+        self._workspace = DetectionWorkspace(profiler=self.profiler)
+        self._threshold_estimator = StreamingQuantile() if running_threshold else None
+
+        # Stream state carried from one fed block to the next
+        self._previous: np.ndarray | None = None
+        self._position = 0
+        self._last_glitch: int | None = None
+        self._last_channel_glitch: np.ndarray | None = None
 
     def detect(self, samples: np.ndarray) -> DetectionResult:
         """Detect glitches in audio samples."""
 
-        normalized_samples = normalize_samples(samples)
-
-        threshold = self.threshold
-
-        if self.threshold == 0.0:
-            self.auto_threshold = True
-            threshold = find_optimal_threshold(normalized_samples)
-
-        derivative = calculate_derivative(normalized_samples)
-
-        discontinuities_per_channel = find_glitch_indices(derivative, threshold)
-
-        # Combine all channels and remove duplicates
-        all_discontinuities = []
-        for channel_discontinuities in discontinuities_per_channel:
-            all_discontinuities.extend(channel_discontinuities)
-
-        filtered_discontinuities = filter_nearby_glitches(all_discontinuities)
-        timestamps = [self._sample_to_milliseconds(idx) for idx in filtered_discontinuities]
-
-        return DetectionResult(
-            sample_indices=filtered_discontinuities,
-            timestamps_ms=timestamps,
-            total_count=len(filtered_discontinuities),
-            threshold=threshold,
-            auto_threshold=self.auto_threshold,
-        )
+        derivative = self._workspace.load(samples)
+        threshold = self._block_threshold(derivative)
+
+        with self.profiler.stage("detect/index search"):
+            discontinuities = self._workspace.find_glitch_indices(threshold)
+            hit_channels, hit_indices = self._workspace.channel_hits(discontinuities)
+        with self.profiler.stage("detect/filter"):
+            filtered_discontinuities = filter_nearby_indices(discontinuities, self.dedup_window)
+            hits = filter_nearby_channel_hits(hit_channels, hit_indices, self.dedup_window)
+
+        return self._result(filtered_discontinuities, threshold, hits)
+
+    def feed(self, samples: np.ndarray, frame_offset: int | None = None) -> DetectionResult:
+        """Detect glitches in the next block of a continuous stream, with absolute sample indices.
+
+        The last sample of every block is kept, so a discontinuity between two blocks is found
+        at the first sample of the second one. Glitches within the de-dup window of one found
+        in an earlier block are dropped. `frame_offset` defaults to the frame after the previous
+        block; if it does not continue the previous block, e.g. after dropped blocks, the first
+        sample is not compared across the gap. Channel hits are de-duplicated the same way on
+        each channel.
+        """
+        if samples.ndim == 1:
+            samples = samples.reshape(1, -1)
+
+        if frame_offset is None:
+            frame_offset = self._position
+        elif frame_offset != self._position:
+            self._previous = None
+
+        if samples.shape[1] == 0:
+            return self._result(np.empty(0, dtype=np.int64), self.threshold)
+
+        derivative = self._workspace.load(samples, self._previous)
+        threshold = self._block_threshold(derivative)
+
+        with self.profiler.stage("detect/index search"):
+            discontinuities = self._workspace.find_glitch_indices(threshold, include_edges=True)
+            hit_channels, hit_indices = self._workspace.channel_hits(discontinuities)
+            discontinuities += frame_offset
+            hit_indices += frame_offset
+        with self.profiler.stage("detect/filter"):
+            filtered_discontinuities = filter_nearby_indices(discontinuities, self.dedup_window, self._last_glitch)
+            hits = self._filter_channel_hits(samples.shape[0], hit_channels, hit_indices)
+
+        if filtered_discontinuities.size > 0:
+            self._last_glitch = int(filtered_discontinuities[-1])
+        self._previous = samples[:, -1].copy()
+        self._position = frame_offset + samples.shape[1]
+
+        return self._result(filtered_discontinuities, threshold, hits)
+
+    def start_at(self, frame_offset: int, previous: np.ndarray | None = None) -> None:
+        """Continue the stream at `frame_offset`, forgetting the blocks fed before.
+
+        `previous` holds the sample of each channel just before `frame_offset`, if known.
+        The running threshold estimate is kept.
+        """
+        self._position = frame_offset
+        self._previous = None if previous is None else np.array(previous).reshape(-1)
+        self._last_glitch = None
+        self._last_channel_glitch = None
 
     def detect_with_offset(self, samples: np.ndarray, frame_offset: int) -> DetectionResult:
         """Detect glitches in samples with absolute frame positioning."""
         result = self.detect(samples)
 
         # Convert relative indices to absolute
-        absolute_indices = [idx + frame_offset for idx in result.sample_indices]
-        absolute_timestamps = [self._sample_to_milliseconds(idx) for idx in absolute_indices]
+        absolute_indices = result.sample_indices + frame_offset
+        absolute_timestamps = self._sample_to_milliseconds(absolute_indices)
 
         return DetectionResult(
             sample_indices=absolute_indices,
@@ -80,8 +160,58 @@ class GlitchDetector:
             total_count=result.total_count,
             threshold=result.threshold,
             auto_threshold=result.auto_threshold,
+            hit_channels=result.hit_channels,
+            hit_indices=result.hit_indices + frame_offset,
         )
 
-    def _sample_to_milliseconds(self, sample_index: int) -> float:
-        """Convert sample index to milliseconds."""
+    def _block_threshold(self, derivative: np.ndarray) -> float:
+        """Get the fixed threshold, or determine it automatically for a block."""
+        if self.threshold != 0.0:
+            return self.threshold
+
+        self.auto_threshold = True
+        with self.profiler.stage("detect/auto threshold"):
+            return self._auto_threshold(derivative)
+
+    def _filter_channel_hits(
+        self, channels: int, hit_channels: np.ndarray, hit_indices: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """De-duplicate the channel hits of a fed block against those kept in earlier blocks."""
+        if self._last_channel_glitch is None or self._last_channel_glitch.size != channels:
+            self._last_channel_glitch = np.full(channels, _NO_GLITCH, dtype=np.int64)
+
+        hit_channels, hit_indices = filter_nearby_channel_hits(
+            hit_channels, hit_indices, self.dedup_window, self._last_channel_glitch
+        )
+        np.maximum.at(self._last_channel_glitch, hit_channels, hit_indices)
+        return hit_channels, hit_indices
+
+    def _result(
+        self, sample_indices: np.ndarray, threshold: float, hits: tuple[np.ndarray, np.ndarray] | None = None
+    ) -> DetectionResult:
+        """Build the result for the glitches found in a block, with their (channel, index) hits."""
+        result = DetectionResult(
+            sample_indices=sample_indices,
+            timestamps_ms=self._sample_to_milliseconds(sample_indices),
+            total_count=int(sample_indices.size),
+            threshold=threshold,
+            auto_threshold=self.auto_threshold,
+        )
+        if hits is not None:
+            result.hit_channels, result.hit_indices = hits
+        return result
+
+    def _auto_threshold(self, derivative: np.ndarray) -> float:
+        """Determine the threshold for a block, per block or from the running estimate."""
+        if self._threshold_estimator is None:
+            return threshold_from_derivative(derivative, scale=self._workspace.scale)
+
+        self._threshold_estimator.update(derivative, self._workspace.scale)
+        base_threshold = self._threshold_estimator.value()
+        if base_threshold is None:
+            return 0.1
+        return clamp_threshold(base_threshold)
+
+    def _sample_to_milliseconds(self, sample_index: int | np.ndarray) -> float | np.ndarray:
+        """Convert sample index (or an array of indices) to milliseconds."""
         return (sample_index / self.sample_rate) * 1000.0
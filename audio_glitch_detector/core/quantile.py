@@ -0,0 +1,63 @@
+import math
+
+import numpy as np
+
+
+class StreamingQuantile:
+    """Running percentile estimate over a stream of positive values in constant memory.
+
+    Values are counted in logarithmically spaced bins (as in DDSketch), so the estimate is
+    within `relative_accuracy` of the true percentile regardless of how many values are added.
+    Updating is a single vectorized pass over each block.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 99.5,
+        relative_accuracy: float = 0.005,
+        min_value: float = 1e-6,
+        max_value: float = 4.0,
+    ):
+        if not 0.0 <= percentile <= 100.0:
+            raise ValueError("Percentile must be between 0 and 100")
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("Relative accuracy must be between 0 and 1")
+
+        self.percentile = percentile
+        self.min_value = min_value
+        self.max_value = max_value
+        self._gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+        num_bins = math.ceil(math.log(max_value / min_value) / self._log_gamma) + 1
+        self._counts = np.zeros(num_bins, dtype=np.int64)
+        self.count = 0
+
+    def update(self, values: np.ndarray, scale: float = 1.0) -> None:
+        """Add values multiplied by `scale`. Values at or below `min_value` are ignored as noise."""
+        values = values[values > self.min_value / scale]
+        if values.size == 0:
+            return
+
+        bins = np.log(values, dtype=np.float64)
+        bins += math.log(scale / self.min_value)
+        bins /= self._log_gamma
+        np.ceil(bins, out=bins)
+        np.clip(bins, 0, self._counts.size - 1, out=bins)
+
+        self._counts += np.bincount(bins.astype(np.intp), minlength=self._counts.size)
+        self.count += values.size
+
+    def value(self) -> float | None:
+        """Get the current percentile estimate, or None if no values have been added."""
+        if self.count == 0:
+            return None
+
+        rank = self.percentile / 100.0 * (self.count - 1)
+        index = int(np.searchsorted(np.cumsum(self._counts), rank, side="right"))
+        return self.min_value * 2.0 * self._gamma**index / (self._gamma + 1.0)
+
+    def reset(self) -> None:
+        """Forget all added values."""
+        self._counts[:] = 0
+        self.count = 0
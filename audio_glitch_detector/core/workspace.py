@@ -0,0 +1,103 @@
+import math
+
+import numpy as np
+
+from ..utils.profiling import Profiler
+from .analysis import calculate_derivative, normalization_scale, working_dtype
+
+
+class DetectionWorkspace:
+    """Reusable buffers for the fused normalize, derivative and threshold pipeline.
+
+    Samples are never normalized in place. The derivative is computed in the units of the
+    input and `scale` converts it to normalized units, so thresholds are divided by `scale`
+    instead of every sample being multiplied by it. Integer PCM is never converted to float:
+    its derivative is computed in a wider integer type and compared against an integer
+    threshold. Buffers grow to the largest block seen and are reused for every following
+    block with the same channel count and dtype.
+    """
+
+    def __init__(self, noise_threshold: float = 0.005, profiler: Profiler | None = None):
+        self.noise_threshold = noise_threshold
+        self.profiler = profiler or Profiler()
+        self.scale = 1.0
+        self._derivative: np.ndarray | None = None
+        self._mask: np.ndarray | None = None
+        self._hits: np.ndarray | None = None
+        self._frames = 0
+
+    def load(self, samples: np.ndarray, previous: np.ndarray | None = None) -> np.ndarray:
+        """Compute the derivative of samples with shape (channels, samples) into the workspace.
+
+        `previous` is the sample of each channel just before the block, see `calculate_derivative`.
+        Returns a view into the workspace buffer which is overwritten by the next call.
+        """
+        if samples.ndim == 1:
+            samples = samples.reshape(1, -1)
+
+        channels, frames = samples.shape
+        self._reserve(channels, frames, working_dtype(samples.dtype))
+        self._frames = frames
+
+        with self.profiler.stage("detect/normalize"):
+            self.scale = normalization_scale(samples, self.noise_threshold)
+        with self.profiler.stage("detect/derivative"):
+            return calculate_derivative(samples, out=self.derivative, previous=previous)
+
+    @property
+    def derivative(self) -> np.ndarray:
+        """Get the derivative of the last loaded block, in input units."""
+        if self._derivative is None:
+            raise RuntimeError("No samples loaded")
+        return self._derivative[:, : self._frames]
+
+    def find_glitch_indices(self, threshold: float, include_edges: bool = False) -> np.ndarray:
+        """Find sorted sample indices where any channel of the loaded block exceeds threshold.
+
+        The threshold is given in normalized units. The first and last sample are skipped
+        unless `include_edges` is set.
+        """
+        derivative = self.derivative
+        mask = self._mask[:, : self._frames]
+        hits = self._hits[: self._frames]
+
+        np.greater(derivative, self._threshold_in_units(threshold, derivative.dtype), out=mask)
+        np.logical_or.reduce(mask, axis=0, out=hits)
+
+        if include_edges:
+            return np.flatnonzero(hits).astype(np.int64, copy=False)
+        return np.flatnonzero(hits[1:-1]).astype(np.int64, copy=False) + 1
+
+    def channel_hits(self, indices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Get which channels exceeded the threshold at indices found by the last `find_glitch_indices`.
+
+        Only the columns of the mask at `indices` are read. Returns (channel, index) pairs,
+        sorted by index and then channel.
+        """
+        positions, channels = np.nonzero(self._mask[:, indices].T)
+        return channels.astype(np.int64, copy=False), indices[positions]
+
+    def _threshold_in_units(self, threshold: float, dtype: np.dtype) -> np.generic:
+        """Convert a normalized threshold to the units of the derivative buffer.
+
+        For integer buffers the threshold is rounded down, which keeps `derivative > threshold`
+        exact, and clipped to the range of the dtype.
+        """
+        limit = threshold / self.scale
+        if dtype.kind == "f":
+            return dtype.type(limit)
+        return dtype.type(min(math.floor(limit), np.iinfo(dtype).max))
+
+    def _reserve(self, channels: int, frames: int, dtype: np.dtype) -> None:
+        """Make sure the buffers fit a block, reallocating only when they do not."""
+        if (
+            self._derivative is not None
+            and self._derivative.dtype == dtype
+            and self._derivative.shape[0] == channels
+            and self._derivative.shape[1] >= frames
+        ):
+            return
+
+        self._derivative = np.empty((channels, frames), dtype=dtype)
+        self._mask = np.empty((channels, frames), dtype=bool)
+        self._hits = np.empty(frames, dtype=bool)
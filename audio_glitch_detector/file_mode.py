@@ -1,14 +1,214 @@
 import math
+import multiprocessing
+import os
 import sys
-from pathlib import Path
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
 
+import numpy as np
 from tqdm import tqdm
 
-from .audio import BoundedGlitchQueue, save_glitch_block
-from .readers import FileReader
-from .core import GlitchDetector
+from .audio import ArtifactWriter, ContextCapture
+from .core import DetectionResult, GlitchAggregator, GlitchDetector
+from .readers import open_file_reader
 from .tui import ConsoleOutput
-from .utils import format_time_string
+from .utils import GlitchMetrics, MetricsServer, Profiler, SourceMetrics, format_time_strings, open_result_sink
+
+# Glitches listed on the console, all of them are written with --results
+MAX_LISTED_GLITCHES = 1000
+
+
+@dataclass
+class FileAnalysis:
+    """Glitch detection result for a whole file.
+
+    `sample_indices` holds the glitches the aggregator kept in memory, which may be only the
+    first of `total_count`. `last_indices` holds the last glitches, those in `glitch_blocks`.
+    """
+
+    filename: str
+    sample_rate: int
+    duration_seconds: float
+    sample_indices: np.ndarray
+    total_count: int
+    glitch_blocks: list[tuple[int, float]] = field(default_factory=list)
+    last_indices: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+
+    @property
+    def timestamps_ms(self) -> np.ndarray:
+        """Get the glitch timestamps in milliseconds."""
+        return (self.sample_indices / self.sample_rate) * 1000.0
+
+
+def analyze_file(
+    filename: str,
+    threshold: float,
+    block_size: int,
+    running_threshold: bool = False,
+    on_block: Callable[[np.ndarray, int, DetectionResult], None] | None = None,
+    block_range: tuple[int, int] | None = None,
+    dedup_window: int = 50,
+    profiler: Profiler | None = None,
+    aggregator: GlitchAggregator | None = None,
+    metrics: SourceMetrics | None = None,
+) -> FileAnalysis:
+    """Detect glitches in a file by feeding its blocks to one stateful detector.
+
+    `on_block` is called with the samples, frame offset and result of every block.
+    `block_range` limits the analysis to blocks [first, stop) of the file. The glitches of
+    every block are passed to `aggregator`, by default one keeping all of them. Every block
+    is recorded in `metrics`.
+    """
+    profiler = profiler or Profiler()
+    aggregator = aggregator or GlitchAggregator(dedup_window)
+
+    with open_file_reader(filename, block_size=block_size, overlap=0) as reader:
+        detector = GlitchDetector(reader.sample_rate, threshold, running_threshold, dedup_window, profiler)
+
+        start_frame, stop_frame = 0, None
+        if block_range is not None:
+            first_block, stop_block = block_range
+            start_frame, stop_frame = first_block * block_size, stop_block * block_size
+            # The frame before the range continues the derivative across the seam
+            if start_frame > 0:
+                detector.start_at(start_frame, reader.read_range(start_frame - 1, 1)[:, 0])
+
+        for samples, frame_offset in profiler.iterate("read", reader.read_blocks(start_frame, stop_frame)):
+            start_time = time.perf_counter()
+            with profiler.stage("detect"):
+                result = detector.feed(samples, frame_offset)
+            detection_seconds = time.perf_counter() - start_time
+
+            kept_count = 0
+            if result.total_count > 0:
+                with profiler.stage("results"):
+                    kept_count = aggregator.add(result.sample_indices).size
+
+            if metrics is not None:
+                metrics.record_block(detection_seconds, result.threshold, kept_count, result.hit_channels)
+
+            if on_block is not None:
+                on_block(samples, frame_offset, result)
+
+        return FileAnalysis(
+            filename=filename,
+            sample_rate=reader.sample_rate,
+            duration_seconds=reader.duration_seconds,
+            sample_indices=aggregator.sample_indices,
+            total_count=aggregator.total_count,
+        )
+
+
+def _analyze_block_range(
+    filename: str,
+    threshold: float,
+    block_size: int,
+    block_range: tuple[int, int],
+    keep_glitch_blocks: int,
+    profile: bool = False,
+) -> tuple[FileAnalysis, Profiler]:
+    """Find all threshold crossings in one range of blocks in a worker process.
+
+    Nearby crossings are not filtered here, since which ones survive depends on the glitches
+    found before the range.
+    """
+    glitch_blocks = []
+    profiler = Profiler(enabled=profile)
+
+    def on_block(samples, frame_offset, result):
+        if keep_glitch_blocks and result.total_count > 0:
+            glitch_blocks.append((frame_offset, result.threshold))
+
+    analysis = analyze_file(
+        filename, threshold, block_size, on_block=on_block, block_range=block_range, dedup_window=0, profiler=profiler
+    )
+    analysis.glitch_blocks = glitch_blocks
+    return analysis, profiler
+
+
+def analyze_file_parallel(
+    filename: str,
+    threshold: float,
+    block_size: int,
+    jobs: int,
+    keep_glitch_blocks: int = 0,
+    on_progress: Callable[[int], None] | None = None,
+    blocks_per_chunk: int = 256,
+    profiler: Profiler | None = None,
+    aggregator: GlitchAggregator | None = None,
+    metrics: SourceMetrics | None = None,
+) -> FileAnalysis:
+    """Detect glitches in one file using several worker processes.
+
+    The file's blocks are split into chunks. Each worker analyzes its chunk exactly as the
+    serial pass would, starting from the frame before the chunk, and reports every threshold
+    crossing. Chunks are passed to `aggregator` in file order as soon as all chunks before
+    them are done, which filters nearby crossings like `analyze_file`, so the result is the
+    same. `on_progress` is called with the number of blocks of every finished chunk. The
+    per-block auto threshold is supported, the running threshold is not, since it depends on
+    all blocks before. Stage timings of the workers are merged into `profiler`. Blocks and
+    glitches are counted in `metrics` as chunks are merged; per-block timings, thresholds and
+    channels stay in the workers.
+    """
+    profile = profiler is not None and profiler.enabled
+    aggregator = aggregator or GlitchAggregator()
+
+    with open_file_reader(filename, block_size=block_size, overlap=0) as reader:
+        total_blocks = reader.count_blocks()
+        sample_rate = reader.sample_rate
+        duration = reader.duration_seconds
+
+    chunk_blocks = max(1, min(blocks_per_chunk, math.ceil(total_blocks / jobs)))
+    block_ranges = [(first, min(first + chunk_blocks, total_blocks)) for first in range(0, total_blocks, chunk_blocks)]
+
+    finished = {}
+    next_chunk = 0
+    glitch_blocks = []
+    last_indices = np.empty(0, dtype=np.int64)
+
+    # Spawned rather than forked, since the progress bar, artifact writer and metrics server run threads
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = {
+            executor.submit(
+                _analyze_block_range, filename, threshold, block_size, block_range, keep_glitch_blocks, profile
+            ): chunk
+            for chunk, block_range in enumerate(block_ranges)
+        }
+        for future in as_completed(futures):
+            chunk = futures[future]
+            finished[chunk], chunk_profiler = future.result()
+            if profile:
+                profiler.merge(chunk_profiler)
+            if on_progress is not None:
+                on_progress(block_ranges[chunk][1] - block_ranges[chunk][0])
+
+            # Only chunks not yet merged are held
+            while next_chunk in finished:
+                analysis = finished.pop(next_chunk)
+                first_block, stop_block = block_ranges[next_chunk]
+                next_chunk += 1
+                kept = aggregator.add(analysis.sample_indices)
+                if metrics is not None:
+                    metrics.blocks.inc(stop_block - first_block)
+                    metrics.glitches.inc(kept.size)
+                if keep_glitch_blocks and kept.size:
+                    # Keep the blocks that still hold a glitch after filtering
+                    kept_offsets = set((kept // block_size * block_size).tolist())
+                    glitch_blocks.extend(block for block in analysis.glitch_blocks if block[0] in kept_offsets)
+                    glitch_blocks = glitch_blocks[-keep_glitch_blocks:]
+                    last_indices = np.concatenate([last_indices, kept])[-keep_glitch_blocks:]
+
+    return FileAnalysis(
+        filename=filename,
+        sample_rate=sample_rate,
+        duration_seconds=duration,
+        sample_indices=aggregator.sample_indices,
+        total_count=aggregator.total_count,
+        glitch_blocks=glitch_blocks,
+        last_indices=last_indices,
+    )
 
 
 def run_file_mode(
@@ -17,18 +217,53 @@ def run_file_mode(
     block_size: int,
     save_blocks: int | None,
     output: ConsoleOutput,
+    running_threshold: bool = False,
+    jobs: int | None = 1,
+    profile: bool = False,
+    context_ms: float = 50.0,
+    results_path: str | None = None,
+    metrics_port: int | None = None,
 ) -> None:
-    """Run glitch detection on a file using block-based processing with block overlap."""
+    """Run glitch detection on a file using block-based processing.
+
+    With more than one job the file is split into chunks analyzed by parallel worker processes.
+    With `profile` a breakdown of the time spent per stage is printed at the end. Glitches are
+    saved in the background while the file is analyzed, each with `context_ms` of audio before
+    and after it, or as the whole block it was found in if `context_ms` is 0. Only the first
+    glitches are listed on the console; with `results_path` every glitch is appended to a
+    .csv, .jsonl or .bin file as it is found. With `metrics_port` detector metrics are served
+    on that local port during the analysis.
+    """
+    profiler = Profiler(enabled=profile)
+    metrics = GlitchMetrics() if metrics_port is not None else None
+    source = metrics.source(filename) if metrics is not None else None
+    writer = None
+    sink = None
+    server = None
+
     try:
-        with FileReader(filename, block_size=1, overlap=0) as temp_reader:
+        with open_file_reader(filename, block_size=block_size, overlap=0) as temp_reader:
             sample_rate = temp_reader.sample_rate
             channels = temp_reader.channels
             duration = temp_reader.duration_seconds
-            total_frames = temp_reader.frames
             bit_depth = temp_reader.bit_depth
+            total_block_count = temp_reader.count_blocks()
+
+        context_frames = round(context_ms * sample_rate / 1000)
 
-        overlap = int(block_size / 10)
-        glitch_queue = BoundedGlitchQueue(max_size=save_blocks) if save_blocks else None
+        jobs = jobs or os.cpu_count() or 1
+        if jobs > 1 and running_threshold:
+            output.log("Running threshold needs the blocks in order, analyzing on a single core", style="yellow")
+            jobs = 1
+
+        if results_path:
+            sink = open_result_sink(results_path, sample_rate)
+            sink.open()
+        aggregator = GlitchAggregator(sink=sink, keep=MAX_LISTED_GLITCHES)
+
+        if save_blocks:
+            writer = ArtifactWriter(max_artifacts=save_blocks)
+            writer.start()
 
         output.log(f"Analyzing file: {filename}")
         output.log(f"Sample rate: {sample_rate} Hz")
@@ -36,59 +271,108 @@ def run_file_mode(
         output.log(f"Bit depth: {bit_depth}")
         output.log(f"Duration: {duration:.2f} seconds")
         output.log(f"Block size: {block_size} frames")
-        output.log(f"Overlap: {overlap} samples")
-        output.log(f"Detection threshold: {threshold if threshold > 0 else 'auto'}")
-
-        total_block_count = math.ceil(total_frames / (block_size - overlap))
+        auto_mode = "auto (running)" if running_threshold else "auto"
+        output.log(f"Detection threshold: {threshold if threshold > 0 else auto_mode}")
+        if jobs > 1:
+            output.log(f"Workers: {jobs}")
 
-        with FileReader(filename, block_size=block_size, overlap=overlap) as reader:
-            detector = GlitchDetector(reader.sample_rate, threshold)
+        if metrics is not None:
+            if writer is not None:
+                metrics.registry.add_collector(lambda: metrics.artifact_writer_pending.set(writer.pending))
+            server = MetricsServer(metrics.registry, metrics_port)
+            server.start()
+            output.log(f"Serving metrics on {server.url}")
 
-            all_glitch_indices = []
-            all_glitch_timestamps = []
+        # Process blocks with progress bar
+        with tqdm(total=total_block_count, desc="Processing", unit="block") as pbar:
+            if jobs > 1:
+                analysis = analyze_file_parallel(
+                    filename,
+                    threshold,
+                    block_size,
+                    jobs,
+                    keep_glitch_blocks=save_blocks or 0,
+                    on_progress=pbar.update,
+                    profiler=profiler,
+                    aggregator=aggregator,
+                    metrics=source,
+                )
+            else:
+                capture = ContextCapture(context_frames, context_frames) if writer and context_frames else None
 
-            # Process blocks with progress bar
-            with tqdm(total=total_block_count, desc="Processing", unit="block") as pbar:
-                for samples, frame_offset in reader.read_blocks():
-                    result = detector.detect_with_offset(samples, frame_offset)
+                def on_block(samples, frame_offset, result):
+                    # Save glitches in the background, waiting when the writer is busy
+                    if capture is not None:
+                        with profiler.stage("save"):
+                            for context in capture.push(samples, frame_offset, result.sample_indices, result.threshold):
+                                writer.submit_context(context, sample_rate)
+                    elif writer and result.total_count > 0:
+                        with profiler.stage("save"):
+                            writer.submit(samples, sample_rate, frame_offset, result.threshold)
 
-                    all_glitch_indices.extend(result.sample_indices)
-                    all_glitch_timestamps.extend(result.timestamps_ms)
+                    with profiler.stage("progress"):
+                        pbar.update(1)
 
-                    # Store block for later saving if glitches detected
-                    if save_blocks and glitch_queue and result.total_count > 0:
-                        glitch_queue.add_block(samples, reader.sample_rate, frame_offset, result.threshold)
+                analysis = analyze_file(
+                    filename,
+                    threshold,
+                    block_size,
+                    running_threshold,
+                    on_block,
+                    profiler=profiler,
+                    aggregator=aggregator,
+                    metrics=source,
+                )
 
-                    pbar.update(1)
+                # Glitches at the end of the file, with their context cut short
+                if capture is not None:
+                    for context in capture.flush():
+                        writer.submit_context(context, sample_rate)
 
-            unique_indices = sorted(set(all_glitch_indices))
-            unique_timestamps = [format_time_string(detector._sample_to_milliseconds(idx)) for idx in unique_indices]
+        # Glitches found by worker processes are read back from the file
+        if writer and analysis.glitch_blocks:
+            with open_file_reader(filename, block_size=block_size, overlap=0) as reader:
+                if context_frames:
+                    block_thresholds = dict(analysis.glitch_blocks)
+                    for glitch_index in analysis.last_indices[-save_blocks:].tolist():
+                        start = max(glitch_index - context_frames, 0)
+                        samples = reader.read_range(start, glitch_index + context_frames - start)
+                        block_threshold = block_thresholds[glitch_index // block_size * block_size]
+                        with profiler.stage("save"):
+                            writer.submit(samples, sample_rate, start, block_threshold, glitch_index=glitch_index)
+                else:
+                    for frame_offset, block_threshold in analysis.glitch_blocks:
+                        samples = reader.read_range(frame_offset, block_size)
+                        with profiler.stage("save"):
+                            writer.submit(samples, sample_rate, frame_offset, block_threshold)
 
-            output.print_results(len(unique_indices), unique_timestamps)
+        if sink is not None:
+            sink.close()
 
-            # Process saved blocks if enabled
-            if save_blocks and glitch_queue and glitch_queue.count() > 0:
-                output.log(
-                    f"\nSaving {glitch_queue.count()} glitch blocks...",
-                    style="bold yellow",
-                )
+        timestamps = format_time_strings(analysis.timestamps_ms).astype(str).tolist()
+        output.print_results(analysis.total_count, timestamps)
+        if sink is not None:
+            output.log(f"Wrote {sink.count} glitches to '{sink.file_path}'", style="bold green")
 
-                with tqdm(total=glitch_queue.count(), desc="Saving blocks", unit="block") as pbar:
-                    for block in glitch_queue.get_all_blocks():
-                        save_glitch_block(
-                            block.samples,
-                            block.sample_rate,
-                            block.frame_offset,
-                            block.threshold,
-                        )
-                        pbar.update(1)
+        # Wait for the blocks still being saved
+        if writer:
+            if writer.pending:
+                output.log(f"\nSaving {writer.pending} remaining glitch blocks...", style="bold yellow")
+            writer.close()
+            output.print_artifact_summary(
+                writer.saved, str(writer.output_dir.resolve()), writer.skipped, writer.failed, writer.last_error
+            )
 
-                current_dir = Path.cwd()
-                output.log(
-                    f"Saved {glitch_queue.count()} glitch blocks to '{current_dir}/glitch_artifacts/'",
-                    style="bold green",
-                )
+        if profile:
+            output.print_profile(profiler.stats())
 
     except Exception as e:
         output.log(f"Error processing file: {e}", style="bold red")
         sys.exit(1)
+    finally:
+        if server:
+            server.close()
+        if writer:
+            writer.close()
+        if sink is not None:
+            sink.close()
@@ -0,0 +1,315 @@
+import argparse
+import json
+import math
+import sys
+from collections.abc import Generator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+GLITCH_TYPES = ("dropout", "spike", "phase_jump", "repeat")
+
+# WAV sizes are 32 bit, larger files need RF64 or W64
+MAX_WAV_BYTES = 2**32 - 1
+SUBTYPE_BYTES = {"PCM_16": 2, "PCM_24": 3, "PCM_32": 4, "FLOAT": 4, "DOUBLE": 8}
+
+
+@dataclass
+class GlitchSpec:
+    """A glitch injected into a generated signal.
+
+    `position` is the first affected sample. `length` is the number of affected samples.
+    `magnitude` is the spike level for spikes and the phase step in radians for phase jumps.
+    `channel` is the affected channel, or None for all channels.
+    """
+
+    position: int
+    glitch_type: str
+    length: int = 1
+    magnitude: float = 0.0
+    channel: int | None = None
+
+
+@dataclass
+class SignalSpec:
+    """Parameters of a generated multichannel sine recording."""
+
+    sample_rate: int = 48000
+    channels: int = 2
+    frames: int = 48000
+    frequency: float = 1000.0
+    frequency_step: float = 0.0
+    amplitude: float = 0.8
+    glitches: list[GlitchSpec] = field(default_factory=list)
+
+    @property
+    def frequencies(self) -> np.ndarray:
+        """Get the sine frequency of each channel."""
+        return self.frequency + self.frequency_step * np.arange(self.channels)
+
+
+def plan_glitches(
+    frames: int,
+    sample_rate: int,
+    channels: int,
+    count: int,
+    glitch_types: tuple[str, ...] = GLITCH_TYPES,
+    length: int = 32,
+    magnitude: float | None = None,
+    single_channel: bool = False,
+    seed: int | None = None,
+) -> list[GlitchSpec]:
+    """Place `count` glitches at random positions, one in each of `count` equal parts of the signal.
+
+    Glitches stay at least 10 ms away from the edges of their part, so neighbouring glitches
+    never overlap or fall within the detector's de-dup window of each other.
+
+    Raises:
+        ValueError: If a glitch type is unknown or the glitches do not fit in the signal
+    """
+    unknown = set(glitch_types) - set(GLITCH_TYPES)
+    if unknown:
+        raise ValueError(f"Unknown glitch types: {', '.join(sorted(unknown))}")
+    if count == 0:
+        return []
+
+    margin = max(int(sample_rate / 100), length)
+    part = frames // count
+    if part <= 2 * margin + length:
+        raise ValueError(f"{count} glitches do not fit in {frames} frames")
+
+    rng = np.random.default_rng(seed)
+    starts = np.arange(count) * part + margin
+    positions = starts + rng.integers(0, part - 2 * margin - length, size=count)
+    types = rng.choice(glitch_types, size=count)
+    glitch_channels = rng.integers(0, channels, size=count)
+
+    default_magnitudes = {"spike": 1.0, "phase_jump": math.pi / 2}
+    return [
+        GlitchSpec(
+            position=int(position),
+            glitch_type=str(glitch_type),
+            length=1 if glitch_type in ("spike", "phase_jump") else length,
+            magnitude=default_magnitudes.get(glitch_type, 0.0) if magnitude is None else magnitude,
+            channel=int(channel) if single_channel else None,
+        )
+        for position, glitch_type, channel in zip(positions, types, glitch_channels, strict=True)
+    ]
+
+
+class SignalGenerator:
+    """Generates a sine recording with injected glitches block by block, in bounded memory.
+
+    Every block is computed from the absolute sample positions, so the signal is the same for
+    any block size. Phase jumps shift the phase of all later samples; dropouts silence,
+    spikes replace and repeats replay the samples they cover.
+    """
+
+    def __init__(self, spec: SignalSpec):
+        self.spec = spec
+        self._glitches = sorted(spec.glitches, key=lambda glitch: glitch.position)
+        self._positions = np.array([glitch.position for glitch in self._glitches], dtype=np.int64)
+        self._max_length = max((glitch.length for glitch in self._glitches), default=0)
+
+        # Cumulative phase offset per channel after each phase jump
+        jumps = [glitch for glitch in self._glitches if glitch.glitch_type == "phase_jump"]
+        self._jump_positions = np.array([glitch.position for glitch in jumps], dtype=np.int64)
+        steps = np.zeros((spec.channels, len(jumps) + 1))
+        for i, glitch in enumerate(jumps):
+            if glitch.channel is None:
+                steps[:, i + 1] = glitch.magnitude
+            else:
+                steps[glitch.channel, i + 1] = glitch.magnitude
+        self._phase_offsets = np.cumsum(steps, axis=1)
+
+    def blocks(self, block_size: int = 65536) -> Generator[np.ndarray, None, None]:
+        """Yield the signal in blocks with shape (channels, samples)."""
+        for start in range(0, self.spec.frames, block_size):
+            yield self.block(start, min(block_size, self.spec.frames - start))
+
+    def block(self, start: int, frames: int) -> np.ndarray:
+        """Generate `frames` samples starting at sample `start`, with shape (channels, samples)."""
+        positions = np.arange(start, start + frames, dtype=np.int64)
+        samples = self._sine(positions)
+
+        # Glitches that may overlap the block
+        first = int(np.searchsorted(self._positions, start - self._max_length, side="right"))
+        stop = int(np.searchsorted(self._positions, start + frames, side="left"))
+        for glitch in self._glitches[first:stop]:
+            if glitch.position + glitch.length > start:
+                self._apply(glitch, samples, start)
+
+        return samples
+
+    def _sine(self, positions: np.ndarray, shift: int = 0) -> np.ndarray:
+        """Evaluate the clean signal, including phase jumps, at sample positions minus `shift`."""
+        jump_index = np.searchsorted(self._jump_positions, positions, side="right")
+        phase = 2 * np.pi * self.spec.frequencies[:, None] * ((positions - shift) / self.spec.sample_rate)
+        phase += self._phase_offsets[:, jump_index]
+        return self.spec.amplitude * np.sin(phase)
+
+    def _apply(self, glitch: GlitchSpec, samples: np.ndarray, start: int) -> None:
+        """Apply a glitch to the part of it that falls in a block starting at sample `start`."""
+        if glitch.glitch_type == "phase_jump":
+            return  # already part of the phase
+
+        begin = max(glitch.position, start) - start
+        end = min(glitch.position + glitch.length, start + samples.shape[1]) - start
+        rows = slice(None) if glitch.channel is None else slice(glitch.channel, glitch.channel + 1)
+        target = samples[rows, begin:end]
+
+        if glitch.glitch_type == "dropout":
+            target[:] = 0.0
+        elif glitch.glitch_type == "spike":
+            # Jump to the opposite side of zero, so the step is at least the spike level
+            target[:] = np.where(target > 0, -glitch.magnitude, glitch.magnitude)
+        elif glitch.glitch_type == "repeat":
+            positions = np.arange(begin + start, end + start, dtype=np.int64)
+            target[:] = self._sine(positions, shift=glitch.length)[rows]
+
+
+def write_signal(file_path: str | Path, spec: SignalSpec, subtype: str = "PCM_24", block_size: int = 65536) -> Path:
+    """Write a generated signal to an audio file and its ground truth next to it. Returns the sidecar path.
+
+    Raises:
+        ValueError: If a WAV file would exceed 4 GB
+    """
+    file_path = Path(file_path)
+    size = spec.frames * spec.channels * SUBTYPE_BYTES.get(subtype, 4)
+    if file_path.suffix.lower() == ".wav" and size > MAX_WAV_BYTES:
+        raise ValueError("WAV files are limited to 4 GB, use a .rf64 or .w64 file")
+
+    generator = SignalGenerator(spec)
+    with sf.SoundFile(
+        str(file_path), mode="w", samplerate=spec.sample_rate, channels=spec.channels, subtype=subtype
+    ) as f:
+        for samples in generator.blocks(block_size):
+            f.write(samples.T)
+
+    return write_ground_truth(file_path, spec, subtype)
+
+
+def write_ground_truth(file_path: Path, spec: SignalSpec, subtype: str) -> Path:
+    """Write the signal parameters and glitch positions to a JSON sidecar next to the audio file."""
+    sidecar = file_path.with_suffix(".json")
+    ground_truth = {
+        "file": file_path.name,
+        "subtype": subtype,
+        **asdict(spec),
+        "frequencies": spec.frequencies.tolist(),
+    }
+    sidecar.write_text(json.dumps(ground_truth, indent=2))
+    return sidecar
+
+
+def load_ground_truth(sidecar: str | Path) -> SignalSpec:
+    """Read a ground truth sidecar written by `write_ground_truth`."""
+    data = json.loads(Path(sidecar).read_text())
+    return SignalSpec(
+        sample_rate=data["sample_rate"],
+        channels=data["channels"],
+        frames=data["frames"],
+        frequency=data["frequency"],
+        frequency_step=data["frequency_step"],
+        amplitude=data["amplitude"],
+        glitches=[GlitchSpec(**glitch) for glitch in data["glitches"]],
+    )
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create and configure argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Generate long multichannel sine recordings with glitches at known positions"
+    )
+    parser.add_argument("output", help="Audio file to write. A JSON ground truth is written next to it")
+    parser.add_argument("-d", "--duration", type=float, default=60.0, help="Duration in seconds (default: 60)")
+    parser.add_argument("-r", "--sample_rate", type=int, default=48000, help="Sample rate (default: 48000)")
+    parser.add_argument("-c", "--channels", type=int, default=2, help="Number of channels (default: 2)")
+    parser.add_argument("--frequency", type=float, default=1000.0, help="Sine frequency in Hz (default: 1000)")
+    parser.add_argument(
+        "--frequency-step",
+        type=float,
+        default=0.0,
+        help="Frequency added per channel, for a different tone on each channel (default: 0)",
+    )
+    parser.add_argument("--amplitude", type=float, default=0.8, help="Sine amplitude (default: 0.8)")
+    parser.add_argument(
+        "--subtype",
+        default="PCM_24",
+        choices=sorted(SUBTYPE_BYTES),
+        help="Sample format (default: PCM_24)",
+    )
+    parser.add_argument("-g", "--glitches", type=int, default=10, help="Number of glitches to inject (default: 10)")
+    parser.add_argument(
+        "--types",
+        nargs="+",
+        default=list(GLITCH_TYPES),
+        choices=GLITCH_TYPES,
+        help="Glitch types to choose from (default: all)",
+    )
+    parser.add_argument(
+        "--length",
+        type=int,
+        default=32,
+        help="Length in samples of dropouts and repeats (default: 32)",
+    )
+    parser.add_argument(
+        "--magnitude",
+        type=float,
+        default=None,
+        help="Spike level, or phase step in radians for phase jumps (default: 1.0 and pi/2)",
+    )
+    parser.add_argument(
+        "--single-channel",
+        action="store_true",
+        help="Inject each glitch into one random channel instead of all channels",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for the glitch positions")
+    parser.add_argument(
+        "--block-size",
+        type=int,
+        default=65536,
+        help="Block size (frames) written at a time (default: 65536)",
+    )
+    return parser
+
+
+def main() -> None:
+    """Generator CLI entry point."""
+    args = create_parser().parse_args()
+
+    frames = int(args.duration * args.sample_rate)
+    try:
+        glitches = plan_glitches(
+            frames,
+            args.sample_rate,
+            args.channels,
+            args.glitches,
+            tuple(args.types),
+            args.length,
+            args.magnitude,
+            args.single_channel,
+            args.seed,
+        )
+        spec = SignalSpec(
+            sample_rate=args.sample_rate,
+            channels=args.channels,
+            frames=frames,
+            frequency=args.frequency,
+            frequency_step=args.frequency_step,
+            amplitude=args.amplitude,
+            glitches=glitches,
+        )
+        sidecar = write_signal(args.output, spec, args.subtype, args.block_size)
+    except (ValueError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Wrote {args.duration:.1f} s, {args.channels} channels, {len(glitches)} glitches to {args.output}")
+    print(f"Ground truth: {sidecar}")
+
+
+if __name__ == "__main__":
+    main()
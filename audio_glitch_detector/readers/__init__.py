@@ -1,6 +1,29 @@
-"""Audio readers for files and streams."""
+"""Audio readers for files and streams.
 
-from .file_reader import FileReader
-from .stream_reader import StreamReader
+Submodules are imported on first access, so file readers do not load PortAudio.
+"""
 
-__all__ = ["FileReader", "StreamReader"]
+import importlib
+
+_EXPORTS = {
+    "FileReader": ".file_reader",
+    "MappedWavReader": ".wav_reader",
+    "StreamReader": ".stream_reader",
+    "StreamScheduler": ".stream_scheduler",
+    "open_file_reader": ".wav_reader",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    """Import the submodule defining `name` on first access."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
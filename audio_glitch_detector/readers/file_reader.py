@@ -1,3 +1,4 @@
+import math
 from collections.abc import Generator
 from pathlib import Path
 
@@ -5,10 +6,17 @@ import numpy as np
 import soundfile as sf
 
 
+def block_count(frames: int, block_size: int, overlap: int) -> int:
+    """Get the number of overlapping blocks needed to cover a number of frames."""
+    if frames <= block_size:
+        return 1 if frames > 0 else 0
+    return 1 + math.ceil((frames - block_size) / (block_size - overlap))
+
+
 class FileReader:
     """Reads audio files and provides samples for glitch detection."""
 
-    def __init__(self, file_path: str, block_size: int, overlap: int = 0):
+    def __init__(self, file_path: str, block_size: int, overlap: int | None = None):
         self.file_path = Path(file_path)
         self._file: sf.SoundFile | None = None
         self._info: sf._SoundFileInfo | None = None
@@ -21,7 +29,7 @@ class FileReader:
             self._file = sf.SoundFile(str(self.file_path))
             self._info = sf.info(str(self.file_path))
 
-            if self.overlap == 0:
+            if self.overlap is None:
                 self.overlap = int(self._info.samplerate / 1000)  # 1ms default
 
         except Exception as e:
@@ -79,14 +87,30 @@ class FileReader:
         else:
             return samples.T
 
-    def read_blocks(self) -> Generator[tuple[np.ndarray, int], None, None]:
-        """Read file in blocks with overlap. Yields tuple of (samples, frame_offset) where samples has shape (channels, samples)"""
+    def read_range(self, start_frame: int, frames: int) -> np.ndarray:
+        """Read a range of frames. Return ndarray of samples with shape (channels, samples)"""
+        if self._file is None:
+            raise RuntimeError("File not opened")
+
+        self._file.seek(start_frame)
+        samples = self._file.read(frames, always_2d=True)
+        return samples.T
+
+    def read_blocks(
+        self, start_frame: int = 0, stop_frame: int | None = None
+    ) -> Generator[tuple[np.ndarray, int], None, None]:
+        """Read file in blocks with overlap. Yields tuple of (samples, frame_offset) where samples has shape (channels, samples)
+
+        Blocks start at `start_frame`. The last block is cut short at `stop_frame`, if given.
+        """
         if self._file is None:
             raise RuntimeError("File not opened")
 
-        current_frame = 0
+        current_frame = start_frame
 
-        for block in sf.blocks(str(self.file_path), blocksize=self.block_size, overlap=self.overlap):
+        for block in sf.blocks(
+            str(self.file_path), blocksize=self.block_size, overlap=self.overlap, start=start_frame, stop=stop_frame
+        ):
             if self.channels == 1:
                 samples = block.reshape(1, -1)
             else:
@@ -95,6 +119,10 @@ class FileReader:
             yield samples, current_frame
             current_frame += self.block_size - self.overlap
 
+    def count_blocks(self) -> int:
+        """Get the number of blocks `read_blocks` yields for the whole file."""
+        return block_count(self.frames, self.block_size, self.overlap)
+
     def __enter__(self):
         """Context manager entry."""
         self.open()
@@ -0,0 +1,99 @@
+from threading import Event
+
+import numpy as np
+
+
+class BlockRingBuffer:
+    """Preallocated ring of fixed size audio blocks between one producer and one consumer.
+
+    The producer (the PortAudio callback) copies each captured buffer into the next free slot
+    and never waits: when the ring is full the block is dropped and counted. The consumer
+    processes slots in place and releases them afterwards. Each side only advances its own
+    index, so no lock is taken on the data path. An event only wakes an idle consumer; rings
+    consumed by one thread may share it through `data_ready`.
+    """
+
+    def __init__(self, capacity: int, frames: int, channels: int, dtype: np.dtype, data_ready: Event | None = None):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+
+        self.capacity = capacity
+        self.frames = frames
+        self.channels = channels
+        self._slots = np.empty((capacity, frames * channels), dtype=dtype)
+        self._lengths = np.zeros(capacity, dtype=np.int64)
+        self._frame_numbers = np.zeros(capacity, dtype=np.int64)
+        self._capture_times = np.zeros(capacity, dtype=np.float64)
+        self._write_index = 0
+        self._read_index = 0
+        self._next_frame = 0
+        self._data_ready = data_ready or Event()
+
+        self.dropped_blocks = 0
+        self.peak_fill = 0
+
+    def write(self, data: bytes, capture_time: float = 0.0) -> bool:
+        """Copy an interleaved block into the ring. Returns False if the ring was full and the block dropped.
+
+        Frame numbers keep counting dropped blocks, so later blocks keep their true position.
+        `capture_time` is kept with the block, see `capture_time`.
+        """
+        samples = np.frombuffer(data, dtype=self._slots.dtype)
+        frame_number = self._next_frame
+        self._next_frame += len(samples) // self.channels
+
+        fill = self._write_index - self._read_index
+        if fill >= self.capacity:
+            self.dropped_blocks += 1
+            return False
+
+        slot = self._write_index % self.capacity
+        length = min(len(samples), self._slots.shape[1])
+        self._slots[slot, :length] = samples[:length]
+        self._lengths[slot] = length
+        self._frame_numbers[slot] = frame_number
+        self._capture_times[slot] = capture_time
+
+        self._write_index += 1
+        self.peak_fill = max(self.peak_fill, fill + 1)
+        self._data_ready.set()
+        return True
+
+    def peek(self) -> tuple[np.ndarray, int] | None:
+        """Get the oldest block as (channel-major view, frame number) without releasing it, or None if empty."""
+        if self._read_index == self._write_index:
+            return None
+
+        slot = self._read_index % self.capacity
+        samples = self._slots[slot, : self._lengths[slot]]
+        return samples.reshape(-1, self.channels).T, int(self._frame_numbers[slot])
+
+    def capture_time(self) -> float:
+        """Get the capture time the oldest block was written with."""
+        return float(self._capture_times[self._read_index % self.capacity])
+
+    def release(self) -> None:
+        """Hand the oldest block's slot back to the producer."""
+        if self._read_index < self._write_index:
+            self._read_index += 1
+
+    def wait(self, timeout: float) -> bool:
+        """Wait until a block is available. Returns False on timeout."""
+        if self._read_index != self._write_index:
+            return True
+
+        self._data_ready.clear()
+        # The producer may have written between the check and the clear
+        if self._read_index != self._write_index:
+            return True
+        return self._data_ready.wait(timeout) and self._read_index != self._write_index
+
+    @property
+    def fill(self) -> int:
+        """Get the number of blocks waiting to be processed."""
+        return self._write_index - self._read_index
+
+    @property
+    def fill_level(self) -> float:
+        """Get the fraction of the ring in use."""
+        return self.fill / self.capacity
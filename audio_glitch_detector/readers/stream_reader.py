@@ -1,83 +1,126 @@
-import math
 import time
 from collections.abc import Callable
 from threading import Event, Thread
+from typing import TYPE_CHECKING
 
 import numpy as np
-import pyaudio
 
 from ..core.analysis import (
     from_bytes,
+    full_scale,
     normalize_samples,
     split_channels,
     to_float,
 )
 from ..audio.config import AudioConfig
+from ..utils.stream_health import StreamHealth, StreamHealthStats
+from .ring_buffer import BlockRingBuffer
+
+if TYPE_CHECKING:
+    import pyaudio
 
 
 class VolumeMeter:
-    """Simple volume meter for audio monitoring."""
+    """Peak volume meter for audio monitoring, for any number of channels."""
 
-    def __init__(self):
-        self.peak_raw = [0.0, 0.0]
-        self.peak_db = [0.0, 0.0]
+    def __init__(self, channels: int = 2):
+        self.channels = channels
+        self.peak_raw = np.zeros(channels)
+        self.peak_db = np.zeros(channels)
 
     def update(self, samples: np.ndarray) -> None:
-        """Update meter with new samples."""
+        """Update meter with new samples. Integer samples are measured relative to full scale."""
         if samples.ndim == 1:
             samples = samples.reshape(1, -1)
 
-        num_channels = min(samples.shape[0], 2)
-
-        for channel in range(num_channels):
-            peak = np.max(np.abs(samples[channel]))
-            if peak > self.peak_raw[channel]:
-                self.peak_raw[channel] = peak
+        num_channels = min(samples.shape[0], self.channels)
+        samples = samples[:num_channels]
+        # Widened before negating, -(-32768) does not fit in int16
+        peaks = np.maximum(samples.max(axis=1).astype(np.float64), -samples.min(axis=1).astype(np.float64))
+        np.maximum(self.peak_raw[:num_channels], peaks / full_scale(samples.dtype), out=self.peak_raw[:num_channels])
 
     def get_peak_db(self) -> list[float]:
         """Get peak levels in dB and reset."""
-        for channel in range(2):
-            if self.peak_raw[channel] > 0.0:
-                self.peak_db[channel] = 20.0 * math.log10(self.peak_raw[channel])
-            else:
-                self.peak_db[channel] = -120.0  # Silence floor
-            self.peak_raw[channel] = 0.0
+        silent = self.peak_raw <= 0.0
+        self.peak_db = 20.0 * np.log10(np.where(silent, 1.0, self.peak_raw))
+        self.peak_db[silent] = -120.0  # Silence floor
+        self.peak_raw[:] = 0.0
 
-        return self.peak_db.copy()
+        return self.peak_db.tolist()
 
 
 class StreamReader:
-    """Reads real-time audio streams for glitch detection."""
+    """Reads real-time audio streams for glitch detection.
+
+    In callback capture mode PortAudio's callback only copies each block into a ring buffer,
+    and detection runs on a separate consumer thread. A slow block then fills the ring instead
+    of stalling capture. In blocking mode the monitoring thread reads and detects in turn.
+    The latency and processing time of every block are tracked in `health`.
+
+    Several readers can share one PortAudio instance through `audio`, which they then do not
+    terminate, and in callback mode be consumed by one thread through `process_block`, woken
+    by a shared `data_ready` event. Stream errors and stops are reported through `log`, by
+    default printed.
+    """
 
     def __init__(
         self,
         config: AudioConfig,
         device_id: int | None = None,
         signal_threshold_db: float = -40.0,
+        audio: "pyaudio.PyAudio | None" = None,
+        data_ready: Event | None = None,
+        log: Callable[[str], None] = print,
     ):
         self.config = config
         self.device_id = device_id
         self.signal_threshold_db = signal_threshold_db
 
+        self._audio = audio
+        self._data_ready = data_ready
+        self._log = log
         self._pyaudio: pyaudio.PyAudio | None = None
         self._stream: pyaudio.Stream | None = None
         self._running = False
         self._thread: Thread | None = None
+        self._ring: BlockRingBuffer | None = None
+        # PortAudio constants the capture callback needs, bound when the stream opens
+        self._input_overflow_flag = 0
+        self._continue_flag = 0
 
-        self.volume_meter = VolumeMeter()
+        self.volume_meter = VolumeMeter(config.channels)
+        self.health = StreamHealth(config.sample_rate)
 
     def open(self) -> None:
         """Open the audio stream."""
+        import pyaudio
+
         self.config.validate()
-        self._pyaudio = pyaudio.PyAudio()
-        self._stream = self._pyaudio.open(
-            format=self.config.pyaudio_format,
-            channels=self.config.channels,
-            rate=self.config.sample_rate,
-            input_device_index=self.device_id,
-            input=True,
-            frames_per_buffer=int(self.config.block_size),
-        )
+        self._pyaudio = self._audio or pyaudio.PyAudio()
+
+        stream_options = {
+            "format": self.config.pyaudio_format,
+            "channels": self.config.channels,
+            "rate": self.config.sample_rate,
+            "input_device_index": self.device_id,
+            "input": True,
+            "frames_per_buffer": int(self.config.block_size),
+        }
+
+        if self.config.capture_mode == "callback":
+            self._input_overflow_flag = pyaudio.paInputOverflow
+            self._continue_flag = pyaudio.paContinue
+            self._ring = BlockRingBuffer(
+                self.config.buffer_blocks,
+                self.config.block_size,
+                self.config.channels,
+                self.config.sample_dtype,
+                self._data_ready,
+            )
+            # Started with monitoring, so blocks do not pile up in the ring before then
+            self._stream = self._pyaudio.open(**stream_options, stream_callback=self._capture_callback, start=False)
+        else:
+            self._stream = self._pyaudio.open(**stream_options)
 
     def close(self) -> None:
         """Close the audio stream."""
@@ -87,7 +130,8 @@ class StreamReader:
             self._stream = None
 
         if self._pyaudio is not None:
-            self._pyaudio.terminate()
+            if self._audio is None:
+                self._pyaudio.terminate()
             self._pyaudio = None
 
     def start_monitoring(self, callback: Callable[[np.ndarray, int], None], exit_event: Event) -> Thread:
@@ -100,10 +144,50 @@ class StreamReader:
             raise RuntimeError("Stream not opened")
 
         self._running = True
-        self._thread = Thread(target=self._monitoring_loop, args=(callback, exit_event))
+
+        if self._ring is not None:
+            self._thread = Thread(target=self._consumer_loop, args=(callback, exit_event))
+            self.start_capture()
+        else:
+            self._thread = Thread(target=self._monitoring_loop, args=(callback, exit_event))
+
         self._thread.start()
         return self._thread
 
+    def start_capture(self) -> None:
+        """Start filling the ring buffer in callback mode, for a consumer calling `process_block`.
+
+        Raises:
+            RuntimeError if the stream is not opened in callback mode.
+        """
+        if self._stream is None or self._ring is None:
+            raise RuntimeError("Stream not opened in callback mode")
+
+        self._running = True
+        self._stream.start_stream()
+
+    def process_block(self, callback: Callable[[np.ndarray, int], None]) -> bool:
+        """Run `callback` on the oldest captured block and release it. Returns False if none is waiting."""
+        block = self._ring.peek()
+        if block is None:
+            return False
+
+        samples, frame_number = block
+        # Blocks captured while paused are discarded
+        if self._running:
+            start_time = time.perf_counter()
+            self.volume_meter.update(samples)
+            callback(samples, frame_number)
+            self.health.record_block(samples.shape[1], self._ring.capture_time(), start_time, time.perf_counter())
+
+        self._ring.release()
+        return True
+
+    @property
+    def is_active(self) -> bool:
+        """Check whether the stream is still capturing."""
+        return self._stream is not None and self._stream.is_active()
+
     def stop_monitoring(self) -> None:
         """Stop monitoring (pause data processing)."""
         self._running = False
@@ -114,6 +198,8 @@ class StreamReader:
 
     def _monitoring_loop(self, callback: Callable[[np.ndarray, int], None], exit_event: Event) -> None:
         """Main monitoring loop running in background thread."""
+        import pyaudio
+
         frame_number = 0
 
         try:
@@ -125,18 +211,26 @@ class StreamReader:
                 try:
                     num_frames = int(self.config.block_size)
                     raw_data = self._stream.read(num_frames)
+                    # The read returns as soon as the block is captured
+                    capture_time = time.perf_counter()
+                    # Channel-major view over the captured buffer, nothing is copied
                     samples = from_bytes(raw_data, self.config.channels, self.config.bit_depth)
                     samples = split_channels(samples, self.config.channels)
-                    samples = to_float(samples)
 
                     # Update volume meter
                     self.volume_meter.update(samples)
 
                     callback(samples, frame_number)
+                    self.health.record_block(samples.shape[1], capture_time, capture_time, time.perf_counter())
                     frame_number += self.config.block_size
 
                 except OSError as e:
-                    print(f"Audio stream error: {e}")
+                    if e.errno == pyaudio.paInputOverflowed:
+                        # The block is lost, the next one continues after a gap
+                        self.health.input_overflows += 1
+                        frame_number += self.config.block_size
+                        continue
+                    self._log(f"Audio stream error: {e}")
                     break
 
         except KeyboardInterrupt:
@@ -144,12 +238,59 @@ class StreamReader:
         finally:
             self.close()
 
+    def _capture_callback(self, in_data: bytes, frame_count: int, time_info: dict, status_flags: int) -> tuple:
+        """PortAudio callback: copy the captured block into the ring buffer and return at once."""
+        if status_flags & self._input_overflow_flag:
+            self.health.input_overflows += 1
+
+        # Date the block back to when its first sample was converted, if the host API tells
+        capture_time = time.perf_counter()
+        if time_info:
+            adc_delay = time_info.get("current_time", 0.0) - time_info.get("input_buffer_adc_time", 0.0)
+            if 0.0 < adc_delay < 1.0:
+                capture_time -= adc_delay
+
+        self._ring.write(in_data, capture_time)
+        return None, self._continue_flag
+
+    def _consumer_loop(self, callback: Callable[[np.ndarray, int], None], exit_event: Event) -> None:
+        """Detection loop consuming blocks from the ring buffer in a background thread."""
+        try:
+            while not exit_event.is_set():
+                if not self._ring.wait(timeout=0.1):
+                    if not self._stream.is_active():
+                        self._log("Audio stream stopped")
+                        break
+                    continue
+
+                self.process_block(callback)
+
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    @property
+    def input_overflows(self) -> int:
+        """Get the number of blocks PortAudio reported an input overflow for."""
+        return self.health.input_overflows
+
+    def get_stream_health(self) -> StreamHealthStats:
+        """Get latency, real-time factor, ring buffer fill level, dropped blocks and input overflows."""
+        if self._ring is None:
+            return self.health.stats()
+
+        return self.health.stats(
+            buffer_fill=self._ring.fill_level,
+            peak_buffer_fill=self._ring.peak_fill / self._ring.capacity,
+            dropped_blocks=self._ring.dropped_blocks,
+        )
+
     def _process_raw_data(self, raw_data: bytes) -> np.ndarray | None:
         """Process raw audio data into samples."""
         # Convert to samples
         samples = from_bytes(raw_data, self.config.channels, self.config.bit_depth)
         samples = split_channels(samples, self.config.channels)
-        samples = to_float(samples)
 
         # Update volume meter
         self.volume_meter.update(samples)
@@ -160,7 +301,7 @@ class StreamReader:
             return None
 
         # Normalize for analysis
-        samples = normalize_samples(samples)
+        samples = normalize_samples(to_float(samples))
         return samples
 
     def get_volume_db(self) -> list[float]:
@@ -0,0 +1,60 @@
+from collections.abc import Callable
+from threading import Event, Thread
+
+import numpy as np
+
+from .stream_reader import StreamReader
+
+
+class StreamScheduler:
+    """Consumes the ring buffers of several callback mode streams from one thread.
+
+    Every reader shares `data_ready`, so one wait covers all devices. Each pass takes at most
+    one block from every stream in turn, so a busy device cannot starve the others. The end of
+    all streams is reported through `log`, by default printed.
+    """
+
+    def __init__(self, log: Callable[[str], None] = print):
+        self.data_ready = Event()
+        self._log = log
+        self._streams: list[tuple[StreamReader, Callable[[np.ndarray, int], None]]] = []
+
+    def add(self, reader: StreamReader, callback: Callable[[np.ndarray, int], None]) -> None:
+        """Add an opened reader and the callback its blocks are processed with."""
+        self._streams.append((reader, callback))
+
+    def run_once(self) -> int:
+        """Process one waiting block from every stream. Returns the number of blocks processed."""
+        processed = 0
+        for reader, callback in self._streams:
+            processed += reader.process_block(callback)
+        return processed
+
+    def start(self, exit_event: Event) -> Thread:
+        """Start capture on every stream and the thread consuming them."""
+        for reader, _ in self._streams:
+            reader.start_capture()
+
+        thread = Thread(target=self._loop, args=(exit_event,))
+        thread.start()
+        return thread
+
+    def _loop(self, exit_event: Event) -> None:
+        """Round-robin over the streams until exit is requested or every stream has stopped."""
+        try:
+            while not exit_event.is_set():
+                # Cleared before the pass, so a block written during it wakes the next wait
+                self.data_ready.clear()
+                if self.run_once():
+                    continue
+
+                if not any(reader.is_active for reader, _ in self._streams):
+                    # Blocks written just before the streams stopped are still processed
+                    while self.run_once():
+                        pass
+                    self._log("Audio streams stopped")
+                    break
+                self.data_ready.wait(timeout=0.1)
+        finally:
+            for reader, _ in self._streams:
+                reader.close()
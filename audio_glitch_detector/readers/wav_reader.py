@@ -0,0 +1,251 @@
+import struct
+from collections.abc import Generator
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .file_reader import FileReader, block_count
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Sample formats that map directly onto a NumPy dtype: (format tag, bits per sample) -> dtype
+MAPPABLE_FORMATS = {
+    (WAVE_FORMAT_PCM, 16): np.dtype("<i2"),
+    (WAVE_FORMAT_PCM, 32): np.dtype("<i4"),
+    (WAVE_FORMAT_IEEE_FLOAT, 32): np.dtype("<f4"),
+    (WAVE_FORMAT_IEEE_FLOAT, 64): np.dtype("<f8"),
+}
+
+FORMAT_NAMES = {
+    WAVE_FORMAT_PCM: "PCM",
+    WAVE_FORMAT_IEEE_FLOAT: "float",
+}
+
+
+@dataclass
+class WavLayout:
+    """Location and format of the sample data in a WAV or RF64 file."""
+
+    sample_rate: int
+    channels: int
+    format_tag: int
+    bits_per_sample: int
+    data_offset: int
+    frames: int
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Get the NumPy dtype of one sample.
+
+        Raises:
+            ValueError: If the sample format cannot be memory-mapped
+        """
+        try:
+            return MAPPABLE_FORMATS[(self.format_tag, self.bits_per_sample)]
+        except KeyError:
+            raise ValueError(
+                f"Unsupported sample format for memory mapping: {self.bits_per_sample} bit {self.format_name}"
+            ) from None
+
+    @property
+    def is_mappable(self) -> bool:
+        """Check whether the sample format can be memory-mapped."""
+        return (self.format_tag, self.bits_per_sample) in MAPPABLE_FORMATS
+
+    @property
+    def format_name(self) -> str:
+        """Get a readable name of the sample format."""
+        return FORMAT_NAMES.get(self.format_tag, f"format 0x{self.format_tag:04x}")
+
+
+def parse_wav_header(file_path: str | Path) -> WavLayout:
+    """Parse the header of a little-endian WAV or RF64 file.
+
+    Raises:
+        ValueError: If the file is not a WAV/RF64 file or lacks a fmt or data chunk
+    """
+    with open(file_path, "rb") as f:
+        riff_id, _, wave_id = struct.unpack("<4sI4s", f.read(12))
+        if riff_id not in (b"RIFF", b"RF64") or wave_id != b"WAVE":
+            raise ValueError("Not a RIFF/RF64 WAVE file")
+
+        file_size = Path(file_path).stat().st_size
+        fmt = None
+        rf64_data_size = None
+
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError("No data chunk found")
+
+            chunk_id, chunk_size = struct.unpack("<4sI", header)
+            chunk_start = f.tell()
+
+            if chunk_id == b"ds64":
+                _, rf64_data_size = struct.unpack("<QQ", f.read(16))
+            elif chunk_id == b"fmt ":
+                fmt = f.read(chunk_size)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError("Data chunk found before fmt chunk")
+                if riff_id == b"RF64" and chunk_size == 0xFFFFFFFF and rf64_data_size is not None:
+                    chunk_size = rf64_data_size
+                return _layout_from_fmt(fmt, chunk_start, min(chunk_size, file_size - chunk_start))
+
+            # Chunks are padded to an even number of bytes
+            f.seek(chunk_start + chunk_size + (chunk_size & 1))
+
+
+def _layout_from_fmt(fmt: bytes, data_offset: int, data_size: int) -> WavLayout:
+    """Build the layout from the contents of a fmt chunk."""
+    format_tag, channels, sample_rate, _, block_align, bits_per_sample = struct.unpack("<HHIIHH", fmt[:16])
+
+    if format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        # The first two bytes of the sub format GUID hold the actual format tag
+        (format_tag,) = struct.unpack("<H", fmt[24:26])
+
+    return WavLayout(
+        sample_rate=sample_rate,
+        channels=channels,
+        format_tag=format_tag,
+        bits_per_sample=bits_per_sample,
+        data_offset=data_offset,
+        frames=data_size // block_align if block_align else 0,
+    )
+
+
+class MappedWavReader:
+    """Reads uncompressed PCM or float WAV/RF64 files through a memory map.
+
+    Has the same interface as FileReader, but samples are returned in their native dtype as
+    views into the mapped data chunk instead of decoded float64 copies. Integer samples are
+    full scale PCM, see `to_float`.
+    """
+
+    def __init__(self, file_path: str, block_size: int, overlap: int | None = None):
+        self.file_path = Path(file_path)
+        self.block_size = block_size
+        self.overlap = overlap
+        self._layout: WavLayout | None = None
+        self._data: np.ndarray | None = None
+
+    @staticmethod
+    def supports(file_path: str | Path) -> bool:
+        """Check whether a file can be memory-mapped by this reader."""
+        try:
+            return parse_wav_header(file_path).is_mappable
+        except (OSError, ValueError, struct.error):
+            return False
+
+    def open(self) -> None:
+        """Parse the header and map the data chunk."""
+        try:
+            layout = parse_wav_header(self.file_path)
+            dtype = layout.dtype
+
+            if layout.frames > 0:
+                self._data = np.memmap(
+                    self.file_path,
+                    dtype=dtype,
+                    mode="r",
+                    offset=layout.data_offset,
+                    shape=(layout.frames, layout.channels),
+                )
+            else:
+                self._data = np.empty((0, layout.channels), dtype=dtype)
+            self._layout = layout
+
+            if self.overlap is None:
+                self.overlap = int(layout.sample_rate / 1000)  # 1ms default
+
+        except Exception as e:
+            raise OSError(f"Failed to open audio file: {e}") from e
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._data = None
+
+    @property
+    def sample_rate(self) -> int:
+        """Get the sample rate of the audio file."""
+        return self._opened_layout().sample_rate
+
+    @property
+    def channels(self) -> int:
+        """Get the number of channels."""
+        return self._opened_layout().channels
+
+    @property
+    def frames(self) -> int:
+        """Get total number of frames."""
+        return self._opened_layout().frames
+
+    @property
+    def duration_seconds(self) -> float:
+        """Get duration in seconds."""
+        return self.frames / self.sample_rate
+
+    @property
+    def bit_depth(self) -> str:
+        """Get bit depth information."""
+        layout = self._opened_layout()
+        return f"{layout.bits_per_sample} bit {layout.format_name} (memory mapped)"
+
+    def read_all(self) -> np.ndarray:
+        """Get the entire file as a view with shape (channels, samples)."""
+        return self._opened_data().T
+
+    def read_range(self, start_frame: int, frames: int) -> np.ndarray:
+        """Get a range of frames as a view with shape (channels, samples)."""
+        return self._opened_data()[start_frame : start_frame + frames].T
+
+    def read_blocks(
+        self, start_frame: int = 0, stop_frame: int | None = None
+    ) -> Generator[tuple[np.ndarray, int], None, None]:
+        """Yield blocks with overlap as (samples, frame_offset). Samples are views with shape (channels, samples)
+
+        Blocks are the same as FileReader.read_blocks yields for the same block size and overlap.
+        """
+        data = self._opened_data()
+        stop_frame = len(data) if stop_frame is None else min(stop_frame, len(data))
+        hop = self.block_size - self.overlap
+
+        current_frame = start_frame
+        while current_frame < stop_frame and (
+            current_frame == start_frame or current_frame + self.overlap < stop_frame
+        ):
+            yield data[current_frame : min(current_frame + self.block_size, stop_frame)].T, current_frame
+            current_frame += hop
+
+    def count_blocks(self) -> int:
+        """Get the number of blocks `read_blocks` yields for the whole file."""
+        return block_count(self.frames, self.block_size, self.overlap)
+
+    def _opened_layout(self) -> WavLayout:
+        if self._layout is None:
+            raise RuntimeError("File not opened")
+        return self._layout
+
+    def _opened_data(self) -> np.ndarray:
+        if self._data is None:
+            raise RuntimeError("File not opened")
+        return self._data
+
+    def __enter__(self):
+        """Context manager entry."""
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+
+def open_file_reader(file_path: str, block_size: int, overlap: int | None = None) -> FileReader | MappedWavReader:
+    """Create the fastest reader for a file: memory-mapped for plain PCM/float WAV, soundfile otherwise."""
+    if MappedWavReader.supports(file_path):
+        return MappedWavReader(file_path, block_size, overlap)
+    return FileReader(file_path, block_size, overlap)
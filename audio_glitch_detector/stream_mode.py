@@ -1,18 +1,23 @@
 import signal
 import sys
+import time
+from contextlib import ExitStack
+from dataclasses import replace
 from threading import Event
 
-from tqdm import tqdm
+import numpy as np
 
 from .audio import (
+    ArtifactWriter,
     AudioConfig,
-    BoundedGlitchQueue,
-    save_glitch_block,
+    ContextCapture,
+    SlabGlitchQueue,
     print_audio_devices,
 )
-from .readers import StreamReader
+from .readers import StreamReader, StreamScheduler
 from .core import GlitchDetector
-from .tui import ConsoleOutput
+from .tui import ConsoleOutput, DeviceStatus
+from .utils import GlitchMetrics, MetricsServer, Profiler, SourceMetrics
 
 
 def select_audio_device(output: ConsoleOutput) -> int | None:
@@ -28,81 +33,356 @@ def select_audio_device(output: ConsoleOutput) -> int | None:
         return None
 
 
-def process_saved_blocks(glitch_queue: BoundedGlitchQueue | None, output: ConsoleOutput) -> None:
-    """Process and save queued glitch blocks."""
-    if not (glitch_queue and glitch_queue.count() > 0):
-        return
-
-    output.log(f"\nSaving {glitch_queue.count()} glitch blocks...", style="bold yellow")
+class DeviceMonitor:
+    """Detection state of one audio stream: its detector and the glitches waiting to be saved.
 
-    with tqdm(total=glitch_queue.count(), desc="Saving blocks", unit="block") as pbar:
-        for block in glitch_queue.get_all_blocks():
-            save_glitch_block(block.samples, block.sample_rate, block.frame_offset, block.threshold)
-            pbar.update(1)
+    Glitches are passed on to `writer`, shared between devices, without ever waiting for it:
+    those found while all writer workers are busy are queued, spilling to disk if there are
+    many, up to the writer's `max_artifacts`. Log messages start with `label` and artifacts go to `subdir` of the writer's output
+    directory, so several devices can be told apart. Every block is recorded in `metrics`.
+    """
 
-    output.log(
-        f"Saved {glitch_queue.count()} glitch blocks to 'glitch_artifacts/' folder",
-        style="bold green",
-    )
+    def __init__(
+        self,
+        config: AudioConfig,
+        threshold: float,
+        output: ConsoleOutput,
+        writer: ArtifactWriter | None = None,
+        running_threshold: bool = False,
+        profiler: Profiler | None = None,
+        context_ms: float = 50.0,
+        label: str = "",
+        subdir: str | None = None,
+        metrics: SourceMetrics | None = None,
+    ):
+        self.config = config
+        self.output = output
+        self.writer = writer
+        self.profiler = profiler or Profiler()
+        self.label = label
+        self.subdir = subdir
+        self.metrics = metrics
+        self.glitch_count = 0
+        self.capture: ContextCapture | None = None
+        self.queue: SlabGlitchQueue | None = None
 
+        if writer is not None:
+            context_frames = round(context_ms * config.sample_rate / 1000)
+            if context_frames:
+                self.capture = ContextCapture(context_frames, context_frames)
+            snapshot_frames = 2 * context_frames if context_frames else config.block_size
+            # The writer keeps only the newest max_artifacts blocks, so older ones need not wait for it
+            self.queue = SlabGlitchQueue(
+                config.channels, snapshot_frames, config.sample_dtype, max_items=writer.max_artifacts
+            )
 
-def run_stream_mode(config: AudioConfig, threshold: float, save_blocks: int | None, output: ConsoleOutput) -> None:
-    """Run real-time glitch detection on an audio stream."""
-    exit_event = Event()
-    glitch_queue = BoundedGlitchQueue(max_size=save_blocks) if save_blocks else None
-    glitch_count = 0
-
-    # Setup signal handler
-    signal.signal(signal.SIGINT, lambda sig, frame: exit_event.set())
-
-    device_id = select_audio_device(output)
-    if device_id is None:
-        return
+        self.detector = GlitchDetector(config.sample_rate, threshold, running_threshold, profiler=self.profiler)
 
-    def glitch_callback(samples, frame_number):
-        nonlocal glitch_count
-        detector = GlitchDetector(config.sample_rate, threshold)
-        result = detector.detect_with_offset(samples, frame_number)
+    def on_block(self, samples: np.ndarray, frame_number: int) -> None:
+        """Detect glitches in the next block and queue them for saving."""
+        start_time = time.perf_counter()
+        with self.profiler.stage("detect"):
+            result = self.detector.feed(samples, frame_number)
+        if self.metrics is not None:
+            self.metrics.record_block(
+                time.perf_counter() - start_time, result.threshold, result.total_count, result.hit_channels
+            )
 
         if result.total_count > 0:
-            glitch_count += result.total_count
+            self.glitch_count += result.total_count
             if result.auto_threshold:
                 auto_threshold_str = f" (threshold: {result.threshold:.2f})"
             else:
                 auto_threshold_str = ""
 
-            output.log(
-                f"Glitch detected!{auto_threshold_str} Total: {glitch_count}",
+            if self.config.channels > 1:
+                channels = ", ".join(str(channel + 1) for channel in np.unique(result.hit_channels))
+                channel_str = f" on channel {channels}"
+            else:
+                channel_str = ""
+
+            self.output.log(
+                f"{self.label}Glitch detected{channel_str}!{auto_threshold_str} Total: {self.glitch_count}",
                 style="bold red",
             )
 
-            if save_blocks and glitch_queue:
-                glitch_queue.add_block(samples, config.sample_rate, frame_number, result.threshold)
+        # Never wait for the writer here, a stalled consumer would drop audio
+        if self.writer is not None:
+            with self.profiler.stage("save"):
+                if self.capture is not None:
+                    for context in self.capture.push(samples, frame_number, result.sample_indices, result.threshold):
+                        self.queue.add_context(context)
+                elif result.total_count > 0:
+                    self.queue.add(samples, frame_number, result.threshold)
+                self.submit_queued(wait=False)
+
+    def submit_queued(self, wait: bool) -> None:
+        """Pass queued glitches on to the writer, without `wait` only as long as it has free slots."""
+        while len(self.queue) and (wait or self.writer.ready):
+            self.writer.submit_context(self.queue.pop(), self.config.sample_rate, subdir=self.subdir)
+
+    def finish(self) -> None:
+        """Queue the glitches at the end of the stream, with their context cut short."""
+        if self.capture is not None:
+            for context in self.capture.flush():
+                self.queue.add_context(context)
+
+    def record_health(self, stream: StreamReader) -> None:
+        """Update the metrics read from the stream and queue, when they are collected."""
+        self.metrics.record_health(stream.get_stream_health(), len(self.queue) if self.queue is not None else 0)
+
+    def close(self) -> None:
+        """Delete the queue's spill file, if any."""
+        if self.queue is not None:
+            self.queue.close()
+
+
+def finish_saved_blocks(writer: ArtifactWriter | None, monitors: list[DeviceMonitor], output: ConsoleOutput) -> None:
+    """Save the queued glitch blocks, wait for them to be written and report where they went."""
+    if writer is None:
+        return
+
+    remaining = writer.pending + sum(len(monitor.queue) for monitor in monitors)
+    if remaining:
+        output.log(f"\nSaving {remaining} remaining glitch blocks...", style="bold yellow")
+    spilled = sum(monitor.queue.spilled for monitor in monitors)
+    if spilled:
+        output.log(f"{spilled} glitch blocks were buffered on disk while the writer was busy", style="yellow")
+    dropped = sum(monitor.queue.dropped for monitor in monitors)
+    if dropped:
+        output.log(
+            f"{dropped} queued glitch blocks were discarded, being older than the newest {writer.max_artifacts}",
+            style="yellow",
+        )
+    for monitor in monitors:
+        monitor.submit_queued(wait=True)
+    writer.close()
+    output.print_artifact_summary(
+        writer.saved, str(writer.output_dir), writer.skipped, writer.failed, writer.last_error
+    )
+
+
+def run_stream_mode(
+    config: AudioConfig,
+    threshold: float,
+    save_blocks: int | None,
+    output: ConsoleOutput,
+    running_threshold: bool = False,
+    profile: bool = False,
+    context_ms: float = 50.0,
+    device_id: int | None = None,
+    metrics_port: int | None = None,
+) -> None:
+    """Run real-time glitch detection on an audio stream.
+
+    The device is asked for unless `device_id` is given. With `metrics_port` detector metrics are
+    served on that local port while running. With `profile` a breakdown of the time spent per
+    stage is printed at the end. Saved glitches hold `context_ms` of audio before and
+    after them, or the whole block they were found in if `context_ms` is 0. Glitches found while
+    all writer workers are busy are queued, spilling to disk if there are many. Only the newest
+    `save_blocks` are kept queued; older ones are discarded, as they would not be kept on disk.
+    """
+    exit_event = Event()
+    profiler = Profiler(enabled=profile)
+    metrics = GlitchMetrics() if metrics_port is not None else None
+    writer = None
+    server = None
+
+    # Setup signal handlers, SIGTERM stops unattended runs the same way
+    signal.signal(signal.SIGINT, lambda sig, frame: exit_event.set())
+    signal.signal(signal.SIGTERM, lambda sig, frame: exit_event.set())
+
+    if device_id is None:
+        device_id = select_audio_device(output)
+        if device_id is None:
+            return
+
+    # Workers are started before capture, so their startup does not stall the first glitch
+    if save_blocks:
+        writer = ArtifactWriter(max_artifacts=save_blocks)
+        writer.start()
+
+    source = metrics.source(str(device_id)) if metrics is not None else None
+    monitor = DeviceMonitor(config, threshold, output, writer, running_threshold, profiler, context_ms, metrics=source)
 
     try:
-        with StreamReader(config, device_id) as stream:
+        with StreamReader(config, device_id, log=output.log) as stream:
             output.print_header("Audio Glitch Detector Live")
             output.reset_timer()
             output.log(f"Analyzing audio stream from device id: {device_id}")
             output.log(f"Sample rate: {config.sample_rate} Hz")
             output.log(f"Channels: {config.channels}")
             output.log(f"Block size: {config.block_size} frames")
-            output.log(f"Detection threshold: {threshold if threshold > 0 else 'auto'}")
+            output.log(f"Capture: {config.capture_mode}")
+            auto_mode = "auto (running)" if running_threshold else "auto"
+            output.log(f"Detection threshold: {threshold if threshold > 0 else auto_mode}")
+
+            if metrics is not None:
+                stream.health.latency_observer = source.latency_seconds.observe
+                metrics.registry.add_collector(lambda: monitor.record_health(stream))
+                if writer is not None:
+                    metrics.registry.add_collector(lambda: metrics.artifact_writer_pending.set(writer.pending))
+                server = MetricsServer(metrics.registry, metrics_port)
+                server.start()
+                output.log(f"Serving metrics on {server.url}")
+
+            # Start monitoring
+            thread = stream.start_monitoring(monitor.on_block, exit_event)
+            output.start_live_output(exit_event, lambda: stream.get_volume_db(), stream.get_stream_health)
+
+            # Wait for completion
+            thread.join()
+
+            # Cleanup and summary
+            output.stop_live_output()
+            output.print_summary(monitor.glitch_count, output.get_elapsed_time())
+            output.print_stream_health(stream.get_stream_health(), show_buffer=config.capture_mode == "callback")
+
+            # Process saved blocks
+            monitor.finish()
+            finish_saved_blocks(writer, [monitor], output)
+
+            if profile:
+                output.print_profile(profiler.stats())
+
+    except Exception as e:
+        output.log(f"Stream error: {e}", style="bold red")
+        sys.exit(1)
+    finally:
+        if server:
+            server.close()
+        if writer:
+            writer.close()
+        monitor.close()
+        output.close()
+
+
+def run_multi_stream_mode(
+    config: AudioConfig,
+    device_ids: list[int],
+    threshold: float,
+    save_blocks: int | None,
+    output: ConsoleOutput,
+    running_threshold: bool = False,
+    profile: bool = False,
+    context_ms: float = 50.0,
+    metrics_port: int | None = None,
+) -> None:
+    """Run real-time glitch detection on several audio devices at once.
+
+    Every device is captured with `config` into its own ring buffer and has its own detector.
+    One scheduler thread consumes all of them, taking a block from each device in turn, and
+    one writer saves the glitches of every device to a `device_<id>` directory. With
+    `metrics_port` detector metrics of every device are served on that local port.
+    """
+    import pyaudio
+
+    exit_event = Event()
+    profiler = Profiler(enabled=profile)
+    scheduler = StreamScheduler(log=output.log)
+    metrics = GlitchMetrics() if metrics_port is not None else None
+    writer = None
+    server = None
+    monitors: list[DeviceMonitor] = []
+
+    # Setup signal handlers, SIGTERM stops unattended runs the same way
+    signal.signal(signal.SIGINT, lambda sig, frame: exit_event.set())
+    signal.signal(signal.SIGTERM, lambda sig, frame: exit_event.set())
+
+    if config.capture_mode != "callback":
+        output.log("Multiple devices are always captured in callback mode", style="yellow")
+        config = replace(config, capture_mode="callback")
+
+    # Workers are started before capture, so their startup does not stall the first glitch
+    if save_blocks:
+        writer = ArtifactWriter(max_artifacts=save_blocks)
+        writer.start()
+
+    for device_id in device_ids:
+        monitors.append(
+            DeviceMonitor(
+                config,
+                threshold,
+                output,
+                writer,
+                running_threshold,
+                profiler,
+                context_ms,
+                label=f"[{device_id}] ",
+                subdir=f"device_{device_id}",
+                metrics=metrics.source(str(device_id)) if metrics is not None else None,
+            )
+        )
+
+    audio = pyaudio.PyAudio()
+    try:
+        with ExitStack() as stack:
+            streams = []
+            for device_id, monitor in zip(device_ids, monitors):
+                stream = stack.enter_context(
+                    StreamReader(config, device_id, audio=audio, data_ready=scheduler.data_ready, log=output.log)
+                )
+                scheduler.add(stream, monitor.on_block)
+                streams.append(stream)
+            names = [f"{device_id}: {audio.get_device_info_by_index(device_id)['name']}" for device_id in device_ids]
+
+            output.print_header("Audio Glitch Detector Live")
+            output.reset_timer()
+            for name in names:
+                output.log(f"Analyzing audio stream from device {name}")
+            output.log(f"Sample rate: {config.sample_rate} Hz")
+            output.log(f"Channels: {config.channels}")
+            output.log(f"Block size: {config.block_size} frames")
+            auto_mode = "auto (running)" if running_threshold else "auto"
+            output.log(f"Detection threshold: {threshold if threshold > 0 else auto_mode}")
+
+            if metrics is not None:
+                for stream, monitor in zip(streams, monitors):
+                    stream.health.latency_observer = monitor.metrics.latency_seconds.observe
+                    metrics.registry.add_collector(lambda stream=stream, monitor=monitor: monitor.record_health(stream))
+                if writer is not None:
+                    metrics.registry.add_collector(lambda: metrics.artifact_writer_pending.set(writer.pending))
+                server = MetricsServer(metrics.registry, metrics_port)
+                server.start()
+                output.log(f"Serving metrics on {server.url}")
 
             # Start monitoring
-            thread = stream.start_monitoring(glitch_callback, exit_event)
-            output.start_live_output(exit_event, lambda: stream.get_volume_db())
+            thread = scheduler.start(exit_event)
+            output.start_device_live_output(
+                exit_event,
+                lambda: [
+                    DeviceStatus(name, stream.get_volume_db(), monitor.glitch_count, stream.get_stream_health())
+                    for name, stream, monitor in zip(names, streams, monitors)
+                ],
+            )
 
             # Wait for completion
             thread.join()
 
             # Cleanup and summary
             output.stop_live_output()
-            output.print_summary(glitch_count, output.get_elapsed_time())
+            for name, stream, monitor in zip(names, streams, monitors):
+                output.log(f"Device {name}: {monitor.glitch_count} discontinuities")
+                output.print_stream_health(stream.get_stream_health())
+            output.print_summary(sum(monitor.glitch_count for monitor in monitors), output.get_elapsed_time())
 
             # Process saved blocks
-            process_saved_blocks(glitch_queue, output)
+            for monitor in monitors:
+                monitor.finish()
+            finish_saved_blocks(writer, monitors, output)
+
+            if profile:
+                output.print_profile(profiler.stats())
 
     except Exception as e:
         output.log(f"Stream error: {e}", style="bold red")
         sys.exit(1)
+    finally:
+        if server:
+            server.close()
+        if writer:
+            writer.close()
+        for monitor in monitors:
+            monitor.close()
+        audio.terminate()
+        output.close()
@@ -1,3 +1,4 @@
-from .console_output import ConsoleOutput
+from .console_output import ConsoleOutput, DeviceStatus
+from .log_output import LogOutput
 
-__all__ = ["ConsoleOutput"]
+__all__ = ["ConsoleOutput", "DeviceStatus", "LogOutput"]
@@ -1,5 +1,6 @@
 import time
 from collections.abc import Callable
+from dataclasses import dataclass
 from threading import Event, Lock, Thread
 
 from rich.console import Console
@@ -8,9 +9,21 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
+from ..utils.profiling import StageStats
+from ..utils.stream_health import StreamHealthStats
 from ..utils.time_utils import format_elapsed_time
 
 
+@dataclass
+class DeviceStatus:
+    """Live state of one device in multi-device stream mode."""
+
+    name: str
+    levels: list[float]
+    glitch_count: int
+    health: StreamHealthStats
+
+
 class ConsoleOutput:
     """Rich console output for the CLI interface."""
 
@@ -21,6 +34,8 @@ class ConsoleOutput:
         self.running = False
         self.elapsed_time = "00:00:00"
         self.volume_levels = [0.0, 0.0]
+        self.stream_health: StreamHealthStats | None = None
+        self.device_statuses: list[DeviceStatus] = []
 
     def print_header(self, title: str) -> None:
         """Print a formatted header."""
@@ -44,10 +59,27 @@ class ConsoleOutput:
         self,
         exit_event: Event,
         volume_callback: Callable[[], list[float]],
+        health_callback: Callable[[], StreamHealthStats] | None = None,
     ) -> None:
         """Start live output display in background thread."""
+
+        def update() -> None:
+            self.volume_levels = volume_callback()
+            if health_callback is not None:
+                self.stream_health = health_callback()
+
+        self.running = True
+        thread = Thread(target=self._live_output_loop, args=(exit_event, update, self._create_live_panel))
+        thread.start()
+
+    def start_device_live_output(self, exit_event: Event, status_callback: Callable[[], list[DeviceStatus]]) -> None:
+        """Start the combined live display of several devices in background thread."""
+
+        def update() -> None:
+            self.device_statuses = status_callback()
+
         self.running = True
-        thread = Thread(target=self._live_output_loop, args=(exit_event, volume_callback))
+        thread = Thread(target=self._live_output_loop, args=(exit_event, update, self._create_device_panel))
         thread.start()
 
     def stop_live_output(self) -> None:
@@ -70,32 +102,102 @@ class ConsoleOutput:
         table.add_column(justify="left", ratio=1)
         table.add_column(justify="right", ratio=1)
 
-        volume_text = f"{self.volume_levels[0]:.1f}dB\n{self.volume_levels[1]:.1f}dB"
+        volume_text = self._volume_text(self.volume_levels)
         time_text = self.get_elapsed_time()
 
         table.add_row(volume_text, time_text)
         table.add_row("", "")  # Empty row for spacing
+        if self.stream_health is not None:
+            table.add_row(*self._stream_health_text(self.stream_health))
         table.add_row(Text("ctrl-c to quit", style="dim"), "")
 
         return Panel(table, title="Volume", style="bold white")
 
-    def _live_output_loop(self, exit_event: Event, volume_callback: Callable[[], list[float]]) -> None:
-        """Main loop for live output display."""
-        with Live(self._create_live_panel(), console=self.console, auto_refresh=False) as live:
+    def _create_device_panel(self) -> Panel:
+        """Create the live output panel with one row per device."""
+        table = Table(expand=True, box=None)
+        table.add_column("Device", justify="left", ratio=2)
+        table.add_column("Peak", justify="right")
+        table.add_column("Glitches", justify="right")
+        table.add_column("Latency", justify="right")
+        table.add_column("Load", justify="right")
+        table.add_column("Buffer", justify="right")
+        table.add_column("Dropped", justify="right")
+
+        for status in self.device_statuses:
+            health = status.health
+            style = "bold red" if health.real_time_factor > 0.8 or health.dropped_blocks > 0 else ""
+            table.add_row(
+                status.name,
+                f"{max(status.levels, default=float('-inf')):.1f}dB",
+                Text(str(status.glitch_count), style="bold red" if status.glitch_count else ""),
+                f"{health.latency_ms:.1f}ms",
+                Text(f"{health.real_time_factor:.0%}", style=style),
+                f"{health.buffer_fill:.0%}",
+                Text(str(health.dropped_blocks), style=style),
+            )
+
+        footer = Table.grid(expand=True)
+        footer.add_column(justify="left", ratio=1)
+        footer.add_column(justify="right", ratio=1)
+        footer.add_row(Text("ctrl-c to quit", style="dim"), self.get_elapsed_time())
+
+        grid = Table.grid(expand=True)
+        grid.add_row(table)
+        grid.add_row(footer)
+        return Panel(grid, title="Devices", style="bold white")
+
+    @staticmethod
+    def _volume_text(levels: list[float], per_line: int = 4) -> str:
+        """Format channel levels in dB one per line for mono and stereo, in numbered rows for more channels."""
+        if len(levels) <= 2:
+            return "\n".join(f"{level:.1f}dB" for level in levels)
+
+        cells = [f"{channel + 1:>2}:{level:5.0f}" for channel, level in enumerate(levels)]
+        return "\n".join(" ".join(cells[i : i + per_line]) for i in range(0, len(cells), per_line))
+
+    @staticmethod
+    def _stream_health_text(health: StreamHealthStats) -> tuple[Text, Text]:
+        """Create the stream health row, red when processing gets close to falling behind."""
+        at_risk = (
+            health.real_time_factor > 0.8
+            or health.buffer_fill > 0.5
+            or health.dropped_blocks > 0
+            or health.input_overflows > 0
+        )
+        style = "bold red" if at_risk else "dim"
+        return (
+            Text(f"Latency {health.latency_ms:.1f}ms  Load {health.real_time_factor:.0%}", style=style),
+            Text(
+                f"Buffer {health.buffer_fill:.0%}  Dropped {health.dropped_blocks}  Overflows {health.input_overflows}",
+                style=style,
+            ),
+        )
+
+    def _live_output_loop(
+        self, exit_event: Event, update: Callable[[], None], create_panel: Callable[[], Panel]
+    ) -> None:
+        """Main loop for live output display, refreshing the state with `update` before each redraw."""
+        with Live(create_panel(), console=self.console, auto_refresh=False) as live:
             while self.running and not exit_event.is_set():
                 self._calculate_elapsed_time()
-                self.volume_levels = volume_callback()
-                live.update(self._create_live_panel())
+                update()
+                live.update(create_panel())
                 live.refresh()
                 time.sleep(0.1)
 
+    def close(self) -> None:
+        """Release the output. The console holds nothing to release."""
+
     def print_results(self, glitch_count: int, timestamps: list[str]) -> None:
-        """Print detection results."""
+        """Print detection results. `timestamps` may list only the first of `glitch_count` glitches."""
         self.print_banner()
         self.console.print(f"Number of discontinuities detected: {glitch_count}")
 
         for timestamp in timestamps:
             self.console.print(timestamp)
+        if glitch_count > len(timestamps):
+            self.console.print(f"... and {glitch_count - len(timestamps)} more", style="dim")
 
         self.print_banner()
 
@@ -105,3 +207,97 @@ class ConsoleOutput:
             f"Total discontinuities detected: {total_count} in {elapsed_time}",
             style="bold red",
         )
+
+    def print_stream_health(self, health: StreamHealthStats, show_buffer: bool = True) -> None:
+        """Print latency, processing load and capture buffer health at the end of a stream run."""
+        self.log(
+            f"Latency: mean {health.mean_latency_ms:.1f}ms, peak {health.peak_latency_ms:.1f}ms. "
+            f"Real-time factor: mean {health.mean_real_time_factor:.2f}, peak {health.peak_real_time_factor:.2f}",
+            style="bold red" if health.peak_real_time_factor >= 1.0 else "",
+        )
+
+        style = "bold red" if health.dropped_blocks or health.input_overflows else ""
+        if show_buffer:
+            self.log(
+                f"Capture buffer peak fill: {health.peak_buffer_fill:.0%}, "
+                f"dropped blocks: {health.dropped_blocks}, input overflows: {health.input_overflows}",
+                style=style,
+            )
+        else:
+            self.log(f"Input overflows: {health.input_overflows}", style=style)
+
+    def print_artifact_summary(
+        self, saved_count: int, output_dir: str, skipped_count: int = 0, failed_count: int = 0, error: str | None = None
+    ) -> None:
+        """Print where glitch blocks were saved and how many could not be."""
+        if saved_count:
+            self.log(f"Saved {saved_count} glitch blocks to '{output_dir}/'", style="bold green")
+        if skipped_count:
+            self.log(f"Skipped {skipped_count} glitch blocks while the writer was busy", style="yellow")
+        if failed_count:
+            self.log(f"Failed to save {failed_count} glitch blocks: {error}", style="bold red")
+
+    def print_profile(self, stages: list[StageStats]) -> None:
+        """Print the time spent per stage. Stages named "stage/part" are parts of "stage"."""
+        self.console.print(self._profile_table(stages))
+
+    @staticmethod
+    def _profile_table(stages: list[StageStats]) -> Table:
+        """Create the table of time spent per stage."""
+        table = Table(title="Profile")
+        table.add_column("Stage")
+        table.add_column("Calls", justify="right")
+        table.add_column("Total", justify="right")
+        table.add_column("Mean", justify="right")
+        table.add_column("p99", justify="right")
+
+        for stage in stages:
+            name = f"  {stage.name.split('/', 1)[1]}" if "/" in stage.name else stage.name
+            table.add_row(
+                name,
+                str(stage.count),
+                f"{stage.total_seconds:.3f} s",
+                _format_duration(stage.mean_seconds),
+                _format_duration(stage.p99_seconds),
+            )
+        return table
+
+    def print_batch_result(
+        self, index: int, file_count: int, filename: str, glitch_count: int | None, error: str | None = None
+    ) -> None:
+        """Print the result of one file in batch mode."""
+        progress = f"[{index}/{file_count}]"
+        if error is not None:
+            self.log(f"{progress} {filename}: error: {error}", style="bold red")
+        elif glitch_count:
+            self.log(f"{progress} {filename}: {glitch_count} discontinuities", style="bold red")
+        else:
+            self.log(f"{progress} {filename}: no discontinuities", style="green")
+
+    def print_batch_summary(
+        self,
+        file_count: int,
+        glitch_file_count: int,
+        glitch_count: int,
+        failed_count: int,
+        audio_seconds: float,
+        elapsed_time: str,
+    ) -> None:
+        """Print the aggregated summary of a batch run."""
+        self.print_banner()
+        self.console.print(f"Files analyzed: {file_count}")
+        self.console.print(f"Files with discontinuities: {glitch_file_count}")
+        self.console.print(f"Total discontinuities detected: {glitch_count}")
+        if failed_count:
+            self.console.print(f"Files failed: {failed_count}", style="bold red")
+        self.console.print(f"Audio analyzed: {format_elapsed_time(audio_seconds)} in {elapsed_time}")
+        self.print_banner()
+
+
+def _format_duration(seconds: float) -> str:
+    """Format a short duration with a readable unit."""
+    if seconds >= 1.0:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} µs"
@@ -0,0 +1,134 @@
+import io
+import logging
+import sys
+from collections.abc import Callable
+from logging.handlers import RotatingFileHandler
+from threading import Event, Thread
+
+from rich.console import Console
+
+from ..utils.profiling import StageStats
+from ..utils.stream_health import StreamHealthStats
+from .console_output import ConsoleOutput, DeviceStatus
+
+
+class LogOutput(ConsoleOutput):
+    """Headless output for unattended runs, writing plain log lines instead of a live display.
+
+    Levels and stream health are logged every `stats_interval` seconds by a thread that sleeps
+    in between, rather than redrawn at 10 Hz. With `log_file` the log is rotated after
+    `max_bytes`, keeping `backup_count` old files, so a run of several days uses bounded disk
+    space. Without it, lines go to standard output.
+    """
+
+    def __init__(
+        self,
+        log_file: str | None = None,
+        stats_interval: float = 60.0,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+    ):
+        if stats_interval <= 0:
+            raise ValueError("Stats interval must be positive")
+
+        super().__init__()
+        self.stats_interval = stats_interval
+        self._stopped = Event()
+        self._stats_thread: Thread | None = None
+
+        if log_file is not None:
+            self._handler = RotatingFileHandler(
+                log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+            )
+        else:
+            self._handler = logging.StreamHandler(sys.stdout)
+        self._handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+
+        # Not registered with the logging module, so several instances never share handlers
+        self.logger = logging.Logger("audio_glitch_detector")
+        self.logger.addHandler(self._handler)
+
+    def print_header(self, title: str) -> None:
+        """Log a header line."""
+        self.log(title)
+
+    def log(self, message: str, style: str = "") -> None:
+        """Log a message, as a warning if its console style is red."""
+        level = logging.WARNING if "red" in style else logging.INFO
+        self.logger.log(level, message.strip())
+
+    def print_banner(self) -> None:
+        """Log nothing, separators are only needed on the console."""
+
+    def start_live_output(
+        self,
+        exit_event: Event,
+        volume_callback: Callable[[], list[float]],
+        health_callback: Callable[[], StreamHealthStats] | None = None,
+    ) -> None:
+        """Start logging levels and stream health every stats interval in background thread."""
+
+        def stats() -> list[str]:
+            line = f"Peak {self._levels_text(volume_callback())}"
+            if health_callback is not None:
+                line += f"  {self._health_line(health_callback())}"
+            return [line]
+
+        self._start_stats(exit_event, stats)
+
+    def start_device_live_output(self, exit_event: Event, status_callback: Callable[[], list[DeviceStatus]]) -> None:
+        """Start logging one stats line per device every stats interval in background thread."""
+
+        def stats() -> list[str]:
+            return [
+                f"Device {status.name}: Peak {self._levels_text(status.levels)}  Glitches {status.glitch_count}  "
+                f"{self._health_line(status.health)}"
+                for status in status_callback()
+            ]
+
+        self._start_stats(exit_event, stats)
+
+    def stop_live_output(self) -> None:
+        """Stop logging stats and wait for the stats thread to finish."""
+        self.running = False
+        self._stopped.set()
+        if self._stats_thread is not None:
+            self._stats_thread.join()
+            self._stats_thread = None
+        self._calculate_elapsed_time()
+
+    def _start_stats(self, exit_event: Event, stats: Callable[[], list[str]]) -> None:
+        """Start the stats thread."""
+        self.running = True
+        self._stopped.clear()
+        self._stats_thread = Thread(target=self._stats_loop, args=(exit_event, stats), daemon=True)
+        self._stats_thread.start()
+
+    def _stats_loop(self, exit_event: Event, stats: Callable[[], list[str]]) -> None:
+        """Log the stats lines every stats interval until stopped."""
+        while not self._stopped.wait(self.stats_interval) and not exit_event.is_set():
+            elapsed = self._calculate_elapsed_time()
+            for line in stats():
+                self.log(f"[{elapsed}] {line}")
+
+    @staticmethod
+    def _levels_text(levels: list[float]) -> str:
+        """Format channel levels in dB on one line."""
+        return "/".join(f"{level:.1f}" for level in levels) + "dB"
+
+    def _health_line(self, health: StreamHealthStats) -> str:
+        """Format the stream health row of the live display on one line."""
+        left, right = self._stream_health_text(health)
+        return f"{left.plain}  {right.plain}"
+
+    def print_profile(self, stages: list[StageStats]) -> None:
+        """Log the time spent per stage as a plain text table."""
+        text = io.StringIO()
+        Console(file=text, width=100, color_system=None).print(self._profile_table(stages))
+        self.log(text.getvalue())
+
+    def close(self) -> None:
+        """Stop logging stats and close the log file."""
+        self.stop_live_output()
+        self.logger.removeHandler(self._handler)
+        self._handler.close()
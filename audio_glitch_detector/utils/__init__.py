@@ -1,13 +1,32 @@
+from .metrics import GlitchMetrics, MetricsRegistry, MetricsServer, SourceMetrics
+from .profiling import Profiler, StageStats
+from .result_sink import GLITCH_RECORD_DTYPE, ResultSink, open_result_sink
+from .stream_health import StreamHealth, StreamHealthStats
 from .time_utils import (
+    format_decimal_strings,
     format_elapsed_time,
     format_time,
     format_time_string,
+    format_time_strings,
     time_to_milliseconds,
 )
 
 __all__ = [
+    "GlitchMetrics",
+    "MetricsRegistry",
+    "MetricsServer",
+    "SourceMetrics",
+    "Profiler",
+    "StageStats",
+    "GLITCH_RECORD_DTYPE",
+    "ResultSink",
+    "open_result_sink",
+    "StreamHealth",
+    "StreamHealthStats",
     "time_to_milliseconds",
     "format_time",
     "format_time_string",
+    "format_time_strings",
     "format_elapsed_time",
+    "format_decimal_strings",
 ]
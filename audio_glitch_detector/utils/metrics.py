@@ -0,0 +1,343 @@
+import bisect
+import math
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+
+import numpy as np
+
+from .stream_health import StreamHealthStats
+
+# Upper bounds in seconds, from well within a block to several blocks of audio
+DEFAULT_SECONDS_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+class MetricValue:
+    """Value of a counter or gauge for one set of label values.
+
+    Updated without locking, so each value must have a single writer thread. Readers may see
+    a value one update old.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Add `amount` to the value."""
+        self.value += amount
+
+    def set(self, value: float) -> None:
+        """Set the value."""
+        self.value = value
+
+
+class HistogramValue:
+    """Bucket counts and sum of a histogram for one set of label values, with a single writer thread."""
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Count `value` in the first bucket whose upper bound is not below it."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class Metric:
+    """A counter, gauge or histogram, holding one value per combination of label values."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        kind: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_SECONDS_BUCKETS,
+    ):
+        if kind not in ("counter", "gauge", "histogram"):
+            raise ValueError(f"Unknown metric type '{kind}'")
+
+        self.name = name
+        self.help_text = help_text
+        self.kind = kind
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._values: dict[tuple[str, ...], MetricValue | HistogramValue] = {}
+        self._lock = Lock()
+
+    def labels(self, *label_values: object) -> MetricValue | HistogramValue:
+        """Get the value for `label_values`, one per label name, created on first use.
+
+        Look values up once, outside the hot path: updating them takes no lock.
+
+        Raises:
+            ValueError: If the number of label values does not match the label names
+        """
+        if len(label_values) != len(self.label_names):
+            raise ValueError(f"Metric {self.name} needs {len(self.label_names)} label values")
+
+        key = tuple(str(value) for value in label_values)
+        with self._lock:
+            value = self._values.get(key)
+            if value is None:
+                value = HistogramValue(self.buckets) if self.kind == "histogram" else MetricValue()
+                self._values[key] = value
+        return value
+
+    def render(self) -> list[str]:
+        """Get the lines of the metric in the Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            values = list(self._values.items())
+
+        for key, value in values:
+            labels = [f'{name}="{_escape(label)}"' for name, label in zip(self.label_names, key)]
+            if isinstance(value, HistogramValue):
+                # Copied first, so the buckets and count agree with each other
+                counts = list(value.counts)
+                total = value.sum
+                cumulative = 0
+                for bound, count in zip((*self.buckets, math.inf), counts):
+                    cumulative += count
+                    bucket_labels = _format_labels([*labels, f'le="{_format_value(bound)}"'])
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+                lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+            else:
+                lines.append(f"{self.name}{_format_labels(labels)} {_format_value(value.value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """A set of metrics rendered together in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: list[Metric] = []
+        self._collectors: list[Callable[[], None]] = []
+        self._lock = Lock()
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Metric:
+        """Add a counter."""
+        return self._add(Metric(name, help_text, "counter", label_names))
+
+    def gauge(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Metric:
+        """Add a gauge."""
+        return self._add(Metric(name, help_text, "gauge", label_names))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_SECONDS_BUCKETS,
+    ) -> Metric:
+        """Add a histogram with `buckets` as upper bounds."""
+        return self._add(Metric(name, help_text, "histogram", label_names, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Add a function updating metrics right before they are rendered, for values read from elsewhere."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Run the collectors and get all metrics in the Prometheus text format."""
+        with self._lock:
+            for collector in self._collectors:
+                collector()
+            return "".join(line + "\n" for metric in self._metrics for line in metric.render())
+
+    def _add(self, metric: Metric) -> Metric:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+
+@dataclass
+class SourceMetrics:
+    """Metric values of one audio device or file, looked up once so updating them is cheap."""
+
+    name: str
+    blocks: MetricValue
+    glitches: MetricValue
+    detection_seconds: HistogramValue
+    latency_seconds: HistogramValue
+    threshold: MetricValue
+    input_overflows: MetricValue
+    dropped_blocks: MetricValue
+    artifact_queue: MetricValue
+    channel_glitches: Metric
+    _channels: dict[int, MetricValue] = field(default_factory=dict)
+
+    def record_block(
+        self, detection_seconds: float, threshold: float, glitch_count: int, hit_channels: np.ndarray
+    ) -> None:
+        """Record one detected block, with the channel of every glitch hit in it."""
+        self.blocks.inc()
+        self.detection_seconds.observe(detection_seconds)
+        self.threshold.set(threshold)
+        if glitch_count:
+            self.glitches.inc(glitch_count)
+        if hit_channels.size:
+            counts = np.bincount(hit_channels)
+            channels = np.flatnonzero(counts)
+            for channel, count in zip(channels.tolist(), counts[channels].tolist()):
+                value = self._channels.get(channel)
+                if value is None:
+                    value = self._channels[channel] = self.channel_glitches.labels(self.name, channel + 1)
+                value.inc(count)
+
+    def record_health(self, health: StreamHealthStats, queued: int = 0) -> None:
+        """Set the capture health and the number of glitches waiting to be saved."""
+        self.input_overflows.set(health.input_overflows)
+        self.dropped_blocks.set(health.dropped_blocks)
+        self.artifact_queue.set(queued)
+
+
+class GlitchMetrics:
+    """The metrics of a detection run, labelled by the device or file they come from."""
+
+    def __init__(self, registry: MetricsRegistry | None = None):
+        self.registry = registry or MetricsRegistry()
+        registry = self.registry
+        self.blocks = registry.counter("glitch_detector_blocks_total", "Blocks processed", ["source"])
+        self.glitches = registry.counter("glitch_detector_glitches_total", "Glitches detected", ["source"])
+        self.channel_glitches = registry.counter(
+            "glitch_detector_channel_glitches_total", "Glitch hits per channel", ["source", "channel"]
+        )
+        self.detection_seconds = registry.histogram(
+            "glitch_detector_detection_seconds", "Detection time per block", ["source"]
+        )
+        self.latency_seconds = registry.histogram(
+            "glitch_detector_block_latency_seconds",
+            "Time from capture of a block to the end of its detection",
+            ["source"],
+        )
+        self.threshold = registry.gauge(
+            "glitch_detector_threshold", "Detection threshold of the last block", ["source"]
+        )
+        self.input_overflows = registry.counter(
+            "glitch_detector_input_overflows_total", "Blocks with an input overflow reported by PortAudio", ["source"]
+        )
+        self.dropped_blocks = registry.counter(
+            "glitch_detector_dropped_blocks_total", "Blocks dropped because the capture buffer was full", ["source"]
+        )
+        self.artifact_queue = registry.gauge(
+            "glitch_detector_artifact_queue_depth", "Glitches queued to be saved", ["source"]
+        )
+        self.artifact_writer_pending = registry.gauge(
+            "glitch_detector_artifact_writer_pending", "Glitch blocks being written by the artifact writer"
+        ).labels()
+
+    def source(self, name: str) -> SourceMetrics:
+        """Get the metric values of the device or file `name`."""
+        return SourceMetrics(
+            name=name,
+            blocks=self.blocks.labels(name),
+            glitches=self.glitches.labels(name),
+            detection_seconds=self.detection_seconds.labels(name),
+            latency_seconds=self.latency_seconds.labels(name),
+            threshold=self.threshold.labels(name),
+            input_overflows=self.input_overflows.labels(name),
+            dropped_blocks=self.dropped_blocks.labels(name),
+            artifact_queue=self.artifact_queue.labels(name),
+            channel_glitches=self.channel_glitches,
+        )
+
+
+class MetricsServer:
+    """Serves a registry in the Prometheus text format on http://host:port/metrics from a background thread.
+
+    Port 0 picks a free port, see `address`.
+    """
+
+    def __init__(self, registry: MetricsRegistry, port: int, host: str = "127.0.0.1"):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: Thread | None = None
+
+    def start(self) -> None:
+        """Start serving.
+
+        Raises:
+            OSError: If the port cannot be bound
+        """
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self._thread = Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """Get the host and port served on."""
+        if self._server is None:
+            return self.host, self.port
+        host, port = self._server.server_address[:2]
+        return host, port
+
+    @property
+    def url(self) -> str:
+        """Get the URL the metrics are served at."""
+        host, port = self.address
+        return f"http://{host}:{port}/metrics"
+
+    def close(self) -> None:
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: list[str]) -> str:
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value, integers without a fraction."""
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer() and abs(value) < 2**53:
+        return str(int(value))
+    return repr(float(value))
@@ -0,0 +1,127 @@
+import math
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import nullcontext
+from dataclasses import dataclass
+
+_DISABLED_STAGE = nullcontext()
+
+
+@dataclass
+class StageStats:
+    """Timing summary of one profiled stage."""
+
+    name: str
+    count: int
+    total_seconds: float
+    mean_seconds: float
+    p99_seconds: float
+
+
+class _StageTimer:
+    """Call count, total time and a log-bucket histogram of the durations of one stage."""
+
+    __slots__ = ("count", "total", "buckets", "_log_gamma", "_start")
+
+    def __init__(self, log_gamma: float):
+        self.count = 0
+        self.total = 0.0
+        self.buckets: dict[int, int] = {}
+        self._log_gamma = log_gamma
+        self._start = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        # Durations below the clock resolution share the lowest bucket
+        bucket = math.ceil(math.log(max(seconds, 1e-9)) / self._log_gamma)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def quantile(self, fraction: float) -> float:
+        """Get the duration at `fraction` of the recorded durations, within the bucket accuracy."""
+        rank = math.ceil(fraction * self.count) - 1
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen > rank:
+                gamma = math.exp(self._log_gamma)
+                return 2.0 * gamma**bucket / (gamma + 1.0)
+        return 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.record(time.perf_counter() - self._start)
+
+
+class Profiler:
+    """Accumulates the time spent in named stages of the hot path.
+
+    Disabled by default, in which case `stage` returns a shared no-op context and nothing is
+    recorded. Durations are counted in logarithmic buckets, so memory does not grow with the
+    number of blocks and the p99 is accurate to `relative_accuracy`.
+    """
+
+    def __init__(self, enabled: bool = False, relative_accuracy: float = 0.01):
+        self.enabled = enabled
+        self._log_gamma = math.log((1.0 + relative_accuracy) / (1.0 - relative_accuracy))
+        self._timers: dict[str, _StageTimer] = {}
+
+    def stage(self, name: str):
+        """Get a context manager timing one pass through a stage."""
+        if not self.enabled:
+            return _DISABLED_STAGE
+        return self._timer(name)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record the duration of one pass through a stage."""
+        if self.enabled:
+            self._timer(name).record(seconds)
+
+    def iterate(self, name: str, iterable: Iterable) -> Iterator:
+        """Iterate over `iterable`, timing how long each item takes to produce as a stage."""
+        if not self.enabled:
+            yield from iterable
+            return
+
+        iterator = iter(iterable)
+        timer = self._timer(name)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            timer.record(time.perf_counter() - start)
+            yield item
+
+    def merge(self, other: "Profiler") -> None:
+        """Add the stages recorded by another profiler, e.g. one from a worker process."""
+        for name, other_timer in other._timers.items():
+            timer = self._timer(name)
+            timer.count += other_timer.count
+            timer.total += other_timer.total
+            for bucket, count in other_timer.buckets.items():
+                timer.buckets[bucket] = timer.buckets.get(bucket, 0) + count
+
+    def stats(self) -> list[StageStats]:
+        """Get the timing summary of every stage, in the order the stages were first seen."""
+        return [
+            StageStats(
+                name=name,
+                count=timer.count,
+                total_seconds=timer.total,
+                mean_seconds=timer.total / timer.count if timer.count else 0.0,
+                p99_seconds=timer.quantile(0.99),
+            )
+            for name, timer in self._timers.items()
+            if timer.count > 0
+        ]
+
+    def _timer(self, name: str) -> _StageTimer:
+        timer = self._timers.get(name)
+        if timer is None:
+            timer = self._timers[name] = _StageTimer(self._log_gamma)
+        return timer
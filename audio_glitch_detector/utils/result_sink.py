@@ -0,0 +1,109 @@
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+
+from .time_utils import format_decimal_strings, format_time_strings
+
+# Record layout of .bin result files, read back with np.fromfile(path, dtype=GLITCH_RECORD_DTYPE)
+GLITCH_RECORD_DTYPE = np.dtype([("sample_index", "<i8"), ("timestamp_ms", "<f8")])
+
+
+class ResultSink:
+    """Appends glitches to a results file as they are found, so none have to be held in memory.
+
+    The format follows the file extension: `.csv` and `.jsonl` hold the sample index, the
+    timestamp in milliseconds and the HH:MM:SS.mmm time of every glitch, `.bin` holds
+    `GLITCH_RECORD_DTYPE` records. Rows are formatted for a whole batch of glitches at once.
+    """
+
+    suffixes = (".csv", ".jsonl", ".bin")
+
+    def __init__(self, file_path: str | Path, sample_rate: int):
+        self.file_path = Path(file_path)
+        self.format = self.file_path.suffix.lower()
+        if self.format not in self.suffixes:
+            raise ValueError(f"Unsupported results format: {self.file_path.name}")
+
+        self.sample_rate = sample_rate
+        self.count = 0
+        self._file: BinaryIO | None = None
+
+    def open(self) -> None:
+        """Create the results file, replacing an existing one."""
+        try:
+            self._file = open(self.file_path, "wb")
+        except OSError as e:
+            raise OSError(f"Failed to create results file: {e}") from e
+
+        if self.format == ".csv":
+            self._file.write(b"sample_index,timestamp_ms,time\n")
+
+    def close(self) -> None:
+        """Close the results file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def write(self, sample_indices: np.ndarray) -> None:
+        """Append glitches by sample index.
+
+        Raises:
+            RuntimeError if the file is not open.
+        """
+        if self._file is None:
+            raise RuntimeError("Results file not open")
+        if len(sample_indices) == 0:
+            return
+
+        sample_indices = np.asarray(sample_indices, dtype=np.int64)
+        timestamps_ms = sample_indices * (1000.0 / self.sample_rate)
+
+        if self.format == ".bin":
+            records = np.empty(sample_indices.size, dtype=GLITCH_RECORD_DTYPE)
+            records["sample_index"] = sample_indices
+            records["timestamp_ms"] = timestamps_ms
+            self._file.write(records.tobytes())
+        else:
+            self._file.write(self._rows(sample_indices, timestamps_ms))
+
+        self.count += sample_indices.size
+
+    def __enter__(self):
+        """Context manager entry."""
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+    def _rows(self, sample_indices: np.ndarray, timestamps_ms: np.ndarray) -> bytes:
+        """Format one text row per glitch, including the line break."""
+        indices = format_decimal_strings(sample_indices)
+        milliseconds = format_decimal_strings(timestamps_ms, 3)
+        times = format_time_strings(timestamps_ms)
+
+        if self.format == ".csv":
+            parts = [indices, b",", milliseconds, b",", times, b"\n"]
+        else:
+            parts = [b'{"sample_index": ', indices, b', "timestamp_ms": ', milliseconds, b', "time": "', times, b'"}\n']
+
+        # Side by side the fields keep their padding, which is dropped from all rows at once
+        columns = [
+            np.broadcast_to(np.frombuffer(part, dtype=np.uint8), (sample_indices.size, len(part)))
+            if isinstance(part, bytes)
+            else part.view(np.uint8).reshape(sample_indices.size, -1)
+            for part in parts
+        ]
+        text = np.hstack(columns)
+        return text[text != 0].tobytes()
+
+
+def open_result_sink(file_path: str | Path, sample_rate: int) -> ResultSink:
+    """Create a results sink with the format given by the file extension.
+
+    Raises:
+        ValueError if the extension is not a supported results format.
+    """
+    return ResultSink(file_path, sample_rate)
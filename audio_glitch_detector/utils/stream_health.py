@@ -0,0 +1,91 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
+
+@dataclass
+class StreamHealthStats:
+    """Snapshot of how close stream processing is to falling behind capture.
+
+    Latency is the time from capture of a block to the end of its detection. The real-time
+    factor is the processing time of a block divided by its duration; at 1.0 and above,
+    detection cannot keep up. Current values are smoothed over the last blocks.
+    """
+
+    latency_ms: float = 0.0
+    mean_latency_ms: float = 0.0
+    peak_latency_ms: float = 0.0
+    real_time_factor: float = 0.0
+    mean_real_time_factor: float = 0.0
+    peak_real_time_factor: float = 0.0
+    buffer_fill: float = 0.0
+    peak_buffer_fill: float = 0.0
+    dropped_blocks: int = 0
+    input_overflows: int = 0
+    blocks: int = 0
+
+
+class StreamHealth:
+    """Tracks latency and real-time factor of processed stream blocks.
+
+    Written by the processing thread only. Readers of `stats` may see values a block old.
+    `latency_observer`, if set, is called with the latency of every block in seconds.
+    """
+
+    def __init__(self, sample_rate: int, smoothing: float = 0.05):
+        self.sample_rate = sample_rate
+        self.smoothing = smoothing
+        self.input_overflows = 0
+        self._stats = StreamHealthStats()
+        self._latency_total = 0.0
+        self._processing_total = 0.0
+        self._audio_total = 0.0
+        self.latency_observer: Callable[[float], None] | None = None
+
+    def record_block(self, frames: int, capture_time: float, start_time: float, end_time: float) -> None:
+        """Record one block, with `time.perf_counter` times of capture, start and end of processing."""
+        if frames <= 0:
+            return
+
+        latency_ms = (end_time - capture_time) * 1000.0
+        processing = end_time - start_time
+        duration = frames / self.sample_rate
+        real_time_factor = processing / duration
+
+        stats = self._stats
+        if stats.blocks == 0:
+            stats.latency_ms = latency_ms
+            stats.real_time_factor = real_time_factor
+        else:
+            stats.latency_ms += self.smoothing * (latency_ms - stats.latency_ms)
+            stats.real_time_factor += self.smoothing * (real_time_factor - stats.real_time_factor)
+
+        stats.blocks += 1
+        stats.peak_latency_ms = max(stats.peak_latency_ms, latency_ms)
+        stats.peak_real_time_factor = max(stats.peak_real_time_factor, real_time_factor)
+
+        self._latency_total += latency_ms
+        self._processing_total += processing
+        self._audio_total += duration
+        stats.mean_latency_ms = self._latency_total / stats.blocks
+        stats.mean_real_time_factor = self._processing_total / self._audio_total
+
+        if self.latency_observer is not None:
+            self.latency_observer(latency_ms / 1000.0)
+
+    def stats(
+        self, buffer_fill: float = 0.0, peak_buffer_fill: float = 0.0, dropped_blocks: int = 0
+    ) -> StreamHealthStats:
+        """Get a snapshot of the stream health, including the capture buffer state."""
+        return StreamHealthStats(
+            latency_ms=self._stats.latency_ms,
+            mean_latency_ms=self._stats.mean_latency_ms,
+            peak_latency_ms=self._stats.peak_latency_ms,
+            real_time_factor=self._stats.real_time_factor,
+            mean_real_time_factor=self._stats.mean_real_time_factor,
+            peak_real_time_factor=self._stats.peak_real_time_factor,
+            buffer_fill=buffer_fill,
+            peak_buffer_fill=peak_buffer_fill,
+            dropped_blocks=dropped_blocks,
+            input_overflows=self.input_overflows,
+            blocks=self._stats.blocks,
+        )
@@ -1,5 +1,7 @@
 from datetime import timedelta
 
+import numpy as np
+
 
 def time_to_milliseconds(frame_number: int, sample_rate: int) -> float:
     """Convert frame number to milliseconds."""
@@ -22,6 +24,82 @@ def format_time_string(milliseconds: float) -> str:
     return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{ms:03d}"
 
 
+def format_time_strings(milliseconds: np.ndarray) -> np.ndarray:
+    """Format an array of milliseconds as HH:MM:SS.mmm like `format_time_string`, as ASCII bytes.
+
+    The digits are written with array arithmetic instead of formatting every value on its own.
+    The result has a bytes dtype, ready to be written to a file; use `.astype(str)` for text.
+    """
+    # timedelta rounds to microseconds before the milliseconds are truncated
+    total_ms = np.rint(np.asarray(milliseconds, dtype=np.float64).reshape(-1) * 1000.0).astype(np.int64) // 1000
+    hours, remainder = np.divmod(total_ms, 3_600_000)
+    minutes, remainder = np.divmod(remainder, 60_000)
+    seconds, ms = np.divmod(remainder, 1000)
+
+    text = np.empty((total_ms.size, 12), dtype=np.uint8)
+    text[:, 0:2] = _digits(hours % 100, 2)
+    text[:, 2] = ord(":")
+    text[:, 3:5] = _digits(minutes, 2)
+    text[:, 5] = ord(":")
+    text[:, 6:8] = _digits(seconds, 2)
+    text[:, 8] = ord(".")
+    text[:, 9:12] = _digits(ms, 3)
+    strings = text.view("S12").reshape(-1)
+
+    # Hours past 99 do not fit the fixed width
+    long = hours >= 100
+    if long.any():
+        strings = strings.astype("S16")
+        rest = np.ascontiguousarray(text[long, 2:]).view("S10").reshape(-1)
+        strings[long] = np.char.add(format_decimal_strings(hours[long]), rest)
+    return strings
+
+
+def format_decimal_strings(values: np.ndarray, decimals: int = 0) -> np.ndarray:
+    """Format non-negative numbers with a fixed number of decimals for a whole array at once, as ASCII bytes.
+
+    Every value is written zero padded to the width of the largest one, then shifted left over
+    its leading zeros, which leaves the padding at the end where the bytes dtype drops it.
+    """
+    values = np.asarray(values).reshape(-1)
+    if decimals or values.dtype.kind == "f":
+        whole, fraction = np.divmod(np.rint(values * 10.0**decimals).astype(np.int64), 10**decimals)
+    else:
+        whole, fraction = values.astype(np.int64), None
+    if whole.size == 0:
+        return np.empty(0, dtype="S1")
+
+    int_width = len(str(int(whole.max())))
+    width = int_width + (decimals + 1 if decimals else 0)
+    text = np.empty((whole.size, width), dtype=np.uint8)
+    text[:, :int_width] = _digits(whole, int_width)
+    if decimals:
+        text[:, int_width] = ord(".")
+        text[:, int_width + 1 :] = _digits(fraction, decimals)
+
+    # Shift the rows of each length over their leading zeros, keeping one digit before the point
+    lengths = np.searchsorted(10 ** np.arange(1, int_width, dtype=np.int64), whole, side="right") + 1
+    for length in range(1, int_width):
+        rows = lengths == length
+        if rows.any():
+            shift = int_width - length
+            text[rows, : width - shift] = text[rows, shift:]
+            text[rows, width - shift :] = 0
+    return text.view(f"S{width}").reshape(-1)
+
+
+def _digits(values: np.ndarray, width: int) -> np.ndarray:
+    """Get the zero padded decimal digits of non-negative integers as ASCII codes, shape (values, width)."""
+    digits = np.empty((values.size, width), dtype=np.uint8)
+    quotient = values.astype(np.int64, copy=True)
+    remainder = np.empty_like(quotient)
+    for column in range(width - 1, -1, -1):
+        np.divmod(quotient, 10, out=(quotient, remainder))
+        digits[:, column] = remainder
+    digits += ord("0")
+    return digits
+
+
 def format_elapsed_time(seconds: float) -> str:
     """Format elapsed time in seconds as HH:MM:SS."""
     hours, remainder = divmod(int(seconds), 3600)
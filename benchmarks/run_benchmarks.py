@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmarks for the analysis stages and file readers.
+
+Reports samples per second (frames x channels) for every stage across channel counts,
+block sizes and sample dtypes. Results can be saved as a JSON baseline and compared
+against one to flag regressions:
+
+    python benchmarks/run_benchmarks.py --save baseline.json
+    python benchmarks/run_benchmarks.py --compare baseline.json --tolerance 0.15
+
+CLI startup time is checked against fixed budgets, since the CLI is invoked many times
+per CI run:
+
+    python benchmarks/run_benchmarks.py --startup-only
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from audio_glitch_detector.core import (
+    GlitchDetector,
+    calculate_derivative,
+    filter_nearby_indices,
+    find_glitch_sample_indices,
+    to_float,
+)
+from audio_glitch_detector.core.analysis import find_optimal_threshold
+from audio_glitch_detector.readers import FileReader, MappedWavReader, open_file_reader
+
+TEST_FILES_DIR = Path(__file__).parent.parent / "test_files"
+SAMPLE_RATE = 48000
+
+CHANNEL_COUNTS = [1, 2, 8]
+BLOCK_SIZES = [512, 4096, 65536]
+DTYPES = ["float64", "float32", "int16", "int32"]
+
+# Subtypes of the synthetic files used for the reader benchmarks
+FILE_SUBTYPES = {"int16": "PCM_16", "int32": "PCM_32", "float32": "FLOAT"}
+
+# Startup time budgets in seconds, on top of the bare interpreter startup
+STARTUP_BUDGETS = {
+    "--version": 0.15,
+    "import cli": 0.05,
+    "import file_mode": 0.4,
+    "import stream_mode": 0.4,
+}
+STARTUP_COMMANDS = {
+    "--version": ["-m", "audio_glitch_detector.cli", "--version"],
+    "import cli": ["-c", "import audio_glitch_detector.cli"],
+    "import file_mode": ["-c", "import audio_glitch_detector.file_mode"],
+    "import stream_mode": ["-c", "import audio_glitch_detector.stream_mode"],
+}
+
+# Readers by name. "auto" is the reader file mode picks, which maps the file when it can
+READERS = {"FileReader": FileReader, "MappedWavReader": MappedWavReader, "auto": open_file_reader}
+
+
+def synthetic_signal(channels: int, frames: int, dtype: str, glitch_every: int = 10000) -> np.ndarray:
+    """Create a sine signal with shape (channels, frames) and a glitch every `glitch_every` frames."""
+    t = np.arange(frames) / SAMPLE_RATE
+    frequencies = 440.0 * (1.0 + 0.1 * np.arange(channels))
+    signal = 0.8 * np.sin(2 * np.pi * frequencies[:, None] * t)
+    signal[:, glitch_every::glitch_every] = 0.0
+
+    dtype = np.dtype(dtype)
+    if dtype.kind == "f":
+        return signal.astype(dtype)
+    return np.round(signal * np.iinfo(dtype).max).astype(dtype)
+
+
+def measure(function: Callable[[], object], min_time: float, repeats: int) -> float:
+    """Get the best time in seconds of one call, calling repeatedly for at least `min_time` per repeat."""
+    function()  # warm up buffers and caches
+
+    best = float("inf")
+    for _ in range(repeats):
+        calls = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time:
+            function()
+            calls += 1
+            elapsed = time.perf_counter() - start
+        best = min(best, elapsed / calls)
+    return best
+
+
+def block_stages(samples: np.ndarray, sample_rate: int) -> dict[str, Callable[[], object]]:
+    """Get the per block analysis stages to benchmark for one block of samples."""
+    float_samples = samples if samples.dtype.kind == "f" else to_float(samples)
+    derivative = calculate_derivative(float_samples)
+    indices = find_glitch_sample_indices(derivative, 0.1)
+    dense_indices = np.random.default_rng(0).integers(0, samples.shape[1], size=samples.shape[1] // 100)
+    # Sorted and unique like detector output, so the fast path of the filter is measured
+    nearby_indices = np.unique(np.concatenate([indices, dense_indices]))
+    detector = GlitchDetector(sample_rate)
+    stream_detector = GlitchDetector(sample_rate)
+
+    return {
+        "calculate_derivative": lambda: calculate_derivative(samples),
+        "find_glitch_sample_indices": lambda: find_glitch_sample_indices(derivative, 0.1),
+        "find_optimal_threshold": lambda: find_optimal_threshold(float_samples),
+        "filter_nearby_indices": lambda: filter_nearby_indices(nearby_indices),
+        "detect": lambda: detector.detect(samples),
+        "feed": lambda: stream_detector.feed(samples),
+    }
+
+
+def read_pass(reader: str, file_path: str, block_size: int) -> Callable[[], int]:
+    """Get a function reading a whole file block by block with one of the `READERS`."""
+    open_reader = READERS[reader]
+
+    def read() -> int:
+        frames = 0
+        with open_reader(file_path, block_size=block_size, overlap=0) as file_reader:
+            for samples, _ in file_reader.read_blocks():
+                frames += samples.shape[1]
+        return frames
+
+    return read
+
+
+def run_stage_benchmarks(
+    channel_counts: list[int], block_sizes: list[int], dtypes: list[str], min_time: float, repeats: int
+) -> dict[str, float]:
+    """Benchmark the analysis stages on synthetic blocks. Returns samples per second by name."""
+    results = {}
+    for dtype in dtypes:
+        for channels in channel_counts:
+            for block_size in block_sizes:
+                samples = synthetic_signal(channels, block_size, dtype)
+                for stage, function in block_stages(samples, SAMPLE_RATE).items():
+                    seconds = measure(function, min_time, repeats)
+                    name = f"{stage}[channels={channels},block={block_size},dtype={dtype}]"
+                    results[name] = samples.size / seconds
+                    print_result(name, results[name])
+    return results
+
+
+def run_reader_benchmarks(
+    channel_counts: list[int],
+    block_sizes: list[int],
+    dtypes: list[str],
+    duration: float,
+    min_time: float,
+    repeats: int,
+) -> dict[str, float]:
+    """Benchmark the file readers on the bundled test files and on synthetic files."""
+    results = {}
+
+    test_files = sorted(TEST_FILES_DIR.glob("*.wav"))
+    if test_files:
+        total_samples = sum(sf.info(str(f)).frames * sf.info(str(f)).channels for f in test_files)
+        # Some test files are 24 bit, which only FileReader can read
+        for reader in ("FileReader", "auto"):
+            for block_size in block_sizes:
+                passes = [read_pass(reader, str(f), block_size) for f in test_files]
+                seconds = measure(lambda passes=passes: [read() for read in passes], min_time, repeats)
+                name = f"read_blocks[reader={reader},block={block_size},files=test_files]"
+                results[name] = total_samples / seconds
+                print_result(name, results[name])
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        frames = int(duration * SAMPLE_RATE)
+        for dtype in dtypes:
+            if dtype not in FILE_SUBTYPES:
+                continue
+            for channels in channel_counts:
+                file_path = str(Path(temp_dir) / f"synthetic_{channels}ch_{dtype}.wav")
+                sf.write(file_path, synthetic_signal(channels, frames, "float64").T, SAMPLE_RATE, FILE_SUBTYPES[dtype])
+                for reader in ("FileReader", "MappedWavReader"):
+                    for block_size in block_sizes:
+                        seconds = measure(read_pass(reader, file_path, block_size), min_time, repeats)
+                        name = f"read_blocks[reader={reader},channels={channels},block={block_size},dtype={dtype}]"
+                        results[name] = frames * channels / seconds
+                        print_result(name, results[name])
+
+    return results
+
+
+def startup_time(arguments: list[str], repeats: int) -> float:
+    """Get the best wall time in seconds of running the interpreter with `arguments`."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *arguments], check=True, stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_startup_benchmarks(repeats: int) -> dict[str, float]:
+    """Time CLI startup paths. Returns the seconds each takes beyond a bare interpreter start."""
+    interpreter = startup_time(["-c", "pass"], repeats)
+    results = {}
+    for name, arguments in STARTUP_COMMANDS.items():
+        results[name] = startup_time(arguments, repeats) - interpreter
+        budget = STARTUP_BUDGETS[name]
+        flag = "" if results[name] <= budget else "  OVER BUDGET"
+        print(f"{'startup[' + name + ']':<80} {results[name] * 1000:>10.1f} ms (budget {budget * 1000:.0f} ms){flag}")
+    return results
+
+
+def print_result(name: str, samples_per_second: float) -> None:
+    """Print one benchmark result."""
+    print(f"{name:<80} {samples_per_second / 1e6:>10.1f} Msamples/s")
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[str]:
+    """Print the change against a baseline. Returns the names of benchmarks slower than the tolerance allows."""
+    regressions = []
+    print(f"\n{'Benchmark':<80} {'Change':>10}")
+    for name, samples_per_second in results.items():
+        if name not in baseline:
+            continue
+        change = samples_per_second / baseline[name] - 1.0
+        flag = ""
+        if change < -tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<80} {change:>+10.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput benchmarks for audio-glitch-detector")
+    parser.add_argument("--channels", type=int, nargs="+", default=CHANNEL_COUNTS, help="Channel counts")
+    parser.add_argument("--block-sizes", type=int, nargs="+", default=BLOCK_SIZES, help="Block sizes in frames")
+    parser.add_argument("--dtypes", nargs="+", default=DTYPES, choices=DTYPES, help="Sample dtypes")
+    parser.add_argument("--duration", type=float, default=60.0, help="Length of the synthetic files in seconds")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum time per repeat in seconds")
+    parser.add_argument("--repeats", type=int, default=3, help="Repeats per benchmark, the best is reported")
+    parser.add_argument("--skip-readers", action="store_true", help="Only benchmark the analysis stages")
+    parser.add_argument("--startup-only", action="store_true", help="Only check the CLI startup time budgets")
+    parser.add_argument("--startup-repeats", type=int, default=10, help="Runs per startup path, the best is reported")
+    parser.add_argument("--save", type=Path, help="Save the results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="Compare the results against a JSON baseline")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.15, help="Allowed slowdown against the baseline (default: 0.15)"
+    )
+    args = parser.parse_args()
+
+    startup = run_startup_benchmarks(args.startup_repeats)
+    over_budget = [name for name, seconds in startup.items() if seconds > STARTUP_BUDGETS[name]]
+    if args.startup_only:
+        if over_budget:
+            print(f"\n{len(over_budget)} startup paths over budget")
+            sys.exit(1)
+        return
+
+    results = run_stage_benchmarks(args.channels, args.block_sizes, args.dtypes, args.min_time, args.repeats)
+    if not args.skip_readers:
+        results.update(
+            run_reader_benchmarks(
+                args.channels, args.block_sizes, args.dtypes, args.duration, args.min_time, args.repeats
+            )
+        )
+
+    if args.save:
+        baseline = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "samples_per_second": results,
+            "startup_seconds": startup,
+        }
+        args.save.write_text(json.dumps(baseline, indent=2))
+        print(f"\nSaved baseline to {args.save}")
+
+    failed = False
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare(results, baseline["samples_per_second"], args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} benchmarks regressed by more than {args.tolerance:.0%}")
+            failed = True
+        else:
+            print("\nNo regressions")
+
+    if over_budget:
+        print(f"\n{len(over_budget)} startup paths over budget")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
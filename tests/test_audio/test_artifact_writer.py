@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+import soundfile as sf
+
+from audio_glitch_detector.audio.artifact_writer import ArtifactWriter
+
+
+@pytest.fixture
+def block(stereo_sine_wave):
+    return stereo_sine_wave[:, :1024]
+
+
+class TestArtifactWriter:
+    def test_saves_blocks(self, tmp_path, block):
+        with ArtifactWriter(max_artifacts=5, output_dir=tmp_path, workers=1) as writer:
+            for frame_offset in (0, 1024):
+                assert writer.submit(block, 48000, frame_offset, 0.1)
+
+        assert writer.saved == 2
+        assert writer.pending == 0
+        assert len(list(tmp_path.glob("*.wav"))) == 2
+        assert len(list(tmp_path.glob("*.png"))) == 2
+
+    def test_keeps_newest_artifacts(self, tmp_path, block):
+        with ArtifactWriter(max_artifacts=2, output_dir=tmp_path, workers=2) as writer:
+            for frame_offset in (0, 1024, 2048, 3072):
+                writer.submit(block, 48000, frame_offset, 0.1)
+
+        assert writer.saved == 2
+        assert sorted(p.name for p in tmp_path.glob("*.wav")) == [
+            "glitch_block_00002048_43ms.wav",
+            "glitch_block_00003072_64ms.wav",
+        ]
+
+    def test_keeps_newest_artifacts_per_subdir(self, tmp_path, block):
+        with ArtifactWriter(max_artifacts=2, output_dir=tmp_path, workers=2) as writer:
+            for frame_offset in (0, 1024, 2048):
+                writer.submit(block, 48000, frame_offset, 0.1, subdir="device_1")
+            writer.submit(block, 48000, 0, 0.1, subdir="device_2")
+
+        assert writer.saved == 3
+        assert sorted(p.name for p in (tmp_path / "device_1").glob("*.wav")) == [
+            "glitch_block_00001024_21ms.wav",
+            "glitch_block_00002048_43ms.wav",
+        ]
+        assert [p.name for p in (tmp_path / "device_2").glob("*.wav")] == ["glitch_block_00000000_0ms.wav"]
+
+    def test_skips_when_busy(self, tmp_path, block):
+        with ArtifactWriter(max_artifacts=10, output_dir=tmp_path, workers=1, max_pending=1) as writer:
+            accepted = [writer.submit(block, 48000, i * 1024, 0.1, wait=False) for i in range(5)]
+
+        assert accepted[0]
+        assert writer.skipped == accepted.count(False)
+        assert writer.saved == accepted.count(True)
+
+    def test_copies_samples(self, tmp_path, block):
+        samples = block.copy()
+        with ArtifactWriter(max_artifacts=1, output_dir=tmp_path, workers=1) as writer:
+            writer.submit(samples, 48000, 0, 0.1)
+            samples[:] = 0.0
+
+        saved, _ = sf.read(str(next(tmp_path.glob("*.wav"))))
+        assert np.abs(saved).max() > 0.5
+
+    def test_not_started(self, block):
+        with pytest.raises(RuntimeError, match="not started"):
+            ArtifactWriter().submit(block, 48000, 0, 0.1)
+
+    def test_invalid_max_artifacts(self):
+        with pytest.raises(ValueError, match="Max artifacts must be positive"):
+            ArtifactWriter(max_artifacts=0)
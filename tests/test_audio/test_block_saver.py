@@ -0,0 +1,59 @@
+import numpy as np
+import soundfile as sf
+
+from audio_glitch_detector.audio.block_saver import min_max_envelope, save_glitch_block
+
+
+class TestMinMaxEnvelope:
+    def test_short_rows_unchanged(self):
+        values = np.array([[0.1, -0.2, 0.3]])
+        positions, envelope = min_max_envelope(values, 8)
+
+        np.testing.assert_array_equal(positions[0], [0, 1, 2])
+        np.testing.assert_array_equal(envelope, values)
+
+    def test_keeps_extremes_in_order(self):
+        rng = np.random.default_rng(0)
+        values = rng.standard_normal((2, 10007))
+        values[1, 5000] = 10.0
+        positions, envelope = min_max_envelope(values, 100)
+
+        assert envelope.shape == (2, 100)
+        np.testing.assert_array_equal(envelope.max(axis=1), values.max(axis=1))
+        np.testing.assert_array_equal(envelope.min(axis=1), values.min(axis=1))
+        assert np.all(np.diff(positions, axis=1) >= 0)
+        assert 5000 in positions[1]
+        np.testing.assert_array_equal(envelope, np.take_along_axis(values, positions, axis=1))
+
+    def test_one_dimensional_input(self):
+        positions, envelope = min_max_envelope(np.arange(1000.0), 10)
+
+        assert envelope.shape == (1, 10)
+        np.testing.assert_array_equal(envelope, np.take_along_axis(np.arange(1000.0)[None, :], positions, axis=1))
+        assert envelope[0, 0] == 0.0
+        assert envelope[0, -1] == 999.0
+
+
+class TestSaveGlitchBlock:
+    def test_saves_wav_and_png(self, tmp_path):
+        samples = np.sin(np.linspace(0, 200 * np.pi, 48000)).reshape(1, -1).repeat(2, axis=0)
+        samples[:, 1000] = 0.0
+
+        wav_path, png_path = save_glitch_block(samples, 48000, 96000, 0.1, tmp_path)
+
+        assert wav_path.exists()
+        assert png_path.read_bytes()[:8] == b"\x89PNG\r\n\x1a\n"
+        data, sample_rate = sf.read(str(wav_path))
+        assert sample_rate == 48000
+        assert data.shape == (48000, 2)
+
+    def test_saves_multichannel_context(self, tmp_path):
+        samples = np.sin(np.linspace(0, 20 * np.pi, 4800))[None, :].repeat(16, axis=0)
+        samples[5, 2400:] = 0.0
+
+        wav_path, png_path = save_glitch_block(samples, 48000, 1000, 0.1, tmp_path, glitch_index=3400)
+
+        assert wav_path.name == "glitch_00003400_71ms.wav"
+        assert png_path.exists()
+        data, _ = sf.read(str(wav_path))
+        assert data.shape == (4800, 16)
@@ -1,3 +1,4 @@
+import numpy as np
 import pyaudio
 import pytest
 
@@ -54,9 +55,12 @@ class TestAudioConfig:
         with pytest.raises(ValueError, match="Sample rate must be positive"):
             config.validate()
 
+    def test_validate_multichannel(self):
+        AudioConfig(channels=64).validate()
+
     def test_validate_invalid_channels(self):
-        config = AudioConfig(channels=3)
-        with pytest.raises(ValueError, match="Only mono \\(1\\) or stereo \\(2\\) channels supported"):
+        config = AudioConfig(channels=0)
+        with pytest.raises(ValueError, match="Channels must be positive"):
             config.validate()
 
     def test_validate_invalid_bit_depth(self):
@@ -69,6 +73,20 @@ class TestAudioConfig:
         with pytest.raises(ValueError, match="Block size must be positive"):
             config.validate()
 
+    def test_validate_invalid_capture_mode(self):
+        config = AudioConfig(capture_mode="polling")
+        with pytest.raises(ValueError, match="Capture mode must be one of"):
+            config.validate()
+
+    def test_validate_zero_buffer_blocks(self):
+        config = AudioConfig(buffer_blocks=0)
+        with pytest.raises(ValueError, match="Buffer blocks must be positive"):
+            config.validate()
+
+    def test_sample_dtype(self):
+        assert AudioConfig(bit_depth=16).sample_dtype == np.int16
+        assert AudioConfig(bit_depth=32).sample_dtype == np.int32
+
     def test_validate_zero_chunk_size(self):
         config = AudioConfig(block_size=0)
         with pytest.raises(ValueError, match="Block size must be positive"):
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from audio_glitch_detector.audio.context_capture import ContextCapture
+
+
+def push_blocks(capture, signal, block_size, glitches, threshold=0.1):
+    """Push a signal in blocks, with the glitches in each block, and collect the contexts."""
+    contexts = []
+    for start in range(0, signal.shape[1], block_size):
+        block = signal[:, start : start + block_size]
+        indices = np.array([g for g in glitches if start <= g < start + block.shape[1]], dtype=np.int64)
+        contexts.extend(capture.push(block, start, indices, threshold))
+    return contexts
+
+
+class TestContextCapture:
+    @pytest.mark.parametrize("block_size", [7, 64, 100, 1000])
+    def test_windows_span_block_boundaries(self, block_size):
+        signal = np.arange(2 * 1000).reshape(2, 1000)
+        glitches = [100, 127, 499, 500, 800]
+        capture = ContextCapture(30, 20)
+
+        contexts = push_blocks(capture, signal, block_size, glitches)
+
+        assert [context.glitch_index for context in contexts] == glitches
+        for context in contexts:
+            assert context.frame_offset == context.glitch_index - 30
+            np.testing.assert_array_equal(
+                context.samples, signal[:, context.glitch_index - 30 : context.glitch_index + 20]
+            )
+
+    def test_window_cut_short_at_stream_start_and_end(self):
+        signal = np.arange(200, dtype=np.float32).reshape(1, -1)
+        capture = ContextCapture(50, 50)
+
+        contexts = push_blocks(capture, signal, 64, [10, 180])
+        assert [context.glitch_index for context in contexts] == [10]
+        np.testing.assert_array_equal(contexts[0].samples, signal[:, 0:60])
+
+        flushed = capture.flush()
+        assert [context.glitch_index for context in flushed] == [180]
+        assert flushed[0].frame_offset == 130
+        np.testing.assert_array_equal(flushed[0].samples, signal[:, 130:200])
+        assert flushed[0].samples.dtype == np.float32
+
+    def test_gap_cuts_pending_windows(self):
+        capture = ContextCapture(10, 10)
+        first = np.ones((1, 32))
+        second = np.full((1, 32), 2.0)
+
+        assert capture.push(first, 0, np.array([30]), 0.1) == []
+        contexts = capture.push(second, 64, np.array([90]), 0.2)
+
+        assert [context.glitch_index for context in contexts] == [30]
+        np.testing.assert_array_equal(contexts[0].samples, first[:, 20:32])
+        flushed = capture.flush()
+        assert flushed[0].frame_offset == 80
+        assert flushed[0].threshold == 0.2
+        np.testing.assert_array_equal(flushed[0].samples, second[:, 16:32])
+
+    def test_history_is_copied(self):
+        capture = ContextCapture(4, 4)
+        block = np.arange(8.0).reshape(1, -1)
+
+        capture.push(block, 0, np.array([7]), 0.1)
+        block[:] = -1.0
+        contexts = capture.push(np.zeros((1, 8)), 8, np.array([], dtype=np.int64), 0.1)
+
+        np.testing.assert_array_equal(contexts[0].samples, [[3.0, 4.0, 5.0, 6.0, 7.0, 0.0, 0.0, 0.0]])
+
+    def test_negative_frames(self):
+        with pytest.raises(ValueError):
+            ContextCapture(-1, 10)
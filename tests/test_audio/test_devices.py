@@ -0,0 +1,30 @@
+import pytest
+
+from audio_glitch_detector.audio.devices import AudioDevice, find_input_device
+
+DEVICES = [
+    AudioDevice(0, "Built-in Microphone", 2, 0, 48000.0),
+    AudioDevice(1, "Built-in Output", 0, 2, 48000.0),
+    AudioDevice(2, "USB Audio Interface", 8, 8, 48000.0),
+    AudioDevice(3, "USB Audio", 2, 2, 44100.0),
+]
+
+
+class TestFindInputDevice:
+    def test_by_index(self):
+        assert find_input_device("2", DEVICES).name == "USB Audio Interface"
+
+    def test_by_name_part_ignoring_case(self):
+        assert find_input_device("microphone", DEVICES).index == 0
+
+    def test_exact_name_preferred(self):
+        assert find_input_device("usb audio", DEVICES).index == 3
+
+    def test_ambiguous_name(self):
+        with pytest.raises(ValueError, match="Several"):
+            find_input_device("USB", DEVICES)
+
+    @pytest.mark.parametrize("spec", ["1", "9", "Output", "Speakers"])
+    def test_no_input_device(self, spec):
+        with pytest.raises(ValueError, match="No input device"):
+            find_input_device(spec, DEVICES)
@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from audio_glitch_detector.audio.context_capture import GlitchContext
+from audio_glitch_detector.audio.glitch_queue import SlabGlitchQueue
+
+
+def snapshot(value: int, frames: int = 16) -> np.ndarray:
+    return np.full((2, frames), value, dtype=np.int16)
+
+
+class TestSlabGlitchQueue:
+    def test_first_in_first_out_in_native_dtype(self):
+        queue = SlabGlitchQueue(2, 16, np.int16, capacity=4)
+        queue.add(snapshot(1), 100, 0.1, glitch_index=108)
+        queue.add(snapshot(2, frames=10), 200, 0.2)
+
+        first = queue.pop()
+        assert first.frame_offset == 100
+        assert first.glitch_index == 108
+        assert first.threshold == 0.1
+        assert first.samples.dtype == np.int16
+        np.testing.assert_array_equal(first.samples, snapshot(1))
+
+        second = queue.pop()
+        assert second.glitch_index is None
+        np.testing.assert_array_equal(second.samples, snapshot(2, frames=10))
+        assert len(queue) == 0
+
+    def test_spills_to_disk_when_slab_is_full(self, tmp_path):
+        with SlabGlitchQueue(2, 16, np.int16, capacity=3, spill_dir=tmp_path) as queue:
+            for i in range(20):
+                queue.add(snapshot(i), i * 1000, 0.1, glitch_index=i * 1000 + 8)
+
+            assert len(queue) == 20
+            assert queue.spilled == 17
+            assert len(list(tmp_path.iterdir())) == 1
+
+            for i in range(20):
+                context = queue.pop()
+                assert context.frame_offset == i * 1000
+                np.testing.assert_array_equal(context.samples, snapshot(i))
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_slots_reused_once_empty(self, tmp_path):
+        queue = SlabGlitchQueue(2, 16, np.int16, capacity=2, spill_dir=tmp_path)
+        for round_number in range(5):
+            queue.add(snapshot(round_number), 0, 0.1)
+            queue.add(snapshot(round_number + 10), 16, 0.1)
+            assert queue.pop().samples[0, 0] == round_number
+            assert queue.pop().samples[0, 0] == round_number + 10
+
+        assert queue.spilled == 0
+        assert list(tmp_path.iterdir()) == []
+
+    def test_slots_reused_while_not_empty(self, tmp_path):
+        queue = SlabGlitchQueue(2, 16, np.int16, capacity=2, spill_dir=tmp_path)
+        queue.add(snapshot(0), 0, 0.1)
+        for i in range(1, 10000):
+            queue.add(snapshot(i % 100), i, 0.1)
+            assert queue.pop().frame_offset == i - 1
+
+        assert len(queue) == 1
+        assert queue.spilled == 0
+        assert list(tmp_path.iterdir()) == []
+
+    def test_spill_file_reused_at_steady_depth(self, tmp_path):
+        with SlabGlitchQueue(2, 16, np.int16, capacity=2, spill_dir=tmp_path) as queue:
+            for i in range(5):
+                queue.add(snapshot(i), i, 0.1)
+            (spill_file,) = tmp_path.iterdir()
+            spill_size = spill_file.stat().st_size
+
+            for i in range(5, 1000):
+                queue.add(snapshot(i % 100), i, 0.1)
+                assert queue.pop().frame_offset == i - 5
+
+            assert list(tmp_path.iterdir()) == [spill_file]
+            assert spill_file.stat().st_size == spill_size
+
+    def test_grows_while_wrapped(self, tmp_path):
+        with SlabGlitchQueue(2, 16, np.int16, capacity=3, spill_dir=tmp_path) as queue:
+            for i in range(3):
+                queue.add(snapshot(i), i, 0.1)
+            assert queue.pop().frame_offset == 0
+            for i in range(3, 8):
+                queue.add(snapshot(i), i, 0.1)
+
+            for i in range(1, 8):
+                context = queue.pop()
+                assert context.frame_offset == i
+                np.testing.assert_array_equal(context.samples, snapshot(i))
+
+    def test_max_items_drops_oldest(self, tmp_path):
+        with SlabGlitchQueue(2, 16, np.int16, capacity=2, spill_dir=tmp_path, max_items=5) as queue:
+            for i in range(12):
+                queue.add(snapshot(i), i * 1000, 0.1)
+
+            assert len(queue) == 5
+            assert queue.dropped == 7
+            (spill_file,) = tmp_path.iterdir()
+            assert spill_file.stat().st_size <= 3 * snapshot(0).nbytes
+            assert [queue.pop().frame_offset for _ in range(5)] == [7000, 8000, 9000, 10000, 11000]
+
+    def test_add_context_cuts_long_snapshots(self):
+        queue = SlabGlitchQueue(1, 8, np.float32)
+        samples = np.arange(12, dtype=np.float32).reshape(1, -1)
+        queue.add_context(GlitchContext(samples=samples, frame_offset=4, glitch_index=8, threshold=0.3))
+
+        context = queue.pop()
+        np.testing.assert_array_equal(context.samples, samples[:, :8])
+        assert context.glitch_index == 8
+
+    def test_pop_empty(self):
+        with pytest.raises(IndexError):
+            SlabGlitchQueue(1, 8, np.int16).pop()
+
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            SlabGlitchQueue(1, 8, np.int16, capacity=0)
+        with pytest.raises(ValueError):
+            SlabGlitchQueue(1, 8, np.int16, max_items=0)
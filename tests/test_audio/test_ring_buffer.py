@@ -0,0 +1,94 @@
+from threading import Event
+
+import numpy as np
+import pytest
+
+from audio_glitch_detector.readers.ring_buffer import BlockRingBuffer
+
+
+def interleaved_block(frames: int, channels: int, start: int = 0) -> bytes:
+    return np.arange(start, start + frames * channels, dtype=np.int16).tobytes()
+
+
+class TestBlockRingBuffer:
+    def test_write_and_read(self):
+        ring = BlockRingBuffer(capacity=4, frames=3, channels=2, dtype=np.int16)
+
+        assert ring.write(interleaved_block(3, 2))
+        samples, frame_number = ring.peek()
+
+        assert frame_number == 0
+        assert samples.shape == (2, 3)
+        assert samples.tolist() == [[0, 2, 4], [1, 3, 5]]
+
+    def test_capture_time(self):
+        ring = BlockRingBuffer(capacity=4, frames=3, channels=1, dtype=np.int16)
+        ring.write(interleaved_block(3, 1), capture_time=1.5)
+        ring.write(interleaved_block(3, 1), capture_time=2.5)
+
+        assert ring.capture_time() == 1.5
+        ring.release()
+        assert ring.capture_time() == 2.5
+
+    def test_empty(self):
+        ring = BlockRingBuffer(capacity=2, frames=3, channels=1, dtype=np.int16)
+        assert ring.peek() is None
+        assert not ring.wait(timeout=0.01)
+
+    def test_frame_numbers(self):
+        ring = BlockRingBuffer(capacity=4, frames=3, channels=1, dtype=np.int16)
+        for _ in range(3):
+            ring.write(interleaved_block(3, 1))
+
+        frame_numbers = []
+        while ring.peek() is not None:
+            frame_numbers.append(ring.peek()[1])
+            ring.release()
+
+        assert frame_numbers == [0, 3, 6]
+
+    def test_drops_when_full(self):
+        ring = BlockRingBuffer(capacity=2, frames=3, channels=1, dtype=np.int16)
+
+        assert ring.write(interleaved_block(3, 1, start=0))
+        assert ring.write(interleaved_block(3, 1, start=10))
+        assert not ring.write(interleaved_block(3, 1, start=20))
+
+        assert ring.dropped_blocks == 1
+        assert ring.fill_level == 1.0
+
+        ring.release()
+        ring.release()
+        assert ring.write(interleaved_block(3, 1, start=30))
+
+        # Dropped blocks still advance the frame position
+        samples, frame_number = ring.peek()
+        assert frame_number == 9
+        assert samples.tolist() == [[30, 31, 32]]
+
+    def test_slots_are_reused(self):
+        ring = BlockRingBuffer(capacity=1, frames=2, channels=1, dtype=np.int16)
+
+        ring.write(interleaved_block(2, 1))
+        first, _ = ring.peek()
+        ring.release()
+        ring.write(interleaved_block(2, 1, start=5))
+        second, _ = ring.peek()
+
+        assert np.shares_memory(first, second)
+        assert ring.peak_fill == 1
+
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError, match="Capacity must be positive"):
+            BlockRingBuffer(capacity=0, frames=2, channels=1, dtype=np.int16)
+
+    def test_shared_data_ready_event(self):
+        data_ready = Event()
+        first = BlockRingBuffer(capacity=2, frames=3, channels=1, dtype=np.int16, data_ready=data_ready)
+        second = BlockRingBuffer(capacity=2, frames=3, channels=1, dtype=np.int16, data_ready=data_ready)
+
+        second.write(interleaved_block(3, 1))
+
+        assert data_ready.is_set()
+        assert first.peek() is None
+        assert second.peek() is not None
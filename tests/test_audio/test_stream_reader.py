@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from audio_glitch_detector.readers.stream_reader import VolumeMeter
+
+
+class TestVolumeMeter:
+    def test_peaks_per_channel(self):
+        meter = VolumeMeter(channels=16)
+        samples = np.zeros((16, 256), dtype=np.int16)
+        samples[3, 10] = -32768
+        samples[7, 20] = 16384
+
+        meter.update(samples)
+        peak_db = meter.get_peak_db()
+
+        assert len(peak_db) == 16
+        assert peak_db[3] == pytest.approx(0.0)
+        assert peak_db[7] == pytest.approx(-6.02, abs=0.01)
+        assert peak_db[0] == -120.0
+
+    def test_keeps_maximum_until_read(self):
+        meter = VolumeMeter(channels=2)
+        meter.update(np.full((2, 8), 0.5))
+        meter.update(np.full((2, 8), 0.25))
+
+        assert meter.get_peak_db() == pytest.approx([-6.02, -6.02], abs=0.01)
+        assert meter.get_peak_db() == [-120.0, -120.0]
+
+    def test_mono_samples(self):
+        meter = VolumeMeter(channels=1)
+        meter.update(np.full(8, -0.1, dtype=np.float32))
+
+        assert meter.get_peak_db() == pytest.approx([-20.0])
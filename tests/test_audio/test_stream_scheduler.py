@@ -0,0 +1,90 @@
+from threading import Event
+
+import numpy as np
+
+from audio_glitch_detector.readers.ring_buffer import BlockRingBuffer
+from audio_glitch_detector.readers.stream_scheduler import StreamScheduler
+
+
+class FakeReader:
+    """Stands in for a callback mode StreamReader, fed by writing to its ring."""
+
+    def __init__(self, data_ready: Event):
+        self.ring = BlockRingBuffer(capacity=8, frames=4, channels=1, dtype=np.int16, data_ready=data_ready)
+        self.active = False
+        self.closed = False
+
+    def start_capture(self):
+        self.active = True
+
+    def process_block(self, callback):
+        block = self.ring.peek()
+        if block is None:
+            return False
+        callback(*block)
+        self.ring.release()
+        return True
+
+    @property
+    def is_active(self):
+        return self.active
+
+    def close(self):
+        self.closed = True
+
+
+def write_blocks(reader: FakeReader, count: int) -> None:
+    for _ in range(count):
+        reader.ring.write(np.zeros(4, dtype=np.int16).tobytes())
+
+
+class TestStreamScheduler:
+    def test_round_robin_between_streams(self):
+        scheduler = StreamScheduler()
+        processed = []
+        readers = [FakeReader(scheduler.data_ready) for _ in range(3)]
+        for name, reader in zip("abc", readers):
+            scheduler.add(reader, lambda samples, frame, name=name: processed.append((name, frame)))
+
+        write_blocks(readers[0], 3)
+        write_blocks(readers[2], 1)
+
+        assert scheduler.run_once() == 2
+        assert scheduler.run_once() == 1
+        assert scheduler.run_once() == 1
+        assert scheduler.run_once() == 0
+        assert processed == [("a", 0), ("c", 0), ("a", 4), ("a", 8)]
+
+    def test_thread_stops_when_streams_stop(self):
+        messages = []
+        scheduler = StreamScheduler(log=messages.append)
+        readers = [FakeReader(scheduler.data_ready) for _ in range(2)]
+        counts = [0, 0]
+        for index, reader in enumerate(readers):
+            scheduler.add(reader, lambda samples, frame, index=index: counts.__setitem__(index, counts[index] + 1))
+
+        thread = scheduler.start(Event())
+        assert all(reader.active for reader in readers)
+        write_blocks(readers[0], 2)
+        write_blocks(readers[1], 5)
+        for reader in readers:
+            reader.active = False
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert counts == [2, 5]
+        assert all(reader.closed for reader in readers)
+        assert messages == ["Audio streams stopped"]
+
+    def test_exit_event_stops_thread(self):
+        scheduler = StreamScheduler()
+        reader = FakeReader(scheduler.data_ready)
+        scheduler.add(reader, lambda samples, frame: None)
+        exit_event = Event()
+
+        thread = scheduler.start(exit_event)
+        exit_event.set()
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert reader.closed
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+import soundfile as sf
+
+from audio_glitch_detector.core.analysis import to_float
+from audio_glitch_detector.readers.file_reader import FileReader
+from audio_glitch_detector.readers.wav_reader import MappedWavReader, open_file_reader, parse_wav_header
+
+
+class TestParseWavHeader:
+    def test_pcm16(self, test_files_dir):
+        layout = parse_wav_header(test_files_dir / "sine_discont_0_stereo_440_552hz.wav")
+        info = sf.info(str(test_files_dir / "sine_discont_0_stereo_440_552hz.wav"))
+
+        assert layout.sample_rate == info.samplerate
+        assert layout.channels == info.channels
+        assert layout.frames == info.frames
+        assert layout.dtype == np.int16
+        assert layout.is_mappable
+
+    def test_24bit_not_mappable(self, test_files_dir):
+        layout = parse_wav_header(test_files_dir / "sine_discont_5_mono_440hz.wav")
+        assert not layout.is_mappable
+        assert not MappedWavReader.supports(test_files_dir / "sine_discont_5_mono_440hz.wav")
+        with pytest.raises(ValueError, match="Unsupported sample format"):
+            layout.dtype
+
+    def test_not_a_wav_file(self, tmp_path):
+        path = tmp_path / "noise.wav"
+        path.write_bytes(b"\x00" * 64)
+        with pytest.raises(ValueError, match="Not a RIFF/RF64 WAVE file"):
+            parse_wav_header(path)
+
+    @pytest.mark.parametrize(
+        "file_format,subtype,dtype",
+        [
+            ("RF64", "FLOAT", np.float32),
+            ("WAVEX", "PCM_32", np.int32),
+            ("WAV", "DOUBLE", np.float64),
+        ],
+    )
+    def test_formats(self, tmp_path, stereo_sine_wave, file_format, subtype, dtype):
+        path = tmp_path / "signal.wav"
+        sf.write(str(path), stereo_sine_wave.T * 0.5, 48000, format=file_format, subtype=subtype)
+
+        layout = parse_wav_header(path)
+
+        assert layout.dtype == dtype
+        assert layout.frames == stereo_sine_wave.shape[1]
+
+
+class TestMappedWavReader:
+    @pytest.mark.parametrize("filename", ["sine_discont_2_stereo_900hz.wav", "sine_discont_4_mono_1khz.wav"])
+    def test_blocks_match_file_reader(self, test_files_dir, filename):
+        path = str(test_files_dir / filename)
+
+        with FileReader(path, 1024, 102) as file_reader, MappedWavReader(path, 1024, 102) as mapped_reader:
+            assert mapped_reader.count_blocks() == file_reader.count_blocks()
+
+            expected_blocks = list(file_reader.read_blocks(2048, 2048 * 4))
+            mapped_blocks = list(mapped_reader.read_blocks(2048, 2048 * 4))
+
+        assert len(mapped_blocks) == len(expected_blocks)
+        for (samples, offset), (expected, expected_offset) in zip(mapped_blocks, expected_blocks, strict=True):
+            assert offset == expected_offset
+            assert np.array_equal(to_float(samples), expected)
+
+    def test_blocks_are_views(self, test_files_dir):
+        path = str(test_files_dir / "sine_discont_2_stereo_900hz.wav")
+
+        with MappedWavReader(path, 1024) as reader:
+            samples, _ = next(reader.read_blocks())
+            assert samples.shape == (2, 1024)
+            assert samples.dtype == np.int32
+            assert np.shares_memory(samples, reader.read_all())
+
+    def test_runtime_error_when_not_opened(self, test_files_dir):
+        reader = MappedWavReader(str(test_files_dir / "sine_discont_2_mono_1khz.wav"), 1024)
+
+        with pytest.raises(RuntimeError):
+            reader.sample_rate
+
+        with pytest.raises(RuntimeError):
+            list(reader.read_blocks())
+
+
+class TestOpenFileReader:
+    def test_mappable_file(self, test_files_dir):
+        reader = open_file_reader(str(test_files_dir / "sine_discont_2_mono_1khz.wav"), 1024)
+        assert isinstance(reader, MappedWavReader)
+
+    def test_falls_back_to_soundfile(self, test_files_dir):
+        reader = open_file_reader(str(test_files_dir / "sine_discont_5_mono_440hz.wav"), 1024)
+        assert isinstance(reader, FileReader)
@@ -0,0 +1,33 @@
+from audio_glitch_detector.batch_mode import analyze_batch_file, collect_audio_files
+
+
+class TestCollectAudioFiles:
+    def test_directory(self, test_files_dir):
+        files = collect_audio_files([str(test_files_dir)])
+        assert len(files) == len(list(test_files_dir.glob("*.wav")))
+        assert files == sorted(files)
+
+    def test_glob_pattern(self, test_files_dir):
+        files = collect_audio_files([str(test_files_dir / "*_mono*.wav")])
+        assert files
+        assert all("_mono" in file.name for file in files)
+
+    def test_duplicates_removed(self, test_files_dir):
+        file = test_files_dir / "sine_discont_2_mono_1khz.wav"
+        files = collect_audio_files([str(file), str(test_files_dir / "sine_discont_2_*.wav")])
+        assert files.count(file) == 1
+
+    def test_no_match(self, tmp_path):
+        assert collect_audio_files([str(tmp_path / "*.wav")]) == []
+
+
+class TestAnalyzeBatchFile:
+    def test_expected_glitches(self, test_files_dir):
+        result = analyze_batch_file(str(test_files_dir / "sine_discont_4_stereo_1khz.wav"), 0.0, 1024)
+        assert result.error is None
+        assert result.analysis.total_count == 4
+
+    def test_error_is_captured(self, tmp_path):
+        result = analyze_batch_file(str(tmp_path / "missing.wav"), 0.0, 1024)
+        assert result.analysis is None
+        assert result.error
@@ -0,0 +1,56 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ["matplotlib", "pyaudio", "numpy", "soundfile", "rich", "tqdm"]
+
+
+def loaded_modules(code: str) -> set[str]:
+    """Run code in a fresh interpreter and get which of the heavy modules it loaded."""
+    script = f"{code}\nimport json, sys\nprint(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    result = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True)
+    return set(json.loads(result.stdout.strip().splitlines()[-1]))
+
+
+class TestLazyImports:
+    def test_cli_loads_no_heavy_modules(self):
+        assert loaded_modules("import audio_glitch_detector.cli") == set()
+
+    @pytest.mark.parametrize("module", ["file_mode", "batch_mode", "stream_mode"])
+    def test_modes_load_no_plotting_or_portaudio(self, module):
+        loaded = loaded_modules(f"import audio_glitch_detector.{module}")
+
+        assert "matplotlib" not in loaded
+        assert "pyaudio" not in loaded
+
+    def test_packages_resolve_exports_on_access(self):
+        loaded = loaded_modules(
+            "import audio_glitch_detector as agd\n"
+            "from audio_glitch_detector import audio, readers\n"
+            "audio.AudioConfig, audio.ArtifactWriter, readers.open_file_reader, agd.GlitchDetector"
+        )
+
+        assert "numpy" in loaded
+        assert "matplotlib" not in loaded
+        assert "pyaudio" not in loaded
+
+    def test_unknown_attribute(self):
+        from audio_glitch_detector import audio
+
+        with pytest.raises(AttributeError):
+            audio.missing_name
+
+
+class TestArgumentValidation:
+    @pytest.mark.parametrize("option", [["-s"], ["--profile"], ["--context-ms", "20"]])
+    def test_batch_rejects_single_file_options(self, option):
+        result = subprocess.run(
+            [sys.executable, "-m", "audio_glitch_detector.cli", "-b", "captures/", *option],
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.returncode == 2
+        assert "not supported in batch mode" in result.stderr
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from audio_glitch_detector.core.aggregator import GlitchAggregator
+from audio_glitch_detector.core.analysis import filter_nearby_indices
+from audio_glitch_detector.utils.result_sink import GLITCH_RECORD_DTYPE, ResultSink
+
+
+class TestGlitchAggregator:
+    def test_filters_across_calls_like_one_pass(self):
+        rng = np.random.default_rng(0)
+        indices = np.sort(rng.integers(0, 100_000, size=5000))
+        aggregator = GlitchAggregator(dedup_window=50)
+
+        for part in np.array_split(indices, 37):
+            aggregator.add(part)
+
+        expected = filter_nearby_indices(indices, 50)
+        assert aggregator.sample_indices.tolist() == expected.tolist()
+        assert aggregator.total_count == expected.size
+
+    def test_keeps_only_first_glitches(self):
+        aggregator = GlitchAggregator(dedup_window=10, keep=3)
+
+        kept = aggregator.add(np.array([0, 5, 20, 40]))
+        aggregator.add(np.array([45, 60, 80]))
+
+        assert kept.tolist() == [0, 20, 40]
+        assert aggregator.sample_indices.tolist() == [0, 20, 40]
+        assert aggregator.total_count == 5
+
+    def test_passes_every_glitch_to_sink(self, tmp_path):
+        path = tmp_path / "glitches.bin"
+        with ResultSink(path, 1000) as sink:
+            aggregator = GlitchAggregator(dedup_window=10, sink=sink, keep=0)
+            aggregator.add(np.array([0, 5, 20]))
+            aggregator.add(np.array([]))
+            aggregator.add(np.array([25, 30]))
+
+        records = np.fromfile(path, dtype=GLITCH_RECORD_DTYPE)
+        assert records["sample_index"].tolist() == [0, 20, 30]
+        assert aggregator.sample_indices.size == 0
+
+    def test_negative_keep(self):
+        with pytest.raises(ValueError):
+            GlitchAggregator(keep=-1)
@@ -2,8 +2,11 @@ import numpy as np
 
 from audio_glitch_detector.core.analysis import (
     calculate_derivative,
+    filter_nearby_channel_hits,
     filter_nearby_glitches,
+    filter_nearby_indices,
     find_glitch_indices,
+    find_glitch_sample_indices,
     from_bytes,
     normalize_samples,
     split_channels,
@@ -12,6 +15,11 @@ from audio_glitch_detector.core.analysis import (
 
 
 class TestCalculateDerivative:
+    def test_previous_sample(self):
+        samples = np.array([[0.5, 0.6], [-0.5, -0.4]])
+        derivative = calculate_derivative(samples, previous=np.array([0.0, -0.5]))
+        np.testing.assert_allclose(derivative[:, 0], [0.5, 0.0])
+
     def test_mono_signal(self, mono_sine_wave):
         derivative = calculate_derivative(mono_sine_wave)
         assert derivative.shape == (1, len(mono_sine_wave))
@@ -28,6 +36,27 @@ class TestCalculateDerivative:
         discontinuity_point = len(sine_with_discontinuity) // 2
         assert derivative[0, discontinuity_point] > 0.5
 
+    def test_preserves_float32(self, mono_sine_wave):
+        derivative = calculate_derivative(mono_sine_wave.astype(np.float32))
+        assert derivative.dtype == np.float32
+
+    def test_integer_samples_do_not_overflow(self):
+        samples = np.array([32767, -32768, 32767], dtype=np.int16)
+        derivative = calculate_derivative(samples)
+        assert derivative.dtype == np.int32
+        assert derivative.tolist() == [[0, 65535, 65535]]
+
+    def test_int32_samples_widen_to_int64(self):
+        samples = np.array([2**31 - 1, -(2**31)], dtype=np.int32)
+        derivative = calculate_derivative(samples)
+        assert derivative.dtype == np.int64
+        assert derivative.tolist() == [[0, 2**32 - 1]]
+
+    def test_writes_into_out(self, stereo_sine_wave):
+        out = np.empty(stereo_sine_wave.shape)
+        derivative = calculate_derivative(stereo_sine_wave, out=out)
+        assert derivative is out
+
 
 class TestFindGlitchIndices:
     def test_no_discontinuities(self, mono_sine_wave):
@@ -51,6 +80,38 @@ class TestFindGlitchIndices:
         # Lower threshold should find more discontinuities
         assert len(low_threshold[0]) >= len(high_threshold[0])
 
+    def test_returns_index_array_per_channel(self):
+        derivative = np.zeros((3, 10))
+        derivative[0, 4] = 1.0
+        derivative[2, [2, 7]] = 1.0
+        derivative[1, 0] = 1.0  # first sample is ignored
+        derivative[1, 9] = 1.0  # last sample is ignored
+
+        discontinuities = find_glitch_indices(derivative, threshold=0.5)
+
+        assert len(discontinuities) == 3
+        assert all(channel.dtype == np.int64 for channel in discontinuities)
+        assert discontinuities[0].tolist() == [4]
+        assert discontinuities[1].tolist() == []
+        assert discontinuities[2].tolist() == [2, 7]
+
+
+class TestFindGlitchSampleIndices:
+    def test_merges_channels(self):
+        derivative = np.zeros((2, 10))
+        derivative[0, [3, 5]] = 1.0
+        derivative[1, [5, 8]] = 1.0
+
+        indices = find_glitch_sample_indices(derivative, threshold=0.5)
+
+        assert indices.dtype == np.int64
+        assert indices.tolist() == [3, 5, 8]
+
+    def test_mono_input(self, sine_with_discontinuity):
+        derivative = calculate_derivative(sine_with_discontinuity)
+        indices = find_glitch_sample_indices(derivative, threshold=0.1)
+        assert len(sine_with_discontinuity) // 2 in indices
+
 
 class TestFilterNearbyGlitches:
     def test_empty_list(self):
@@ -73,6 +134,31 @@ class TestFilterNearbyGlitches:
         assert result == [100, 125, 200]
 
 
+class TestFilterNearbyIndices:
+    def test_matches_sequential_filter(self):
+        rng = np.random.default_rng(0)
+        indices = np.sort(rng.integers(0, 5000, size=400))
+
+        expected = [int(indices[0])]
+        for value in np.unique(indices)[1:]:
+            if value - expected[-1] >= 50:
+                expected.append(int(value))
+
+        assert filter_nearby_indices(indices, window=50).tolist() == expected
+
+    def test_dense_run_longer_than_window(self):
+        indices = np.array([0, 30, 60, 90, 120])
+        assert filter_nearby_indices(indices, window=50).tolist() == [0, 60, 120]
+
+    def test_empty_array(self):
+        result = filter_nearby_indices(np.array([], dtype=np.int64))
+        assert result.size == 0
+
+    def test_continues_from_last_kept(self):
+        indices = np.array([110, 140, 150, 300])
+        assert filter_nearby_indices(indices, window=50, last_kept=100).tolist() == [150, 300]
+
+
 class TestNormalizeSamples:
     def test_normalize_range(self):
         samples = np.array([[-2.0, -1.0, 0.0, 1.0, 2.0]])
@@ -119,6 +205,17 @@ class TestSplitChannels:
         assert np.array_equal(result[0], [1, 3, 5])  # Left channel
         assert np.array_equal(result[1], [2, 4, 6])  # Right channel
 
+    def test_returns_view(self):
+        interleaved = np.arange(12, dtype=np.int16)
+        result = split_channels(interleaved, channels=3)
+        assert result.shape == (3, 4)
+        assert np.shares_memory(result, interleaved)
+
+    def test_view_over_bytes(self):
+        data = np.array([1, -1, 2, -2], dtype=np.int32).tobytes()
+        result = split_channels(from_bytes(data, channels=2, bit_depth=32), channels=2)
+        assert np.array_equal(result, [[1, 2], [-1, -2]])
+
 
 class TestSamplesFromBytes:
     def test_int16_from_bytes(self):
@@ -138,3 +235,40 @@ class TestSamplesFromBytes:
         assert len(result) == 2
         assert result[0] == 100000
         assert result[1] == -100000
+
+
+class TestFilterNearbyChannelHits:
+    def test_filters_each_channel_on_its_own(self):
+        channels = np.array([0, 1, 0, 1, 0])
+        indices = np.array([100, 110, 120, 200, 200])
+
+        kept_channels, kept_indices = filter_nearby_channel_hits(channels, indices, window=50)
+
+        assert list(zip(kept_channels.tolist(), kept_indices.tolist())) == [(0, 100), (1, 110), (0, 200), (1, 200)]
+
+    def test_matches_filter_per_channel(self):
+        rng = np.random.default_rng(1)
+        channels = rng.integers(0, 4, size=500)
+        indices = rng.integers(10_000, 20_000, size=500)
+
+        kept_channels, kept_indices = filter_nearby_channel_hits(channels, indices, window=50)
+
+        for channel in range(4):
+            expected = filter_nearby_indices(indices[channels == channel], window=50)
+            assert kept_indices[kept_channels == channel].tolist() == expected.tolist()
+        assert np.all(np.diff(kept_indices) >= 0)
+
+    def test_last_kept_per_channel(self):
+        last_kept = np.array([980, -1000])
+
+        kept_channels, kept_indices = filter_nearby_channel_hits(
+            np.array([0, 1]), np.array([1000, 1000]), window=50, last_kept=last_kept
+        )
+
+        assert kept_channels.tolist() == [1]
+        assert kept_indices.tolist() == [1000]
+
+    def test_empty(self):
+        kept_channels, kept_indices = filter_nearby_channel_hits(np.array([], dtype=np.int64), np.array([]))
+        assert kept_channels.size == 0
+        assert kept_indices.size == 0
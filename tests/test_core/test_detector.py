@@ -1,3 +1,6 @@
+import numpy as np
+import pytest
+
 from audio_glitch_detector.core.detector import DetectionResult, GlitchDetector
 
 
@@ -62,6 +65,127 @@ class TestGlitchDetector:
             # Sample indices should be offset by current_frame
             assert all(idx >= current_frame for idx in result.sample_indices)
 
+    def test_result_holds_arrays(self, sine_with_discontinuity, sample_rate):
+        detector = GlitchDetector(sample_rate, threshold=0.1)
+        result = detector.detect_with_offset(sine_with_discontinuity, 1000)
+
+        assert isinstance(result.sample_indices, np.ndarray)
+        assert isinstance(result.timestamps_ms, np.ndarray)
+        assert result.sample_indices.dtype == np.int64
+        assert result.timestamps_ms.dtype == np.float64
+        assert result.sample_indices[0] == len(sine_with_discontinuity) // 2 + 1000
+
+    @pytest.mark.parametrize("dtype,full_scale", [(np.int16, 2**15), (np.int32, 2**31)])
+    def test_integer_samples_match_float(self, sine_with_discontinuity, sample_rate, dtype, full_scale):
+        int_samples = np.round(sine_with_discontinuity * 0.8 * (full_scale - 1)).astype(dtype)
+        float_samples = int_samples / full_scale
+
+        for threshold in (0.0, 0.1):
+            int_result = GlitchDetector(sample_rate, threshold).detect(int_samples)
+            float_result = GlitchDetector(sample_rate, threshold).detect(float_samples)
+
+            assert int_result.sample_indices.tolist() == float_result.sample_indices.tolist()
+            assert int_result.threshold == pytest.approx(float_result.threshold)
+
+    def test_running_threshold_is_stable(self, mono_sine_wave, sample_rate):
+        detector = GlitchDetector(sample_rate, running_threshold=True)
+
+        thresholds = [detector.detect(block).threshold for block in np.array_split(mono_sine_wave, 20)]
+
+        assert detector.auto_threshold
+        assert max(thresholds[10:]) - min(thresholds[10:]) < 0.01 * thresholds[-1]
+
+    def test_running_threshold_detects_glitch(self, sine_with_discontinuity, sample_rate):
+        detector = GlitchDetector(sample_rate, running_threshold=True)
+        blocks = np.array_split(sine_with_discontinuity, 8)
+
+        counts = [detector.detect(block).total_count for block in blocks]
+
+        assert sum(counts) == 1
+
+    def test_feed_matches_whole_signal(self, sine_with_discontinuity, sample_rate):
+        detector = GlitchDetector(sample_rate, threshold=0.1)
+
+        results = [detector.feed(block) for block in np.array_split(sine_with_discontinuity, 7)]
+        indices = np.concatenate([result.sample_indices for result in results])
+
+        expected = GlitchDetector(sample_rate, threshold=0.1).detect(sine_with_discontinuity)
+        assert indices.tolist() == expected.sample_indices.tolist()
+
+    def test_feed_finds_glitch_at_block_boundary(self, mono_sine_wave, sample_rate):
+        boundary = len(mono_sine_wave) // 2
+        wave = mono_sine_wave.copy()
+        wave[boundary:] += 0.5
+
+        detector = GlitchDetector(sample_rate, threshold=0.1)
+        first = detector.feed(wave[:boundary])
+        second = detector.feed(wave[boundary:])
+
+        assert first.total_count == 0
+        assert second.sample_indices.tolist() == [boundary]
+
+    def test_feed_filters_nearby_glitches_across_blocks(self, mono_sine_wave, sample_rate):
+        wave = mono_sine_wave.copy()
+        wave[995] = 1.0
+        wave[1010] = 1.0
+
+        detector = GlitchDetector(sample_rate, threshold=0.1)
+        counts = [detector.feed(wave[:1000]).total_count, detector.feed(wave[1000:]).total_count]
+
+        assert counts == [1, 0]
+
+    def test_feed_does_not_compare_across_gap(self, mono_sine_wave, sample_rate):
+        detector = GlitchDetector(sample_rate, threshold=0.1)
+        detector.feed(mono_sine_wave[:1000], 0)
+
+        # Blocks in between were dropped, so the jump to this block is not a glitch
+        result = detector.feed(mono_sine_wave[5000:6000] + 0.5, 5000)
+
+        assert result.total_count == 0
+
+    def test_start_at_previous_sample(self, mono_sine_wave, sample_rate):
+        detector = GlitchDetector(sample_rate, threshold=0.1)
+        detector.start_at(1000, previous=np.array([-0.5]))
+
+        result = detector.feed(mono_sine_wave[1000:2000], 1000)
+
+        assert result.sample_indices.tolist() == [1000]
+
+    def test_attributes_glitches_to_channels(self, stereo_sine_wave, sample_rate):
+        samples = np.vstack([stereo_sine_wave, stereo_sine_wave[:1]])
+        samples[1, 1000] = -1.0
+        samples[2, 1010] = -1.0
+        samples[0, 3000] = -1.0
+        samples[2, 3000] = -1.0
+
+        result = GlitchDetector(sample_rate, threshold=0.1).detect(samples)
+
+        assert result.sample_indices.tolist() == [1000, 3000]
+        assert result.channel_indices(0).tolist() == [3000]
+        assert result.channel_indices(1).tolist() == [1000]
+        assert result.channel_indices(2).tolist() == [1010, 3000]
+        assert result.channel_counts(3).tolist() == [1, 1, 2]
+
+    def test_feed_filters_channel_hits_across_blocks(self, stereo_sine_wave, sample_rate):
+        samples = stereo_sine_wave.copy()
+        samples[0, 995] = -1.0
+        samples[0, 1010] = -1.0
+        samples[1, 1010] = -1.0
+
+        detector = GlitchDetector(sample_rate, threshold=0.1)
+        first = detector.feed(samples[:, :1000])
+        second = detector.feed(samples[:, 1000:])
+
+        assert list(zip(first.hit_channels.tolist(), first.hit_indices.tolist())) == [(0, 995)]
+        assert list(zip(second.hit_channels.tolist(), second.hit_indices.tolist())) == [(1, 1010)]
+        assert second.total_count == 0
+
+    def test_detect_with_offset_shifts_channel_hits(self, sine_with_discontinuity, sample_rate):
+        result = GlitchDetector(sample_rate, threshold=0.1).detect_with_offset(sine_with_discontinuity, 1000)
+
+        assert result.hit_indices.tolist() == result.sample_indices.tolist()
+        assert result.hit_channels.tolist() == [0]
+
     def test_sample_to_milliseconds_conversion(self, sample_rate):
         detector = GlitchDetector(sample_rate, threshold=0.1)
 
@@ -95,6 +219,8 @@ class TestDetectionResult:
     def test_empty_detection_result(self):
         result = DetectionResult(sample_indices=[], timestamps_ms=[], total_count=0, threshold=0)
 
+        assert result.channel_indices(0).size == 0
+        assert result.channel_counts(2).tolist() == [0, 0]
         assert len(result.sample_indices) == 0
         assert len(result.timestamps_ms) == 0
         assert result.total_count == 0
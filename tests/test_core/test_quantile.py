@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from audio_glitch_detector.core.quantile import StreamingQuantile
+
+
+class TestStreamingQuantile:
+    def test_empty(self):
+        estimator = StreamingQuantile()
+        assert estimator.value() is None
+        assert estimator.count == 0
+
+    def test_close_to_exact_percentile(self):
+        rng = np.random.default_rng(1)
+        values = rng.uniform(0.001, 0.2, size=100_000)
+
+        estimator = StreamingQuantile(percentile=99.5, relative_accuracy=0.005)
+        for block in np.array_split(values, 50):
+            estimator.update(block)
+
+        exact = np.percentile(values, 99.5)
+        assert estimator.count == values.size
+        assert estimator.value() == pytest.approx(exact, rel=0.01)
+
+    def test_ignores_noise_values(self):
+        estimator = StreamingQuantile(min_value=1e-6)
+        estimator.update(np.array([0.0, 1e-7, 0.5]))
+        assert estimator.count == 1
+
+    def test_scale(self):
+        scaled = StreamingQuantile(percentile=50)
+        scaled.update(np.array([100.0, 200.0, 300.0]), scale=0.001)
+
+        plain = StreamingQuantile(percentile=50)
+        plain.update(np.array([0.1, 0.2, 0.3]))
+
+        assert scaled.value() == pytest.approx(plain.value())
+
+    def test_reset(self):
+        estimator = StreamingQuantile()
+        estimator.update(np.array([0.1, 0.2]))
+        estimator.reset()
+        assert estimator.value() is None
+
+    def test_invalid_percentile(self):
+        with pytest.raises(ValueError, match="Percentile must be between 0 and 100"):
+            StreamingQuantile(percentile=120)
@@ -0,0 +1,89 @@
+import numpy as np
+
+from audio_glitch_detector.core.analysis import (
+    calculate_derivative,
+    find_glitch_sample_indices,
+    normalize_samples,
+    to_float,
+)
+from audio_glitch_detector.core.workspace import DetectionWorkspace
+
+
+class TestDetectionWorkspace:
+    def test_matches_normalized_derivative(self, stereo_sine_wave):
+        samples = stereo_sine_wave * 0.5
+        workspace = DetectionWorkspace()
+
+        derivative = workspace.load(samples)
+
+        expected = calculate_derivative(normalize_samples(samples))
+        assert np.allclose(derivative * workspace.scale, expected)
+
+    def test_channel_hits(self, stereo_sine_wave):
+        samples = stereo_sine_wave.copy()
+        samples[1, 500] = -1.0
+        samples[:, 900] = -1.0
+        workspace = DetectionWorkspace()
+        workspace.load(samples)
+
+        channels, indices = workspace.channel_hits(workspace.find_glitch_indices(0.1))
+
+        assert list(zip(channels.tolist(), indices.tolist())) == [
+            (1, 500),
+            (1, 501),
+            (0, 900),
+            (1, 900),
+            (0, 901),
+            (1, 901),
+        ]
+
+    def test_find_glitch_indices(self, sine_with_discontinuity):
+        workspace = DetectionWorkspace()
+        workspace.load(sine_with_discontinuity)
+
+        indices = workspace.find_glitch_indices(0.1)
+
+        expected = find_glitch_sample_indices(calculate_derivative(sine_with_discontinuity), 0.1)
+        assert indices.tolist() == expected.tolist()
+
+    def test_preserves_float32(self, stereo_sine_wave):
+        workspace = DetectionWorkspace()
+        derivative = workspace.load(stereo_sine_wave.astype(np.float32))
+        assert derivative.dtype == np.float32
+
+    def test_buffers_reused_across_blocks(self, stereo_sine_wave):
+        workspace = DetectionWorkspace()
+
+        first = workspace.load(stereo_sine_wave[:, :1024])
+        second = workspace.load(stereo_sine_wave[:, 1024:2048])
+        shorter = workspace.load(stereo_sine_wave[:, 2048:2548])
+
+        assert np.shares_memory(first, second)
+        assert np.shares_memory(first, shorter)
+        assert shorter.shape == (2, 500)
+
+    def test_integer_samples_use_full_scale(self, mono_sine_wave):
+        int_samples = (mono_sine_wave * 0.5 * 32767).astype(np.int16)
+        workspace = DetectionWorkspace()
+
+        derivative = workspace.load(int_samples)
+
+        expected = calculate_derivative(normalize_samples(to_float(int_samples)))
+        assert derivative.dtype == np.int32
+        assert np.allclose(derivative * workspace.scale, expected)
+
+    def test_integer_threshold_is_exact(self):
+        samples = np.array([[0, 100, 0, 1000, 0, 0]], dtype=np.int16)
+        workspace = DetectionWorkspace()
+        workspace.load(samples)
+
+        # Derivative in normalized units is [0, 0.1, 0.1, 1.0, 1.0, 0]
+        assert workspace.find_glitch_indices(0.1).tolist() == [3, 4]
+        assert workspace.find_glitch_indices(0.0999).tolist() == [1, 2, 3, 4]
+        assert workspace.find_glitch_indices(1.0).tolist() == []
+
+    def test_silence_is_not_normalized(self):
+        samples = np.full((1, 100), 0.001)
+        workspace = DetectionWorkspace()
+        workspace.load(samples)
+        assert workspace.scale == 1.0
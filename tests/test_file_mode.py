@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from audio_glitch_detector import file_mode
+from audio_glitch_detector.audio import ArtifactWriter
+from audio_glitch_detector.core import GlitchAggregator
+from audio_glitch_detector.file_mode import analyze_file, analyze_file_parallel, run_file_mode
+from audio_glitch_detector.tui import ConsoleOutput
+from audio_glitch_detector.utils import GLITCH_RECORD_DTYPE, GlitchMetrics, ResultSink
+
+
+class TestParallelFileAnalysis:
+    @pytest.mark.parametrize(
+        "filename,block_size",
+        [
+            ("sine_discont_5_stereo_440_552hz.wav", 1024),
+            ("sine_many_subtle_error_stereo.wav", 500),
+            ("sine_single_sample_errors_3_mono.wav", 4096),
+        ],
+    )
+    def test_matches_serial_analysis(self, test_files_dir, filename, block_size):
+        filepath = str(test_files_dir / filename)
+
+        serial = analyze_file(filepath, 0.0, block_size)
+        parallel = analyze_file_parallel(filepath, 0.0, block_size, jobs=2, blocks_per_chunk=7)
+
+        assert parallel.sample_indices.tolist() == serial.sample_indices.tolist()
+        assert parallel.sample_rate == serial.sample_rate
+
+    def test_glitch_blocks(self, test_files_dir):
+        filepath = str(test_files_dir / "sine_discont_4_mono_1khz.wav")
+
+        analysis = analyze_file_parallel(filepath, 0.0, 1024, jobs=2, keep_glitch_blocks=3, blocks_per_chunk=50)
+
+        assert len(analysis.glitch_blocks) == 3
+        assert analysis.glitch_blocks == sorted(analysis.glitch_blocks)
+        offsets = [offset for offset, _ in analysis.glitch_blocks]
+        assert any(offset <= analysis.sample_indices[-1] < offset + 1024 for offset in offsets)
+
+    def test_last_indices_lie_in_glitch_blocks(self, test_files_dir):
+        filepath = str(test_files_dir / "sine_many_subtle_error_stereo.wav")
+
+        analysis = analyze_file_parallel(filepath, 0.0, 500, jobs=2, keep_glitch_blocks=4, blocks_per_chunk=7)
+
+        serial = analyze_file(filepath, 0.0, 500)
+        assert analysis.last_indices.tolist() == serial.sample_indices[-4:].tolist()
+        offsets = {offset for offset, _ in analysis.glitch_blocks}
+        assert all(index // 500 * 500 in offsets for index in analysis.last_indices)
+
+    def test_streams_results_to_sink(self, test_files_dir, tmp_path):
+        filepath = str(test_files_dir / "sine_many_subtle_error_stereo.wav")
+        serial = analyze_file(filepath, 0.0, 500)
+
+        with ResultSink(tmp_path / "glitches.bin", serial.sample_rate) as sink:
+            analysis = analyze_file_parallel(
+                filepath, 0.0, 500, jobs=2, blocks_per_chunk=7, aggregator=GlitchAggregator(sink=sink, keep=2)
+            )
+
+        records = np.fromfile(tmp_path / "glitches.bin", dtype=GLITCH_RECORD_DTYPE)
+        assert records["sample_index"].tolist() == serial.sample_indices.tolist()
+        assert analysis.total_count == serial.total_count
+        assert analysis.sample_indices.tolist() == serial.sample_indices[:2].tolist()
+
+    def test_counts_metrics(self, test_files_dir):
+        filepath = str(test_files_dir / "sine_many_subtle_error_stereo.wav")
+        serial_metrics = GlitchMetrics().source("serial")
+        parallel_metrics = GlitchMetrics().source("parallel")
+
+        serial = analyze_file(filepath, 0.0, 500, metrics=serial_metrics)
+        analyze_file_parallel(filepath, 0.0, 500, jobs=2, blocks_per_chunk=7, metrics=parallel_metrics)
+
+        assert serial_metrics.glitches.value == serial.total_count
+        assert parallel_metrics.glitches.value == serial.total_count
+        assert parallel_metrics.blocks.value == serial_metrics.blocks.value
+        assert sum(serial_metrics.detection_seconds.counts) == serial_metrics.blocks.value
+
+
+class TestRunFileMode:
+    @pytest.mark.parametrize("context_ms", [50.0, 0.0])
+    def test_saves_glitches_while_analyzing(self, test_files_dir, tmp_path, monkeypatch, context_ms):
+        filepath = str(test_files_dir / "sine_many_subtle_error_stereo.wav")
+        serial = analyze_file(filepath, 0.0, 500)
+        analyzed = []
+        submitted = []
+
+        class RecordingWriter(ArtifactWriter):
+            def submit(self, samples, sample_rate, frame_offset, threshold, *args, **kwargs):
+                submitted.append((frame_offset, bool(analyzed)))
+                return super().submit(samples, sample_rate, frame_offset, threshold, *args, **kwargs)
+
+        def recording_analyze_file(*args, **kwargs):
+            analysis = analyze_file(*args, **kwargs)
+            analyzed.append(analysis)
+            return analysis
+
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(file_mode, "ArtifactWriter", RecordingWriter)
+        monkeypatch.setattr(file_mode, "analyze_file", recording_analyze_file)
+        run_file_mode(filepath, 0.0, 500, 2, ConsoleOutput(), context_ms=context_ms)
+
+        assert serial.total_count > 2
+        assert len(submitted) > 2
+        assert not submitted[0][1]
+        assert len(list((tmp_path / "glitch_artifacts").glob("*.wav"))) == 2
@@ -0,0 +1,86 @@
+import json
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from audio_glitch_detector.core import GlitchDetector
+from audio_glitch_detector.generator import (
+    GlitchSpec,
+    SignalGenerator,
+    SignalSpec,
+    load_ground_truth,
+    plan_glitches,
+    write_signal,
+)
+
+
+class TestPlanGlitches:
+    def test_positions_are_spaced_and_sorted(self):
+        glitches = plan_glitches(480000, 48000, 2, 20, seed=1)
+
+        positions = [glitch.position for glitch in glitches]
+        assert positions == sorted(positions)
+        assert min(np.diff(positions)) > 480
+        assert all(glitch.channel is None for glitch in glitches)
+
+    def test_same_seed_same_glitches(self):
+        assert plan_glitches(480000, 48000, 2, 5, seed=3) == plan_glitches(480000, 48000, 2, 5, seed=3)
+
+    def test_unknown_type(self):
+        with pytest.raises(ValueError, match="Unknown glitch types"):
+            plan_glitches(48000, 48000, 2, 1, glitch_types=("click",))
+
+    def test_too_many_glitches(self):
+        with pytest.raises(ValueError, match="do not fit"):
+            plan_glitches(1000, 48000, 2, 10)
+
+
+class TestSignalGenerator:
+    def test_blocks_independent_of_block_size(self):
+        spec = SignalSpec(channels=3, frames=20000, glitches=plan_glitches(20000, 48000, 3, 4, seed=0))
+        generator = SignalGenerator(spec)
+
+        small = np.concatenate(list(generator.blocks(333)), axis=1)
+        large = np.concatenate(list(generator.blocks(8192)), axis=1)
+
+        assert small.shape == (3, 20000)
+        np.testing.assert_allclose(small, large)
+
+    def test_clean_signal_has_no_glitches(self):
+        samples = SignalGenerator(SignalSpec(frames=48000)).block(0, 48000)
+
+        assert GlitchDetector(48000, threshold=0.3).detect(samples).total_count == 0
+
+    @pytest.mark.parametrize("glitch_type", ["spike", "phase_jump", "dropout", "repeat"])
+    def test_glitch_detected_at_position(self, glitch_type):
+        # A quarter period into a 1 kHz sine at 48 kHz, where the signal is at its peak
+        glitch = GlitchSpec(position=24012, glitch_type=glitch_type, length=16, magnitude=np.pi)
+        if glitch_type == "spike":
+            glitch = GlitchSpec(position=24012, glitch_type="spike", magnitude=1.0)
+        spec = SignalSpec(frames=48000, glitches=[glitch])
+
+        result = GlitchDetector(48000, threshold=0.3).detect(SignalGenerator(spec).block(0, 48000))
+
+        assert result.sample_indices.tolist() == [24012]
+
+    def test_single_channel_glitch(self):
+        spec = SignalSpec(channels=2, frames=1000, glitches=[GlitchSpec(500, "dropout", length=10, channel=1)])
+        samples = SignalGenerator(spec).block(0, 1000)
+
+        assert np.all(samples[1, 500:510] == 0.0)
+        assert np.all(samples[0, 500:510] != 0.0)
+
+
+class TestWriteSignal:
+    def test_writes_audio_and_ground_truth(self, tmp_path):
+        glitches = plan_glitches(96000, 48000, 2, 3, seed=2)
+        spec = SignalSpec(channels=2, frames=96000, glitches=glitches)
+
+        sidecar = write_signal(tmp_path / "long.wav", spec, "PCM_16", block_size=10000)
+
+        info = sf.info(str(tmp_path / "long.wav"))
+        assert info.frames == 96000
+        assert info.channels == 2
+        assert json.loads(sidecar.read_text())["file"] == "long.wav"
+        assert load_ground_truth(sidecar) == spec
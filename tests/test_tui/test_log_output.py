@@ -0,0 +1,60 @@
+from threading import Event
+
+import pytest
+
+from audio_glitch_detector.tui import DeviceStatus, LogOutput
+from audio_glitch_detector.utils.profiling import StageStats
+from audio_glitch_detector.utils.stream_health import StreamHealthStats
+
+
+class TestLogOutput:
+    def test_logs_to_file(self, tmp_path):
+        log_file = tmp_path / "run.log"
+        output = LogOutput(str(log_file))
+        output.print_header("Audio Glitch Detector Live")
+        output.log("\nGlitch detected! Total: 1", style="bold red")
+        output.print_profile([StageStats("detect", 10, 0.01, 0.001, 0.002)])
+        output.close()
+
+        lines = log_file.read_text().splitlines()
+        assert lines[0].endswith("INFO Audio Glitch Detector Live")
+        assert lines[1].endswith("WARNING Glitch detected! Total: 1")
+        assert any("detect" in line for line in lines[2:])
+
+    def test_rotates_log_file(self, tmp_path):
+        log_file = tmp_path / "run.log"
+        output = LogOutput(str(log_file), max_bytes=1000, backup_count=2)
+        for i in range(200):
+            output.log(f"message {i}")
+        output.close()
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["run.log", "run.log.1", "run.log.2"]
+        assert all(path.stat().st_size <= 1000 for path in tmp_path.iterdir())
+
+    def test_logs_stats_periodically(self, tmp_path):
+        log_file = tmp_path / "run.log"
+        output = LogOutput(str(log_file), stats_interval=0.01)
+        logged = Event()
+
+        def status() -> list[DeviceStatus]:
+            logged.set()
+            return [DeviceStatus("1: USB", [-3.0, -6.5], 2, StreamHealthStats(latency_ms=4.0))]
+
+        output.start_device_live_output(Event(), status)
+        assert logged.wait(timeout=5.0)
+        output.close()
+
+        line = log_file.read_text().splitlines()[0]
+        assert "Device 1: USB: Peak -3.0/-6.5dB  Glitches 2  Latency 4.0ms" in line
+
+    def test_stop_does_not_wait_for_interval(self, tmp_path):
+        output = LogOutput(str(tmp_path / "run.log"), stats_interval=3600.0)
+        output.start_live_output(Event(), lambda: [0.0], lambda: StreamHealthStats())
+        output.stop_live_output()
+        output.close()
+
+        assert (tmp_path / "run.log").read_text() == ""
+
+    def test_invalid_interval(self):
+        with pytest.raises(ValueError):
+            LogOutput(stats_interval=0)
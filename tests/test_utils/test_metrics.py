@@ -0,0 +1,93 @@
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pytest
+
+from audio_glitch_detector.utils.metrics import GlitchMetrics, MetricsRegistry, MetricsServer
+from audio_glitch_detector.utils.stream_health import StreamHealthStats
+
+
+class TestMetricsRegistry:
+    def test_counter_and_gauge(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("blocks_total", "Blocks processed", ["source"])
+        gauge = registry.gauge("threshold", "Threshold")
+        counter.labels("1").inc()
+        counter.labels("1").inc(2)
+        counter.labels('a "b"').inc()
+        gauge.labels().set(0.25)
+
+        lines = registry.render().splitlines()
+
+        assert lines[:2] == ["# HELP blocks_total Blocks processed", "# TYPE blocks_total counter"]
+        assert 'blocks_total{source="1"} 3' in lines
+        assert 'blocks_total{source="a \\"b\\""} 1' in lines
+        assert "threshold 0.25" in lines
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("seconds", "Time", buckets=[0.1, 1.0])
+        value = histogram.labels()
+        for seconds in (0.05, 0.1, 0.5, 2.0):
+            value.observe(seconds)
+
+        lines = registry.render().splitlines()
+
+        assert 'seconds_bucket{le="0.1"} 2' in lines
+        assert 'seconds_bucket{le="1"} 3' in lines
+        assert 'seconds_bucket{le="+Inf"} 4' in lines
+        assert "seconds_sum 2.65" in lines
+        assert "seconds_count 4" in lines
+
+    def test_collectors_run_before_render(self):
+        registry = MetricsRegistry()
+        value = registry.gauge("pending", "Pending").labels()
+        registry.add_collector(lambda: value.set(7))
+
+        assert "pending 7" in registry.render().splitlines()
+
+    def test_label_count_checked(self):
+        counter = MetricsRegistry().counter("blocks_total", "Blocks", ["source"])
+        with pytest.raises(ValueError):
+            counter.labels()
+
+
+class TestGlitchMetrics:
+    def test_record_block(self):
+        metrics = GlitchMetrics()
+        source = metrics.source("3")
+        source.record_block(0.0004, 0.2, 2, np.array([0, 2, 2]))
+        source.record_block(0.0002, 0.3, 0, np.empty(0, dtype=np.int64))
+        source.record_health(StreamHealthStats(input_overflows=1, dropped_blocks=4), queued=5)
+        metrics.registry.add_collector(lambda: metrics.artifact_writer_pending.set(6))
+
+        lines = metrics.registry.render().splitlines()
+
+        assert 'glitch_detector_blocks_total{source="3"} 2' in lines
+        assert 'glitch_detector_glitches_total{source="3"} 2' in lines
+        assert 'glitch_detector_channel_glitches_total{source="3",channel="1"} 1' in lines
+        assert 'glitch_detector_channel_glitches_total{source="3",channel="3"} 2' in lines
+        assert 'glitch_detector_detection_seconds_count{source="3"} 2' in lines
+        assert 'glitch_detector_threshold{source="3"} 0.3' in lines
+        assert 'glitch_detector_input_overflows_total{source="3"} 1' in lines
+        assert 'glitch_detector_dropped_blocks_total{source="3"} 4' in lines
+        assert 'glitch_detector_artifact_queue_depth{source="3"} 5' in lines
+        assert "glitch_detector_artifact_writer_pending 6" in lines
+
+
+class TestMetricsServer:
+    def test_serves_metrics(self):
+        metrics = GlitchMetrics()
+        metrics.source("1").blocks.inc(3)
+
+        with MetricsServer(metrics.registry, 0) as server:
+            with urllib.request.urlopen(server.url, timeout=5) as response:
+                body = response.read().decode()
+                content_type = response.headers["Content-Type"]
+
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(server.url.replace("/metrics", "/other"), timeout=5)
+
+        assert content_type.startswith("text/plain; version=0.0.4")
+        assert 'glitch_detector_blocks_total{source="1"} 3' in body.splitlines()
@@ -0,0 +1,71 @@
+import pytest
+
+from audio_glitch_detector.core import GlitchDetector
+from audio_glitch_detector.utils.profiling import Profiler
+
+
+class TestProfiler:
+    def test_disabled_records_nothing(self):
+        profiler = Profiler()
+
+        with profiler.stage("detect"):
+            pass
+        profiler.record("read", 0.5)
+        assert list(profiler.iterate("read", [1, 2])) == [1, 2]
+
+        assert profiler.stats() == []
+
+    def test_stage_counts_and_totals(self):
+        profiler = Profiler(enabled=True)
+
+        for seconds in (0.001, 0.002, 0.003):
+            profiler.record("detect", seconds)
+
+        (stage,) = profiler.stats()
+        assert stage.name == "detect"
+        assert stage.count == 3
+        assert stage.total_seconds == pytest.approx(0.006)
+        assert stage.mean_seconds == pytest.approx(0.002)
+
+    def test_p99_within_accuracy(self):
+        profiler = Profiler(enabled=True, relative_accuracy=0.01)
+
+        for i in range(1, 1001):
+            profiler.record("detect", i * 1e-6)
+
+        assert profiler.stats()[0].p99_seconds == pytest.approx(990e-6, rel=0.01)
+
+    def test_iterate_times_each_item(self):
+        profiler = Profiler(enabled=True)
+
+        assert list(profiler.iterate("read", iter(range(5)))) == list(range(5))
+        assert profiler.stats()[0].count == 5
+
+    def test_merge(self):
+        profiler = Profiler(enabled=True)
+        worker = Profiler(enabled=True)
+        profiler.record("read", 0.001)
+        worker.record("read", 0.003)
+        worker.record("detect", 0.002)
+
+        profiler.merge(worker)
+
+        stats = {stage.name: stage for stage in profiler.stats()}
+        assert stats["read"].count == 2
+        assert stats["read"].total_seconds == pytest.approx(0.004)
+        assert stats["detect"].count == 1
+
+    def test_detector_stages(self, mono_sine_wave, sample_rate):
+        profiler = Profiler(enabled=True)
+        detector = GlitchDetector(sample_rate, profiler=profiler)
+
+        detector.feed(mono_sine_wave)
+
+        names = [stage.name for stage in profiler.stats()]
+        assert names == [
+            "detect/normalize",
+            "detect/derivative",
+            "detect/auto threshold",
+            "detect/index search",
+            "detect/filter",
+        ]
@@ -0,0 +1,51 @@
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from audio_glitch_detector.utils.result_sink import GLITCH_RECORD_DTYPE, open_result_sink
+from audio_glitch_detector.utils.time_utils import format_time_string
+
+INDICES = np.array([0, 7, 48_000, 176_400_123])
+
+
+class TestResultSink:
+    def test_csv(self, tmp_path):
+        path = tmp_path / "glitches.csv"
+        with open_result_sink(path, 48000) as sink:
+            sink.write(INDICES[:2])
+            sink.write(INDICES[2:])
+
+        with path.open(newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert sink.count == 4
+        assert [int(row["sample_index"]) for row in rows] == INDICES.tolist()
+        assert [row["timestamp_ms"] for row in rows] == ["0.000", "0.146", "1000.000", "3675002.562"]
+        assert [row["time"] for row in rows] == [format_time_string(index / 48) for index in INDICES]
+
+    def test_jsonl(self, tmp_path):
+        path = tmp_path / "glitches.jsonl"
+        with open_result_sink(path, 48000) as sink:
+            sink.write(INDICES)
+
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert records[2] == {"sample_index": 48000, "timestamp_ms": 1000.0, "time": "00:00:01.000"}
+        assert records[3]["time"] == "01:01:15.002"
+
+    def test_binary(self, tmp_path):
+        path = tmp_path / "glitches.bin"
+        with open_result_sink(path, 48000) as sink:
+            sink.write(INDICES)
+
+        records = np.fromfile(path, dtype=GLITCH_RECORD_DTYPE)
+        assert records["sample_index"].tolist() == INDICES.tolist()
+        np.testing.assert_allclose(records["timestamp_ms"], INDICES / 48)
+
+    def test_unsupported_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            open_result_sink(tmp_path / "glitches.txt", 48000)
+
+    def test_write_before_open(self, tmp_path):
+        with pytest.raises(RuntimeError):
+            open_result_sink(tmp_path / "glitches.csv", 48000).write(INDICES)
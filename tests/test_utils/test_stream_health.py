@@ -0,0 +1,55 @@
+import pytest
+
+from audio_glitch_detector.utils.stream_health import StreamHealth
+
+
+class TestStreamHealth:
+    def test_empty(self):
+        stats = StreamHealth(48000).stats()
+        assert stats.blocks == 0
+        assert stats.latency_ms == 0.0
+        assert stats.real_time_factor == 0.0
+
+    def test_latency_and_real_time_factor(self):
+        health = StreamHealth(48000)
+
+        # A 10 ms block captured at t=1.0, processed from 1.002 to 1.004
+        health.record_block(480, capture_time=1.0, start_time=1.002, end_time=1.004)
+
+        stats = health.stats()
+        assert stats.blocks == 1
+        assert stats.latency_ms == pytest.approx(4.0)
+        assert stats.real_time_factor == pytest.approx(0.2)
+        assert stats.peak_latency_ms == pytest.approx(4.0)
+
+    def test_latency_observer(self):
+        health = StreamHealth(48000)
+        latencies = []
+        health.latency_observer = latencies.append
+
+        health.record_block(480, capture_time=1.0, start_time=1.002, end_time=1.004)
+
+        assert latencies == [pytest.approx(0.004)]
+
+    def test_mean_and_peak(self):
+        health = StreamHealth(48000, smoothing=0.5)
+
+        health.record_block(480, 0.0, 0.0, 0.002)
+        health.record_block(480, 1.0, 1.0, 1.008)
+
+        stats = health.stats()
+        assert stats.mean_real_time_factor == pytest.approx(0.5)
+        assert stats.peak_real_time_factor == pytest.approx(0.8)
+        assert stats.real_time_factor == pytest.approx(0.5)
+        assert stats.mean_latency_ms == pytest.approx(5.0)
+
+    def test_buffer_state(self):
+        health = StreamHealth(48000)
+        health.input_overflows = 2
+
+        stats = health.stats(buffer_fill=0.25, peak_buffer_fill=0.5, dropped_blocks=3)
+
+        assert stats.buffer_fill == 0.25
+        assert stats.peak_buffer_fill == 0.5
+        assert stats.dropped_blocks == 3
+        assert stats.input_overflows == 2
@@ -1,9 +1,13 @@
 from datetime import timedelta
 
+import numpy as np
+
 from audio_glitch_detector.utils.time_utils import (
+    format_decimal_strings,
     format_elapsed_time,
     format_time,
     format_time_string,
+    format_time_strings,
     time_to_milliseconds,
 )
 
@@ -78,6 +82,30 @@ class TestFormatTimeString:
         assert result == "00:00:01.234"  # Should truncate to 3 decimal places
 
 
+class TestFormatTimeStrings:
+    def test_matches_format_time_string(self):
+        rng = np.random.default_rng(0)
+        milliseconds = np.concatenate([[0.0, 1234.567, 3661500.0, 999.9995, 1e9], rng.uniform(0, 4e8, 1000)])
+
+        result = format_time_strings(milliseconds)
+
+        assert result.dtype.kind == "S"
+        assert result.astype(str).tolist() == [format_time_string(ms) for ms in milliseconds]
+
+    def test_empty(self):
+        assert format_time_strings(np.array([])).size == 0
+
+
+class TestFormatDecimalStrings:
+    def test_integers(self):
+        values = np.array([0, 7, 10, 99, 100, 123456789012])
+        assert format_decimal_strings(values).astype(str).tolist() == [str(value) for value in values]
+
+    def test_decimals(self):
+        values = np.array([0.0, 0.1234, 9.9996, 1234.5])
+        assert format_decimal_strings(values, 3).astype(str).tolist() == ["0.000", "0.123", "10.000", "1234.500"]
+
+
 class TestFormatElapsedTime:
     def test_basic_elapsed_format(self):
         seconds = 65.0  # 1 minute 5 seconds